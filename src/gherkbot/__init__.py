@@ -6,3 +6,12 @@ def main() -> None:
     """Entry point for the gherkbot CLI."""
     from gherkbot.cli import app
     app()
+
+
+def __getattr__(name: str) -> object:
+    # Imported lazily so that `robot --parser gherkbot.RobotParser` works
+    # without making the CLI pay for importing Robot Framework's parser API.
+    if name == "RobotParser":
+        from gherkbot.robot_parser import RobotParser
+        return RobotParser
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,128 @@
+"""Streaming access to .feature sources and generated suites inside tar and zip archives.
+
+Tar archives, compressed or not, are read and written as streams, so
+members are processed one at a time without extracting anything to disk.
+Zip archives are read through their central directory and written member
+by member.
+"""
+
+import io
+import os
+import tarfile
+import time
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+
+ARCHIVE_SUFFIXES = {
+    ".zip": "zip",
+    ".tar": "",
+    ".tar.gz": "gz",
+    ".tgz": "gz",
+    ".tar.bz2": "bz2",
+    ".tbz2": "bz2",
+    ".tar.xz": "xz",
+    ".txz": "xz",
+}
+
+
+def _archive_suffix(path: Path) -> str | None:
+    name = path.name.lower()
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def is_archive(path: Path) -> bool:
+    """Tells whether path names a tar or zip archive, judging by its suffix."""
+    return _archive_suffix(path) is not None
+
+
+def archive_stem(path: Path) -> str:
+    """Returns the archive name without its archive suffix, e.g. ``features`` for ``features.tar.gz``."""
+    suffix = _archive_suffix(path)
+    return path.name[: -len(suffix)] if suffix else path.stem
+
+
+def _member_path(name: str) -> PurePosixPath | None:
+    """Normalizes a member name, rejecting absolute paths and paths leaving the archive."""
+    path = PurePosixPath(name)
+    parts = [part for part in path.parts if part not in ("", ".")]
+    if path.is_absolute() or ".." in parts or not parts:
+        return None
+    return PurePosixPath(*parts)
+
+
+def iter_members(archive: Path, suffix: str = ".feature") -> Iterator[tuple[PurePosixPath, str]]:
+    """Yields the path and text of every member with the given suffix, in archive order."""
+    if _archive_suffix(archive) == ".zip":
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                path = _member_path(info.filename)
+                if info.is_dir() or path is None or path.suffix != suffix:
+                    continue
+                yield path, zf.read(info).decode("utf-8")
+        return
+
+    with tarfile.open(archive, mode="r|*") as tf:
+        for member in tf:
+            path = _member_path(member.name)
+            if not member.isfile() or path is None or path.suffix != suffix:
+                continue
+            stream = tf.extractfile(member)
+            if stream is not None:
+                yield path, stream.read().decode("utf-8")
+
+
+class ArchiveWriter:
+    """Writes members into a new archive, replacing the target only once it is complete."""
+
+    def __init__(self, path: Path) -> None:
+        suffix = _archive_suffix(path)
+        if suffix is None:
+            raise ValueError(f"Unsupported archive type: {path.name}")
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        if suffix == ".zip":
+            self._zip = zipfile.ZipFile(self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            mode = f"w|{ARCHIVE_SUFFIXES[suffix]}" if ARCHIVE_SUFFIXES[suffix] else "w|"
+            self._tar = tarfile.open(str(self._tmp_path), mode=mode)  # type: ignore[call-overload]
+
+    def write(self, name: str, text: str) -> None:
+        data = text.encode("utf-8")
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        elif self._tar is not None:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self, commit: bool = True) -> None:
+        """Finishes the archive and moves it into place, or discards it when commit is False."""
+        archive = self._zip or self._tar
+        if archive is not None:
+            archive.close()
+        self._zip = self._tar = None
+        if commit:
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close(commit=exc_type is None)
@@ -1,16 +1,31 @@
 """Command-line interface for gherkbot."""
 
+import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Optional
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
 
-from gherkbot.converter import convert_ast_to_robot
+from gherkbot.archive import is_archive
+from gherkbot.converter import OutputFormat, convert_ast_to_json, convert_ast_to_robot
+from gherkbot.gitdiff import changed_features
 from gherkbot.parser import parse_feature
-from gherkbot.synchronizer import sync_directories
+from gherkbot.synchronizer import (
+    resume_sync,
+    sync_archive,
+    sync_changes,
+    sync_directories,
+)
+from gherkbot.workers import WorkerLimits
+
+if TYPE_CHECKING:
+    from gherkbot.keywords import KeywordIndex
 
 app = typer.Typer(
     name="gherkbot",
@@ -27,6 +42,14 @@ def version_callback(value: bool) -> None:
         raise typer.Exit()
 
 
+def _load_keywords(names: list[str] | None, cache_file: Path) -> "KeywordIndex | None":
+    if not names:
+        return None
+    from gherkbot.keywords import load_keyword_index
+
+    return load_keyword_index(names, cache_file)
+
+
 @app.callback()
 def main(
     version: Annotated[
@@ -47,8 +70,8 @@ def main(
 @app.command("convert")
 def convert(
     input_file: Annotated[
-        Path, typer.Argument(help="Path to the Gherkin feature file to convert.")
-    ],
+        Optional[Path], typer.Argument(help="Path to the Gherkin feature file to convert.")
+    ] = None,
     output_file: Annotated[
         Optional[Path],
         typer.Option(
@@ -65,11 +88,74 @@ def convert(
             help="Show the converted output in the console.",
         ),
     ] = False,
+    output_format: Annotated[
+        OutputFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format: Robot Framework text or a JSON suite (.rbt).",
+        ),
+    ] = OutputFormat.ROBOT,
+    keywords: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--keywords",
+            "-k",
+            help="Resource file or library whose keywords steps should call instead of stubs. Can be repeated.",
+        ),
+    ] = None,
+    keyword_cache: Annotated[
+        Path,
+        typer.Option(
+            "--keyword-cache",
+            help="File in which the keyword index is cached between runs.",
+        ),
+    ] = Path(".gherkbot_keywords.json"),
+    stream: Annotated[
+        bool,
+        typer.Option(
+            "--stream",
+            help='Read {"path", "content"} JSON lines from stdin and write {"path", "robot", "error"} lines to stdout; exits 1 if any record failed.',
+        ),
+    ] = False,
+    low_memory: Annotated[
+        bool,
+        typer.Option(
+            "--low-memory",
+            help="Convert one scenario at a time, for very large generated feature files (Robot format only).",
+        ),
+    ] = False,
 ) -> None:
     """Convert a Gherkin feature file to Robot Framework format."""
+    if stream:
+        if input_file is not None or output_file is not None:
+            console.print("[red]Error:[/red] --stream reads stdin and writes stdout; do not pass files.")
+            raise typer.Exit(1)
+        from gherkbot.stream import convert_stream
+
+        keyword_index = _load_keywords(keywords, keyword_cache)
+        if convert_stream(sys.stdin, sys.stdout, output_format, keyword_index):
+            raise typer.Exit(1)
+        return
+
+    if input_file is None:
+        console.print("[red]Error:[/red] Missing input file.")
+        raise typer.Exit(1)
     if not input_file.exists():
         console.print(f"[red]Error:[/red] File '{input_file}' does not exist.")
         raise typer.Exit(1)
+    if is_archive(input_file):
+        if output_file is None:
+            console.print("[red]Error:[/red] Converting an archive requires --output (a directory or archive).")
+            raise typer.Exit(1)
+        _sync_archive(input_file, output_file, output_format, False, keywords, keyword_cache)
+        return
+    if low_memory:
+        if output_format is not OutputFormat.ROBOT:
+            console.print("[red]Error:[/red] --low-memory only supports the robot format.")
+            raise typer.Exit(1)
+        if _convert_low_memory(input_file, output_file, _load_keywords(keywords, keyword_cache)):
+            return
 
     content = input_file.read_text()
     ast = parse_feature(content)
@@ -81,15 +167,27 @@ def convert(
         raise typer.Exit(1)
 
     try:
-        robot_code = convert_ast_to_robot(ast)
+        keyword_index = _load_keywords(keywords, keyword_cache)
+        if output_format is OutputFormat.JSON:
+            from robot.running import TestSuite
+
+            name = TestSuite.name_from_source(output_file) if output_file else None
+            robot_code = convert_ast_to_json(ast, name=name, keyword_index=keyword_index, output_file=output_file)
+        else:
+            robot_code = convert_ast_to_robot(ast, keyword_index, output_file)
     except Exception as e:
         console.print(f"[red]Error during conversion:[/red] {e}")
         raise typer.Exit(1) from e
+    if not robot_code:
+        # An empty .rbt would make Robot abort the whole run, so nothing is written.
+        console.print("[red]Error:[/red] The feature uses Gherkin that cannot be converted.")
+        raise typer.Exit(1)
 
     if show or not output_file:
+        lexer = "json" if output_format is OutputFormat.JSON else "robotframework"
         console.print(
             Panel(
-                Syntax(robot_code, "robotframework"),
+                Syntax(robot_code, lexer),
                 title=f"Converted: {input_file.name}",
                 border_style="blue",
             )
@@ -101,24 +199,374 @@ def convert(
         console.print(f"[green]✓[/green] Converted to: {output_file}")
 
 
+def _convert_low_memory(
+    input_file: Path, output_file: Path | None, keyword_index: "KeywordIndex | None"
+) -> bool:
+    """Converts input_file block by block; returns False if it must be converted whole."""
+    from gherkbot.incremental import UnsupportedLayout, convert_incremental
+
+    # Written to a temporary file first: a Rule found late means starting over.
+    try:
+        if output_file is None:
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as output:
+                convert_incremental(input_file, output, keyword_index)
+                output.seek(0)
+                shutil.copyfileobj(output, sys.stdout)
+            return True
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_file.with_name(f".{output_file.name}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as output:
+                convert_incremental(input_file, output, keyword_index, output_file)
+            os.replace(tmp_path, output_file)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    except UnsupportedLayout as e:
+        console.print(f"[yellow]Converting the whole file:[/yellow] {e}", highlight=False)
+        return False
+    except ValueError as e:
+        console.print(f"[red]Error during conversion:[/red] {e}")
+        raise typer.Exit(1) from e
+    console.print(f"[green]✓[/green] Converted to: {output_file}")
+    return True
+
+
 @app.command()
 def sync(
     input_dir: Annotated[
-        Path, typer.Argument(help="The input directory containing .feature files.")
-    ],
+        Optional[Path],
+        typer.Argument(
+            help="The input directory containing .feature files. Without it, the targets of the configuration file are synced."
+        ),
+    ] = None,
     output_dir: Annotated[
-        Path,
+        Optional[Path],
         typer.Argument(help="The output directory for the generated .robot files."),
-    ],
+    ] = None,
+    since: Annotated[
+        Optional[str],
+        typer.Option(
+            "--since",
+            help="Only process .feature files changed since this git revision.",
+        ),
+    ] = None,
+    staged: Annotated[
+        bool,
+        typer.Option(
+            "--staged",
+            help="Only process .feature files staged in the git index (for pre-commit hooks).",
+        ),
+    ] = False,
+    output_format: Annotated[
+        OutputFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format: .robot files or JSON suites (.rbt).",
+        ),
+    ] = OutputFormat.ROBOT,
+    bundle: Annotated[
+        bool,
+        typer.Option(
+            "--bundle",
+            help="Merge all .feature files in a directory into one generated suite.",
+        ),
+    ] = False,
+    keywords: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--keywords",
+            "-k",
+            help="Resource file or library whose keywords steps should call instead of stubs. Can be repeated.",
+        ),
+    ] = None,
+    keyword_cache: Annotated[
+        Path,
+        typer.Option(
+            "--keyword-cache",
+            help="File in which the keyword index is cached between runs.",
+        ),
+    ] = Path(".gherkbot_keywords.json"),
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Finish an interrupted sync by redoing only the operations it had not completed; runs a normal sync where there is none.",
+        ),
+    ] = False,
+    timeout: Annotated[
+        Optional[float],
+        typer.Option(
+            "--timeout",
+            help="Convert in supervised workers and give up on files taking longer than this many seconds.",
+        ),
+    ] = None,
+    max_memory: Annotated[
+        Optional[int],
+        typer.Option(
+            "--max-memory",
+            help="Convert in supervised workers and give up on files needing more than this many MiB.",
+        ),
+    ] = None,
+    jobs: Annotated[
+        Optional[int],
+        typer.Option(
+            "--jobs",
+            "-j",
+            help="Convert in this many supervised worker processes (default: CPU count when limits are set).",
+        ),
+    ] = None,
+    threads: Annotated[
+        Optional[int],
+        typer.Option(
+            "--threads",
+            help="Convert in this many threads instead of worker processes; fastest on free-threaded Python.",
+        ),
+    ] = None,
+) -> None:
+    """Sync .feature files from an input directory to .robot files in an output directory.
+
+    Without directories, every target declared in gherkbot.toml or in
+    [tool.gherkbot] of pyproject.toml is synced in one run.
+    """
+    if since and staged:
+        console.print("[red]Error:[/red] --since and --staged cannot be combined.")
+        raise typer.Exit(1)
+    if threads is not None and (timeout is not None or max_memory is not None or jobs is not None):
+        console.print("[red]Error:[/red] --threads cannot be combined with --jobs, --timeout or --max-memory.")
+        raise typer.Exit(1)
+    if input_dir is None:
+        _sync_config(since, staged, resume, jobs, timeout, max_memory, threads)
+        return
+    if output_dir is None:
+        console.print("[red]Error:[/red] Missing output directory.")
+        raise typer.Exit(1)
+    if is_archive(input_dir) or is_archive(output_dir):
+        if since or staged or resume:
+            console.print("[red]Error:[/red] --since, --staged and --resume do not apply to archives.")
+            raise typer.Exit(1)
+        if jobs is not None or timeout is not None or max_memory is not None or threads is not None:
+            console.print("[red]Error:[/red] --jobs, --timeout, --max-memory and --threads do not apply to archives.")
+            raise typer.Exit(1)
+        _sync_archive(input_dir, output_dir, output_format, bundle, keywords, keyword_cache)
+        return
+
+    supervised = timeout is not None or max_memory is not None or jobs is not None
+    limits = WorkerLimits(timeout, max_memory) if supervised else None
+    try:
+        keyword_index = _load_keywords(keywords, keyword_cache)
+        failures = resume_sync(input_dir, output_dir, keyword_index, jobs, limits, threads=threads) if resume else None
+        if failures is not None:
+            message = "Resumed interrupted sync."
+        elif since or staged:
+            changes = changed_features(input_dir, since=since, staged=staged)
+            failures = sync_changes(
+                input_dir, output_dir, changes, output_format, bundle, keyword_index, jobs, limits, threads=threads
+            )
+            message = "Sync complete."
+        else:
+            failures = sync_directories(
+                input_dir, output_dir, output_format, bundle, keyword_index, jobs, limits, threads=threads
+            )
+            message = "Sync complete."
+    except Exception as e:
+        console.print(f"[red]Error during sync:[/red] {e}")
+        raise typer.Exit(1) from e
+
+    for failure in failures:
+        console.print(f"[yellow]Skipped[/yellow] {', '.join(failure.sources)}: {failure.reason}")
+    if failures:
+        console.print(f"[red]✗[/red] {message[:-1]}, but {len(failures)} output file(s) could not be generated.")
+        raise typer.Exit(1)
+    console.print(f"[green]✓[/green] {message}")
+
+
+def _sync_archive(
+    source: Path,
+    destination: Path,
+    output_format: OutputFormat,
+    bundle: bool,
+    keywords: list[str] | None,
+    keyword_cache: Path,
 ) -> None:
-    """Sync .feature files from an input directory to .robot files in an output directory."""
     try:
-        sync_directories(input_dir, output_dir)
-        console.print("[green]✓[/green] Sync complete.")
+        keyword_index = _load_keywords(keywords, keyword_cache)
+        failures = sync_archive(source, destination, output_format, bundle, keyword_index)
     except Exception as e:
         console.print(f"[red]Error during sync:[/red] {e}")
         raise typer.Exit(1) from e
 
+    for failure in failures:
+        console.print(f"[yellow]Skipped[/yellow] {', '.join(failure.sources)}: {failure.reason}")
+    if failures:
+        console.print(f"[red]✗[/red] Sync complete, but {len(failures)} output file(s) could not be generated.")
+        raise typer.Exit(1)
+    console.print("[green]✓[/green] Sync complete.")
+
+
+def _sync_config(
+    since: str | None,
+    staged: bool,
+    resume: bool,
+    jobs: int | None,
+    timeout: float | None,
+    max_memory: int | None,
+    threads: int | None = None,
+) -> None:
+    from rich.table import Table
+
+    from gherkbot.config import ConfigError, find_config, load_config
+    from gherkbot.keywords import KeywordIndex
+    from gherkbot.synchronizer import sync_targets
+
+    try:
+        config_path = find_config()
+        if config_path is None:
+            raise ConfigError(
+                "No directories given and no gherkbot.toml or [tool.gherkbot] section in pyproject.toml found."
+            )
+        config = load_config(config_path)
+        # One index and cache file for the keywords of all targets; each target sees only its own sources.
+        names = list(dict.fromkeys(name for target in config.targets for name in target.keywords))
+        shared = _load_keywords(names, config.keyword_cache)
+        sources = {source.name: source for source in shared.sources} if shared else {}
+        indexes: dict[tuple[str, ...], KeywordIndex | None] = {(): None}
+        for target in config.targets:
+            key = tuple(target.keywords)
+            if key not in indexes:
+                indexes[key] = KeywordIndex([sources[name] for name in key])
+
+        limits = WorkerLimits(timeout or config.timeout, max_memory or config.max_memory)
+        reports = sync_targets(
+            config.targets,
+            [indexes[tuple(target.keywords)] for target in config.targets],
+            jobs or config.jobs,
+            limits,
+            since=since,
+            staged=staged,
+            resume=resume,
+            # Worker options given on the command line override threads from the configuration.
+            threads=threads or (None if jobs or timeout or max_memory else config.threads),
+        )
+    except ConfigError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from e
+    except Exception as e:
+        console.print(f"[red]Error during sync:[/red] {e}")
+        raise typer.Exit(1) from e
+
+    table = Table(title=f"Sync targets from {config_path.name}")
+    for column in ["Target", "Created", "Updated", "Deleted", "Moved", "Failed"]:
+        table.add_column(column, justify="left" if column == "Target" else "right")
+    failed = 0
+    for report in reports:
+        actions = [op.action for op in report.operations]
+        failed += len(report.failures)
+        table.add_row(
+            report.target.name,
+            *(str(actions.count(action)) for action in ["create", "update", "delete", "move"]),
+            str(len(report.failures)),
+        )
+    console.print(table)
+    for report in reports:
+        for failure in report.failures:
+            console.print(f"[yellow]Skipped[/yellow] {report.target.name}: {', '.join(failure.sources)}: {failure.reason}")
+    if failed:
+        console.print(f"[red]✗[/red] Sync complete, but {failed} output file(s) could not be generated.")
+        raise typer.Exit(1)
+    console.print(f"[green]✓[/green] Synced {len(reports)} target(s).")
+
+
+@app.command()
+def stats(
+    input_dir: Annotated[
+        Path, typer.Argument(help="The directory containing .feature files to profile.")
+    ],
+    json_output: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--json",
+            help="Write the full report as JSON to this file ('-' for stdout).",
+        ),
+    ] = None,
+    top: Annotated[
+        int,
+        typer.Option("--top", "-n", help="Number of files and step texts to list."),
+    ] = 10,
+    jobs: Annotated[
+        Optional[int],
+        typer.Option("--jobs", "-j", help="Number of worker processes (default: CPU count)."),
+    ] = None,
+    exact: Annotated[
+        bool,
+        typer.Option(
+            "--exact",
+            help="Also parse and convert every file to measure the real output size.",
+        ),
+    ] = False,
+) -> None:
+    """Report scenario, step and example counts and conversion hot spots for a tree."""
+    from rich.table import Table
+
+    from gherkbot.stats import collect_stats
+
+    if not input_dir.is_dir():
+        console.print(f"[red]Error:[/red] Directory '{input_dir}' does not exist.")
+        raise typer.Exit(1)
+
+    corpus = collect_stats(input_dir, jobs=jobs, exact=exact, top=top)
+
+    if json_output is not None:
+        report = corpus.model_dump_json(indent=2)
+        if str(json_output) == "-":
+            typer.echo(report)
+            return
+        json_output.write_text(report)
+
+    console.print(
+        f"{corpus.total_files} feature files, {corpus.total_tests} tests, "
+        f"{corpus.total_steps} steps, {corpus.total_example_rows} example rows, "
+        f"~{corpus.total_estimated_output_bytes} bytes of generated output"
+    )
+
+    files = Table(title="Most expensive features")
+    for column in ("File", "Tests", "Steps", "Example rows", "Output bytes", "Est. cost"):
+        files.add_column(column, justify="left" if column == "File" else "right")
+    for file_stats in sorted(corpus.files, key=lambda f: f.estimated_cost, reverse=True)[:top]:
+        files.add_row(
+            file_stats.path,
+            str(file_stats.tests),
+            str(file_stats.steps),
+            str(file_stats.example_rows),
+            str(file_stats.output_bytes if file_stats.output_bytes is not None else file_stats.estimated_output_bytes),
+            str(file_stats.estimated_cost),
+        )
+    console.print(files)
+
+    steps = Table(title="Most reused step texts")
+    steps.add_column("Step")
+    steps.add_column("Uses", justify="right")
+    for usage in corpus.top_steps:
+        steps.add_row(usage.text, str(usage.count))
+    console.print(steps)
+
+    for file_stats in corpus.files:
+        if file_stats.error:
+            console.print(f"[yellow]Warning:[/yellow] {file_stats.path}: {file_stats.error}")
+
+    if json_output is not None:
+        console.print(f"[green]✓[/green] Report written to: {json_output}")
+
+
+@app.command()
+def lsp() -> None:
+    """Run a language server (stdio) that previews generated Robot code while editing."""
+    import sys
+
+    from gherkbot.lsp import serve
+
+    serve(sys.stdin.buffer, sys.stdout.buffer)
+
 
 if __name__ == "__main__":
     app()
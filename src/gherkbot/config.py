@@ -0,0 +1,101 @@
+"""Sync targets declared in ``gherkbot.toml`` or in ``[tool.gherkbot]`` of ``pyproject.toml``.
+
+Example::
+
+    [tool.gherkbot]
+    jobs = 8
+
+    [[tool.gherkbot.targets]]
+    input = "services/cart/features"
+    output = "services/cart/robot"
+    bundle = true
+    keywords = ["services/cart/keywords.resource"]
+
+In ``gherkbot.toml`` the same keys are written at the top level. Relative
+paths are resolved against the directory of the configuration file.
+"""
+
+import tomllib
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from gherkbot.converter import OutputFormat
+from gherkbot.keywords import RESOURCE_SUFFIXES
+
+CONFIG_FILES = ("gherkbot.toml", "pyproject.toml")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+class SyncTarget(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = ""  # Shown in reports; defaults to the input directory
+    input: Path
+    output: Path
+    format: OutputFormat = OutputFormat.ROBOT
+    bundle: bool = False
+    keywords: list[str] = Field(default_factory=list)
+
+
+class GherkbotConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    jobs: int | None = None
+    timeout: float | None = None
+    max_memory: int | None = None
+    threads: int | None = None  # Convert in threads instead of supervised worker processes
+    keyword_cache: Path = Path(".gherkbot_keywords.json")
+    targets: list[SyncTarget] = Field(default_factory=list)
+
+
+def _read_table(path: Path) -> dict | None:
+    """Returns the gherkbot table of a configuration file, or None if it has none."""
+    try:
+        data = tomllib.loads(path.read_text())
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ConfigError(f"Cannot read {path}: {e}") from e
+    if path.name == "pyproject.toml":
+        return data.get("tool", {}).get("gherkbot")
+    return data
+
+
+def find_config(start: Path | None = None) -> Path | None:
+    """Finds the nearest configuration file in start or one of its parents."""
+    directory = (start or Path.cwd()).resolve()
+    for candidate in [directory, *directory.parents]:
+        for name in CONFIG_FILES:
+            path = candidate / name
+            if path.is_file() and _read_table(path) is not None:
+                return path
+    return None
+
+
+def load_config(path: Path) -> GherkbotConfig:
+    """Reads and validates a configuration file, resolving its relative paths."""
+    table = _read_table(path)
+    if table is None:
+        raise ConfigError(f"{path} has no [tool.gherkbot] section.")
+    try:
+        config = GherkbotConfig.model_validate(table)
+    except ValidationError as e:
+        detail = e.errors()[0]
+        location = ".".join(str(part) for part in detail["loc"])
+        raise ConfigError(f"Invalid configuration in {path} at {location}: {detail['msg']}") from None
+    if config.threads is not None and (config.jobs, config.timeout, config.max_memory) != (None, None, None):
+        raise ConfigError(f"Invalid configuration in {path}: threads cannot be combined with jobs, timeout or max_memory.")
+
+    base = path.parent
+    config.keyword_cache = base / config.keyword_cache
+    for target in config.targets:
+        target.name = target.name or target.input.as_posix()
+        target.input = base / target.input
+        target.output = base / target.output
+        target.keywords = [
+            str(base / name) if Path(name).suffix in (*RESOURCE_SUFFIXES, ".py") else name
+            for name in target.keywords
+        ]
+    return config
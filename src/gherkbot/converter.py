@@ -1,7 +1,26 @@
+import os
 import re
-from typing import cast
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from robot.running import TestSuite
+
+    from gherkbot.keywords import KeywordIndex
+
+class OutputFormat(str, Enum):
+    """Supported output formats for generated suites."""
+
+    ROBOT = "robot"  # Robot Framework source text
+    JSON = "json"  # Robot Framework JSON suite, loaded without parsing
+
+    @property
+    def extension(self) -> str:
+        return ".rbt" if self is OutputFormat.JSON else ".robot"
+
+
 # Pydantic Model Definitions for Gherkin AST
 
 
@@ -97,6 +116,40 @@ class GherkinASTModel(BaseModel):
     comments: list[str] = Field(default_factory=list)
 
 
+# Pydantic Model Definitions for the generated Robot Framework suite
+
+
+class RobotStepModel(BaseModel):  # A single keyword call, e.g. "Given a step"
+    name: str
+    args: list[str] = Field(default_factory=list)
+
+
+class RobotTestModel(BaseModel):
+    name: str
+    steps: list[RobotStepModel] = Field(default_factory=list)
+    setup: str | None = None  # Overrides the suite-level test setup
+    template: str | None = None  # Set for Scenario Outline example rows
+    template_args: list[str] = Field(default_factory=list)
+
+
+class RobotKeywordModel(BaseModel):
+    name: str
+    args: list[str] = Field(default_factory=list)  # Argument names without ${}
+    steps: list[RobotStepModel] = Field(default_factory=list)
+    implemented: bool = True  # False for generated "Not Implemented" stubs
+
+
+class RobotSuiteModel(BaseModel):
+    name: str
+    documentation: list[str] = Field(default_factory=list)
+    libraries: list[str] = Field(default_factory=list)
+    resources: list[str] = Field(default_factory=list)
+    test_setup: str | None = None
+    test_templates: list[str] = Field(default_factory=list)
+    tests: list[RobotTestModel] = Field(default_factory=list)
+    keywords: list[RobotKeywordModel] = Field(default_factory=list)
+
+
 # Rebuild models to resolve forward references
 _ = LocationModel.model_rebuild()
 _ = CellModel.model_rebuild()
@@ -112,66 +165,102 @@ _ = ChildModel.model_rebuild()
 _ = FeatureModel.model_rebuild()
 _ = GherkinASTModel.model_rebuild()
 
+_ = RobotStepModel.model_rebuild()
+_ = RobotTestModel.model_rebuild()
+_ = RobotKeywordModel.model_rebuild()
+_ = RobotSuiteModel.model_rebuild()
 
-def _format_robot_steps(
+
+BACKGROUND_KEYWORD = "Run Background Steps"
+
+
+def _build_robot_steps(
     steps: list[StepNodeModel], arg_names: list[str] | None = None
-) -> list[str]:
-    formatted_steps: list[str] = []
+) -> list[RobotStepModel]:
+    robot_steps: list[RobotStepModel] = []
     for step_data in steps:
         keyword = step_data.keyword.strip()
         text = step_data.text
         if arg_names:  # For scenario outline steps, replace placeholders
             for arg_name in arg_names:
                 text = re.sub(f"<{re.escape(arg_name)}>", f"${{{arg_name}}}", text)
-        formatted_steps.append(f"    {keyword} {text}")
 
+        args: list[str] = []
         if step_data.docString:
-            doc_string_content = step_data.docString.content
-            for line in doc_string_content.splitlines():
-                formatted_steps.append(f"    ...    {line}")
+            args.extend(step_data.docString.content.splitlines())
         if step_data.dataTable:
             for row in step_data.dataTable.rows:
                 cell_values = [cell.value for cell in row.cells]
-                formatted_steps.append(f"    ...    | {' | '.join(cell_values)} |")
+                args.append(f"| {' | '.join(cell_values)} |")
+        robot_steps.append(RobotStepModel(name=f"{keyword} {text}", args=args))
+    return robot_steps
+
+
+def _format_robot_steps(steps: list[RobotStepModel]) -> list[str]:
+    formatted_steps: list[str] = []
+    for step in steps:
+        formatted_steps.append(f"    {step.name}")
+        formatted_steps.extend(f"    ...    {arg}" for arg in step.args)
     return formatted_steps
 
 
-def convert_ast_to_robot(gherkin_ast_data_obj: object) -> str:
+def _resource_import(name: str, output_file: Path | None) -> str:
+    """Returns the path a suite written to output_file uses to import a resource file.
+
+    Robot resolves resource imports against the directory of the suite, so a
+    path given relative to the working directory is rewritten relative to
+    output_file, or made absolute when the output location is unknown. JSON
+    suites have no source directory to resolve against, so they always get
+    absolute paths.
+    """
+    path = Path(name).absolute()
+    if output_file is not None and output_file.suffix != OutputFormat.JSON.extension:
+        try:
+            return Path(os.path.relpath(path, output_file.absolute().parent)).as_posix()
+        except ValueError:
+            pass  # On another drive than the output
+    return path.as_posix()
+
+
+def build_robot_model(
+    gherkin_ast_data_obj: object,
+    keyword_index: "KeywordIndex | None" = None,
+    output_file: Path | None = None,
+) -> RobotSuiteModel | None:
+    """Builds the intermediate Robot Framework suite model from a Gherkin AST.
+
+    Returns None if the AST is empty, invalid or has no feature. Both
+    convert_ast_to_robot and convert_ast_to_suite render this model.
+
+    Steps that match a keyword in keyword_index call that keyword, and its
+    library or resource file is imported; stubs are only generated for misses.
+    Resource files are imported relative to output_file, the path the suite
+    will be written to, or by absolute path if it is not given.
+    """
     if not gherkin_ast_data_obj:
-        return ""
+        return None
     gherkin_ast_data = cast(dict[str, str], gherkin_ast_data_obj)
 
     try:
         gherkin_ast = GherkinASTModel.model_validate(gherkin_ast_data)
     except Exception:
-        return ""
+        return None
 
     if not gherkin_ast.feature:
-        return ""
+        return None
 
     feature = gherkin_ast.feature
-    unique_keywords = set()
+    unique_keywords: set[str] = set()
+    # Outline steps with placeholders: the text the template calls, with ${arg}s, and its text in each example row
+    outline_steps: dict[str, list[str]] = {}
 
-    # --- Settings Section ---
-    settings_lines = ["*** Settings ***"]
     doc_parts = [f"Feature: {feature.name}"]
     if feature.description:
         doc_parts.extend([line.strip() for line in feature.description.strip().split("\n")])
 
-    if len(doc_parts) > 1:
-        # Join with ... and correct indentation for multi-line descriptions
-        formatted_doc = f"{doc_parts[0]}\n...    " + "\n...    ".join(doc_parts[1:])
-        settings_lines.append(f"Documentation    {formatted_doc}")
-    else:
-        settings_lines.append(f"Documentation    {doc_parts[0]}")
-
-    # --- Data Collection ---
-    test_case_definitions = []
-    keyword_definitions = []
-
-    has_background = any(c.background for c in feature.children)
-    if has_background:
-        settings_lines.append("Test Setup       Run Background Steps")
+    suite = RobotSuiteModel(name=feature.name, documentation=doc_parts)
+    if any(c.background for c in feature.children):
+        suite.test_setup = BACKGROUND_KEYWORD
 
     for child_item in feature.children:
         # --- Background ---
@@ -180,33 +269,203 @@ def convert_ast_to_robot(gherkin_ast_data_obj: object) -> str:
             for step in bg_data.steps:
                 unique_keywords.add(step.text)
             background_steps_raw = [StepNodeModel.model_validate(s.model_dump()) for s in bg_data.steps]
-            keyword_definitions.append(("Run Background Steps", None, _format_robot_steps(background_steps_raw)))
+            suite.keywords.append(
+                RobotKeywordModel(name=BACKGROUND_KEYWORD, steps=_build_robot_steps(background_steps_raw))
+            )
 
         # --- Scenarios ---
         if child_item.scenario:
             scenario = child_item.scenario
-            for step in scenario.steps:
-                unique_keywords.add(step.text)
+            if scenario.keyword != "Scenario Outline":
+                for step in scenario.steps:
+                    unique_keywords.add(step.text)
 
             if scenario.keyword == "Scenario":
                 scenario_steps_raw = [StepNodeModel.model_validate(s.model_dump()) for s in scenario.steps]
-                test_case_definitions.append((scenario.name, _format_robot_steps(scenario_steps_raw)))
+                suite.tests.append(
+                    RobotTestModel(name=scenario.name, steps=_build_robot_steps(scenario_steps_raw))
+                )
 
             elif scenario.keyword == "Scenario Outline":
                 template_name = f"{scenario.name} Template"
-                settings_lines.append(f"Test Template    {template_name}")
+                suite.test_templates.append(template_name)
 
                 example_headers = []
                 if scenario.examples and scenario.examples[0].tableHeader:
                     example_headers = [c.value for c in scenario.examples[0].tableHeader.cells]
 
                 outline_steps_raw = [StepNodeModel.model_validate(s.model_dump()) for s in scenario.steps]
-                keyword_definitions.append((template_name, example_headers, _format_robot_steps(outline_steps_raw, example_headers)))
+                suite.keywords.append(
+                    RobotKeywordModel(
+                        name=template_name,
+                        args=example_headers,
+                        steps=_build_robot_steps(outline_steps_raw, example_headers),
+                    )
+                )
+
+                rows = [[c.value for c in row.cells] for block in scenario.examples for row in block.tableBody]
+                for step, robot_step in zip(scenario.steps, suite.keywords[-1].steps):
+                    template_text = robot_step.name.split(" ", 1)[1]
+                    if template_text == step.text:
+                        unique_keywords.add(step.text)
+                        continue
+                    row_texts = outline_steps.setdefault(template_text, [])
+                    for values in rows:
+                        text = step.text
+                        for header, value in zip(example_headers, values):
+                            text = text.replace(f"<{header}>", value)
+                        row_texts.append(text)
 
                 for examples_block in scenario.examples:
                     for row in examples_block.tableBody:
                         data_row_values = [c.value for c in row.cells]
-                        test_case_definitions.append((f"{scenario.name} - {', '.join(data_row_values)}", data_row_values))
+                        suite.tests.append(
+                            RobotTestModel(
+                                name=f"{scenario.name} - {', '.join(data_row_values)}",
+                                template=template_name,
+                                template_args=data_row_values,
+                            )
+                        )
+
+    defined_keywords = {kw.name for kw in suite.keywords}
+
+    def resolve(text: str) -> bool:
+        """Imports the source of the keyword text calls; False if there is none."""
+        if text in defined_keywords:
+            return True
+        source = keyword_index.match(text) if keyword_index else None
+        if source is None:
+            return False
+        if source.kind == "resource":
+            imports, name = suite.resources, _resource_import(source.name, output_file)
+        else:
+            imports, name = suite.libraries, source.name
+        if name not in imports:
+            imports.append(name)
+        return True
+
+    stubs = {keyword for keyword in sorted(unique_keywords) if not resolve(keyword)}
+    for template_text, row_texts in outline_steps.items():
+        missing = [text for text in row_texts if not resolve(text)]
+        if missing and len(missing) == len(row_texts):
+            # One stub with embedded arguments serves every row, as well as dry runs of the template.
+            stubs.add(template_text)
+        else:
+            stubs.update(missing)
+    suite.keywords.extend(RobotKeywordModel(name=name, implemented=False) for name in sorted(stubs))
+
+    return suite
+
+
+def _unique_name(name: str, used: set[str]) -> str:
+    candidate = name
+    counter = 2
+    while candidate in used:
+        candidate = f"{name} ({counter})"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def merge_robot_models(name: str, suites: list[RobotSuiteModel]) -> RobotSuiteModel:
+    """Merges the suite models of several features into one bundled suite.
+
+    Each feature's Background becomes its own setup keyword that is set on
+    that feature's tests only, and templates are set per test. Test and
+    keyword names that clash between features are prefixed with the feature
+    name (and numbered if still not unique). Step stubs are shared.
+    """
+    bundle = RobotSuiteModel(name=name)
+    used_tests: set[str] = set()
+    used_keywords: set[str] = set()
+    stub_names: set[str] = set()
+
+    for suite in suites:
+        bundle.documentation.append(suite.documentation[0] if suite.documentation else suite.name)
+        bundle.libraries.extend(lib for lib in suite.libraries if lib not in bundle.libraries)
+        bundle.resources.extend(res for res in suite.resources if res not in bundle.resources)
+
+        renamed: dict[str, str] = {}
+        for kw in suite.keywords:
+            if not kw.implemented:
+                stub_names.add(kw.name)
+                continue
+            if kw.name == BACKGROUND_KEYWORD:
+                new_name = _unique_name(f"{suite.name} Background", used_keywords)
+            elif kw.name in used_keywords:
+                new_name = _unique_name(f"{suite.name} - {kw.name}", used_keywords)
+            else:
+                new_name = _unique_name(kw.name, used_keywords)
+            renamed[kw.name] = new_name
+            bundle.keywords.append(kw.model_copy(update={"name": new_name}))
+
+        setup = renamed.get(suite.test_setup) if suite.test_setup else None
+        for test in suite.tests:
+            test_name = test.name
+            if test_name in used_tests:
+                test_name = f"{suite.name} - {test_name}"
+            bundle.tests.append(
+                test.model_copy(
+                    update={
+                        "name": _unique_name(test_name, used_tests),
+                        "setup": renamed.get(test.setup, test.setup) if test.setup else setup,
+                        "template": renamed.get(test.template, test.template) if test.template else None,
+                    }
+                )
+            )
+
+    for stub in sorted(stub_names - used_keywords):
+        bundle.keywords.append(RobotKeywordModel(name=stub, implemented=False))
+    return bundle
+
+
+def render_test(test: RobotTestModel, suite_templates: list[str]) -> list[str]:
+    """Renders one test case, followed by a blank line."""
+    if test.template in suite_templates and not test.setup:
+        # It's an outline using the suite-level template, content is just data
+        return [f"{test.name}    {'    '.join(test.template_args)}", ""]
+    lines = [test.name]
+    if test.setup:
+        lines.append(f"    [Setup]    {test.setup}")
+    if test.template is not None:
+        lines.append(f"    [Template]    {test.template}")
+        lines.append(f"    {'    '.join(test.template_args)}")
+    lines.extend(_format_robot_steps(test.steps))
+    lines.append("")
+    return lines
+
+
+def render_keyword(kw: RobotKeywordModel) -> list[str]:
+    """Renders one keyword, or the stub of an unimplemented one, followed by a blank line."""
+    if not kw.implemented:
+        return [kw.name, f'    # TODO: implement keyword "{kw.name}".', "    Fail    Not Implemented", ""]
+    lines = [kw.name]
+    if kw.args:
+        lines.append(f"    [Arguments]    {'    '.join([f'${{{arg}}}' for arg in kw.args])}")
+    lines.extend(_format_robot_steps(kw.steps))
+    lines.append("")
+    return lines
+
+
+def render_robot(suite: RobotSuiteModel) -> str:
+    """Renders a suite model as Robot Framework source text."""
+    # --- Settings Section ---
+    settings_lines = ["*** Settings ***"]
+    doc_parts = suite.documentation
+    if len(doc_parts) > 1:
+        # Join with ... and correct indentation for multi-line descriptions
+        formatted_doc = f"{doc_parts[0]}\n...    " + "\n...    ".join(doc_parts[1:])
+        settings_lines.append(f"Documentation    {formatted_doc}")
+    elif doc_parts:
+        settings_lines.append(f"Documentation    {doc_parts[0]}")
+    for library in suite.libraries:
+        settings_lines.append(f"Library          {library}")
+    for resource in suite.resources:
+        settings_lines.append(f"Resource         {resource}")
+    if suite.test_setup:
+        settings_lines.append(f"Test Setup       {suite.test_setup}")
+    for template_name in suite.test_templates:
+        settings_lines.append(f"Test Template    {template_name}")
 
     # --- Assemble Final Output ---
     final_output_lines = []
@@ -214,38 +473,91 @@ def convert_ast_to_robot(gherkin_ast_data_obj: object) -> str:
         final_output_lines.extend(settings_lines)
         final_output_lines.append("")
 
-    if test_case_definitions:
+    if suite.tests:
         final_output_lines.append("*** Test Cases ***")
-        for tc_name, tc_content in test_case_definitions:
-            is_regular_scenario = any(line.strip().startswith(("Given", "When", "Then", "And", "But")) for line in tc_content)
-            if is_regular_scenario:
-                final_output_lines.append(tc_name)
-                final_output_lines.extend(tc_content)
-            else: # It's an outline, content is just data
-                final_output_lines.append(f"{tc_name}    {'    '.join(tc_content)}")
-            final_output_lines.append("")
-
-    if keyword_definitions or unique_keywords:
+        for test in suite.tests:
+            final_output_lines.extend(render_test(test, suite.test_templates))
+
+    if suite.keywords:
         final_output_lines.append("*** Keywords ***")
 
-    if keyword_definitions:
-        for kw_name, kw_args, kw_steps in keyword_definitions:
-            final_output_lines.append(kw_name)
-            if kw_args:
-                final_output_lines.append(f"    [Arguments]    {'    '.join([f'${{{arg}}}' for arg in kw_args])}")
-            final_output_lines.extend(kw_steps)
-            final_output_lines.append("")
-
-    if unique_keywords:
-        defined_keywords = {kw[0] for kw in keyword_definitions}
-        for keyword in sorted(list(unique_keywords)):
-            if keyword not in defined_keywords:
-                final_output_lines.append(keyword)
-                final_output_lines.append(f'    # TODO: implement keyword "{keyword}".')
-                final_output_lines.append("    Fail    Not Implemented")
-                final_output_lines.append("")
+    for kw in suite.keywords:
+        final_output_lines.extend(render_keyword(kw))
 
     while final_output_lines and final_output_lines[-1] == "":
         final_output_lines.pop()
 
     return "\n".join(final_output_lines) + "\n" if final_output_lines else ""
+
+
+def build_test_suite(suite_model: RobotSuiteModel) -> "TestSuite":
+    """Builds an executable robot.running.TestSuite from a suite model."""
+    from robot.running import TestSuite
+
+    suite = TestSuite(name=suite_model.name, doc="\n".join(suite_model.documentation))
+    for library in suite_model.libraries:
+        suite.resource.imports.library(library)
+    for resource in suite_model.resources:
+        suite.resource.imports.resource(resource)
+
+    for test_model in suite_model.tests:
+        test = suite.tests.create(name=test_model.name, template=test_model.template)
+        setup = test_model.setup or suite_model.test_setup
+        if setup:
+            test.setup.config(name=setup)
+        if test_model.template is not None:
+            test.body.create_keyword(name=test_model.template, args=test_model.template_args)
+        for step in test_model.steps:
+            test.body.create_keyword(name=step.name, args=step.args)
+
+    for kw_model in suite_model.keywords:
+        kw = suite.resource.keywords.create(
+            name=kw_model.name, args=[f"${{{arg}}}" for arg in kw_model.args]
+        )
+        if not kw_model.implemented:
+            kw.body.create_keyword(name="Fail", args=["Not Implemented"])
+        for step in kw_model.steps:
+            kw.body.create_keyword(name=step.name, args=step.args)
+
+    return suite
+
+
+def convert_ast_to_robot(
+    gherkin_ast_data_obj: object, keyword_index: "KeywordIndex | None" = None, output_file: Path | None = None
+) -> str:
+    suite = build_robot_model(gherkin_ast_data_obj, keyword_index, output_file)
+    return render_robot(suite) if suite else ""
+
+
+def convert_ast_to_suite(
+    gherkin_ast_data_obj: object, keyword_index: "KeywordIndex | None" = None, output_file: Path | None = None
+) -> "TestSuite | None":
+    """Converts a Gherkin AST directly into a robot.running.TestSuite.
+
+    The suite is built from model objects without rendering and re-parsing
+    Robot Framework text, so it can be run (e.g. ``suite.run(dryrun=True)``)
+    or inspected right away. Returns None if the AST cannot be converted.
+    """
+    suite = build_robot_model(gherkin_ast_data_obj, keyword_index, output_file)
+    return build_test_suite(suite) if suite else None
+
+
+def convert_ast_to_json(
+    gherkin_ast_data_obj: object,
+    name: str | None = None,
+    keyword_index: "KeywordIndex | None" = None,
+    output_file: Path | None = None,
+) -> str:
+    """Converts a Gherkin AST into a Robot Framework JSON suite (``.rbt``).
+
+    Robot loads JSON suites with ``TestSuite.from_json`` instead of parsing
+    text, which makes startup faster for large generated suites. Unlike
+    ``.robot`` files, a JSON suite keeps its stored name, so callers writing
+    files should pass ``name`` to keep the usual file-based suite naming.
+    """
+    suite = convert_ast_to_suite(gherkin_ast_data_obj, keyword_index, output_file)
+    if suite is None:
+        return ""
+    if name is not None:
+        suite.name = name
+    return suite.to_json()
@@ -0,0 +1,245 @@
+"""Filesystem backends for the synchronizer.
+
+The synchronizer reaches storage only through a FileSystem, so it can run
+against the local disk, an in-memory tree for fast and deterministic tests
+and benchmarks, or any other storage an embedder provides. Listing and
+stat-ing are batched: ``walk`` returns the modification times of a whole
+tree in one call, and ``stat`` answers for many paths at once, which lets
+remote backends turn them into a few bulk requests.
+"""
+
+import io
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from pathlib import Path, PurePosixPath
+from typing import IO
+
+
+class FileSystem(ABC):
+    """Storage used by the synchronizer. Paths are always pathlib.Path objects."""
+
+    @abstractmethod
+    def walk(self, root: Path, suffix: str) -> dict[Path, float]:
+        """Returns every file under root whose name ends with suffix, with its mtime."""
+
+    @abstractmethod
+    def list_dir(self, directory: Path, suffix: str) -> list[Path]:
+        """Returns the files directly in directory whose name ends with suffix, sorted."""
+
+    @abstractmethod
+    def stat(self, paths: Iterable[Path]) -> dict[Path, float | None]:
+        """Returns the mtime of each file or directory, or None if it does not exist."""
+
+    @abstractmethod
+    def read_text(self, path: Path) -> str: ...
+
+    @abstractmethod
+    def write_text(self, path: Path, text: str) -> None:
+        """Writes path atomically, creating its parent directories."""
+
+    @abstractmethod
+    def open_log(self, path: Path) -> IO[str]:
+        """Opens path for writing a log whose flushed lines must survive a crash."""
+
+    @abstractmethod
+    def unlink(self, path: Path, missing_ok: bool = False) -> None: ...
+
+    @abstractmethod
+    def rename(self, source: Path, target: Path) -> None:
+        """Moves a file, creating the parent directories of target."""
+
+    @abstractmethod
+    def rmdir_if_empty(self, directory: Path) -> None: ...
+
+    def exists(self, path: Path) -> bool:
+        return self.stat([path])[path] is not None
+
+
+class LocalFileSystem(FileSystem):
+    """The local disk. Trees are listed with os.scandir, one pass per directory."""
+
+    def walk(self, root: Path, suffix: str) -> dict[Path, float]:
+        files: dict[Path, float] = {}
+        directories = [root]
+        while directories:
+            try:
+                entries = os.scandir(directories.pop())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(Path(entry.path))
+                    elif entry.name.endswith(suffix) and entry.is_file():
+                        files[Path(entry.path)] = entry.stat().st_mtime
+        return files
+
+    def list_dir(self, directory: Path, suffix: str) -> list[Path]:
+        try:
+            with os.scandir(directory) as entries:
+                return sorted(Path(e.path) for e in entries if e.name.endswith(suffix) and e.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def stat(self, paths: Iterable[Path]) -> dict[Path, float | None]:
+        result: dict[Path, float | None] = {}
+        for path in paths:
+            try:
+                result[path] = os.stat(path).st_mtime
+            except (FileNotFoundError, NotADirectoryError):
+                result[path] = None
+        return result
+
+    def read_text(self, path: Path) -> str:
+        return path.read_text()
+
+    def write_text(self, path: Path, text: str) -> None:
+        # A crash leaves either the old or the complete new file behind.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+
+    def open_log(self, path: Path) -> IO[str]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.open("w", encoding="utf-8")
+
+    def unlink(self, path: Path, missing_ok: bool = False) -> None:
+        path.unlink(missing_ok=missing_ok)
+
+    def rename(self, source: Path, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source.replace(target)
+
+    def rmdir_if_empty(self, directory: Path) -> None:
+        try:
+            directory.rmdir()
+        except OSError:
+            pass  # Directory is not empty
+
+
+class _MemoryLog(io.StringIO):
+    def __init__(self, fs: "MemoryFileSystem", path: Path) -> None:
+        super().__init__()
+        self._fs = fs
+        self._path = path
+
+    def flush(self) -> None:
+        if not self.closed:
+            self._fs.write_text(self._path, self.getvalue())
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class MemoryFileSystem(FileSystem):
+    """A tree kept in memory, for tests and benchmarks.
+
+    Modification times come from a logical clock that advances on every
+    change, so staleness checks are deterministic. Directories exist while
+    they contain files or were created explicitly; their mtime changes when
+    an entry is added or removed, as on a real disk.
+    """
+
+    def __init__(self, files: dict[str, str] | None = None) -> None:
+        self._files: dict[PurePosixPath, tuple[str, float]] = {}
+        self._dirs: dict[PurePosixPath, float] = {}
+        self._clock = 0.0
+        for name, text in (files or {}).items():
+            self.write_text(Path(name), text)
+
+    @staticmethod
+    def _key(path: Path) -> PurePosixPath:
+        return PurePosixPath(path.as_posix())
+
+    def _tick(self) -> float:
+        self._clock += 1.0
+        return self._clock
+
+    def _add_entry(self, key: PurePosixPath) -> None:
+        now = self._tick()
+        for parent in key.parents:
+            exists = parent in self._dirs
+            self._dirs[parent] = now  # A new entry changes the mtime of its directory
+            if exists:
+                return
+
+    def _remove_entry(self, key: PurePosixPath) -> None:
+        self._dirs[key.parent] = self._tick()
+
+    def touch(self, path: Path, mtime: float | None = None) -> None:
+        """Sets the mtime of a file or directory, advancing the clock if mtime is None."""
+        key = self._key(path)
+        mtime = self._tick() if mtime is None else mtime
+        if key in self._files:
+            self._files[key] = (self._files[key][0], mtime)
+        else:
+            self._dirs[key] = mtime
+
+    def mkdir(self, path: Path) -> None:
+        key = self._key(path)
+        if key not in self._dirs:
+            self._add_entry(key)
+            self._dirs[key] = self._clock
+
+    def walk(self, root: Path, suffix: str) -> dict[Path, float]:
+        root_key = self._key(root)
+        return {
+            Path(key): mtime
+            for key, (_, mtime) in self._files.items()
+            if key.name.endswith(suffix) and root_key in key.parents
+        }
+
+    def list_dir(self, directory: Path, suffix: str) -> list[Path]:
+        key = self._key(directory)
+        return sorted(Path(k) for k in self._files if k.parent == key and k.name.endswith(suffix))
+
+    def stat(self, paths: Iterable[Path]) -> dict[Path, float | None]:
+        result: dict[Path, float | None] = {}
+        for path in paths:
+            key = self._key(path)
+            entry = self._files.get(key)
+            result[path] = entry[1] if entry else self._dirs.get(key)
+        return result
+
+    def read_text(self, path: Path) -> str:
+        try:
+            return self._files[self._key(path)][0]
+        except KeyError:
+            raise FileNotFoundError(str(path)) from None
+
+    def write_text(self, path: Path, text: str) -> None:
+        key = self._key(path)
+        if key not in self._files:
+            self._add_entry(key)
+        self._files[key] = (text, self._tick())
+
+    def open_log(self, path: Path) -> IO[str]:
+        self.write_text(path, "")
+        return _MemoryLog(self, path)
+
+    def unlink(self, path: Path, missing_ok: bool = False) -> None:
+        key = self._key(path)
+        if self._files.pop(key, None) is not None:
+            self._remove_entry(key)
+        elif not missing_ok:
+            raise FileNotFoundError(str(path))
+
+    def rename(self, source: Path, target: Path) -> None:
+        text = self.read_text(source)
+        self.unlink(source)
+        self.write_text(target, text)
+
+    def rmdir_if_empty(self, directory: Path) -> None:
+        key = self._key(directory)
+        if key not in self._dirs:
+            return
+        if any(key in k.parents for k in self._files) or any(key in k.parents for k in self._dirs):
+            return
+        del self._dirs[key]
+        self._remove_entry(key)
+
+
+LOCAL = LocalFileSystem()
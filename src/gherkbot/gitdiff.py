@@ -0,0 +1,104 @@
+"""Ask the local git repository which .feature files changed."""
+
+import subprocess
+from pathlib import Path
+from typing import NamedTuple
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails or git is not available."""
+
+
+class FeatureChange(NamedTuple):
+    """A single added, modified, deleted or renamed .feature file.
+
+    Paths are relative to the directory the diff was taken in. ``old_path`` is
+    only set for renames, and ``similarity`` is git's rename score (100 for a
+    pure move without content changes).
+    """
+
+    status: str  # "A", "M", "D" or "R"
+    path: Path
+    old_path: Path | None = None
+    similarity: int | None = None
+
+
+def _run_git(cwd: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(cwd), *args],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError as e:
+        raise GitError("git executable not found") from e
+    if result.returncode != 0:
+        raise GitError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def _is_feature(path: str) -> bool:
+    return path.endswith(".feature")
+
+
+def _parse_name_status(output: str) -> list[FeatureChange]:
+    """Parses ``git diff --name-status -z`` output into feature changes."""
+    changes: list[FeatureChange] = []
+    fields = output.split("\0")
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        kind = status[0]
+        if kind in "RC":
+            old, new = fields[i + 1], fields[i + 2]
+            i += 3
+            if kind == "C" or not _is_feature(old):
+                if _is_feature(new):
+                    changes.append(FeatureChange("A", Path(new)))
+            elif not _is_feature(new):
+                changes.append(FeatureChange("D", Path(old)))
+            else:
+                score = int(status[1:]) if status[1:].isdigit() else None
+                changes.append(FeatureChange("R", Path(new), Path(old), score))
+            continue
+
+        path = fields[i + 1]
+        i += 2
+        if not _is_feature(path):
+            continue
+        if kind == "A":
+            changes.append(FeatureChange("A", Path(path)))
+        elif kind == "D":
+            changes.append(FeatureChange("D", Path(path)))
+        else:  # M, T (type change) and U (unmerged) all mean "regenerate"
+            changes.append(FeatureChange("M", Path(path)))
+    return changes
+
+
+def changed_features(
+    input_dir: Path, since: str | None = None, staged: bool = False
+) -> list[FeatureChange]:
+    """Lists the .feature files under input_dir that changed according to git.
+
+    With ``staged`` the index is compared against HEAD, which is what a
+    pre-commit hook wants. Otherwise the working tree is compared against
+    ``since`` (HEAD by default), and untracked features count as added.
+    """
+    diff_args = ["diff", "--name-status", "-z", "-M", "--relative"]
+    if staged:
+        diff_args.append("--cached")
+    elif since:
+        diff_args.append(since)
+    diff_args.extend(["--", "."])
+
+    changes = _parse_name_status(_run_git(input_dir, *diff_args))
+
+    if not staged:
+        untracked = _run_git(
+            input_dir, "ls-files", "-z", "--others", "--exclude-standard", "--", "."
+        )
+        changes.extend(
+            FeatureChange("A", Path(p)) for p in untracked.split("\0") if _is_feature(p)
+        )
+    return changes
@@ -0,0 +1,196 @@
+"""Scenario-at-a-time conversion of very large feature files.
+
+The file is memory-mapped and read line by line. Lines are grouped into
+blocks, the feature header and then one block per Background or Scenario,
+and each block is parsed and converted on its own. Test cases are written
+as soon as their block is converted; keywords are spooled to a temporary
+file and appended at the end. Peak memory is therefore proportional to the
+largest block plus the set of distinct step texts, not to the file.
+
+The output is equivalent to a full conversion with two differences: outline
+tests name their template with ``[Template]`` instead of a suite-level
+``Test Template``, and library and resource imports found through a
+keyword index go into a second ``*** Settings ***`` section before the
+keywords, since they are only known once every step has been seen.
+"""
+
+import mmap
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from gherkbot.converter import (
+    RobotKeywordModel,
+    RobotSuiteModel,
+    build_robot_model,
+    render_keyword,
+    render_test,
+)
+from gherkbot.parser import FeatureParseError, parse_feature_with_errors
+
+if TYPE_CHECKING:
+    from gherkbot.keywords import KeywordIndex
+
+CHILD_KEYWORDS = (
+    "Background:",
+    "Scenario:",
+    "Scenario Outline:",
+    "Scenario Template:",
+    "Example:",
+)
+_BLOCK_START_CHARS = frozenset('"`#BERS')  # First characters of lines iter_blocks acts on
+_BLOCK_FEATURE_LINE = "Feature: _\n"
+_LANGUAGE_HEADER = re.compile(r"#\s*language\s*:")
+
+
+class UnsupportedLayout(Exception):
+    """The feature uses Rules or non-English keywords, which are not split into blocks."""
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """Groups lines into (first line, text) blocks: the header, then one per child.
+
+    Tag and comment lines directly above a Background or Scenario belong to
+    it. Raises UnsupportedLayout when a Rule or a language header is found.
+    """
+    current: list[str] = []
+    start = 0
+    trailing = 0  # Tag and comment lines at the end of current, after its first line
+    delimiter = None
+    for i, line in enumerate(lines):
+        stripped = line.lstrip()
+        if delimiter:
+            if stripped.startswith(delimiter):
+                delimiter = None
+        elif stripped[:1] in _BLOCK_START_CHARS:
+            if stripped.startswith(('"""', "```")):
+                delimiter = stripped[:3]
+            elif stripped.startswith("Rule:") or _LANGUAGE_HEADER.match(stripped):
+                raise UnsupportedLayout(f"line {i + 1}: Rules and language headers are not supported")
+            elif stripped.startswith(CHILD_KEYWORDS):
+                carried = current[len(current) - trailing :]
+                del current[len(current) - trailing :]
+                yield start, "".join(current)
+                start, current, trailing = i - trailing, carried, 0
+                current.append(line)
+                continue
+        if current and not delimiter and stripped.startswith(("@", "#")):
+            trailing += 1
+        else:
+            trailing = 0
+        current.append(line)
+    yield start, "".join(current)
+
+
+def convert_block(
+    text: str, is_header: bool, keyword_index: "KeywordIndex | None" = None, output_file: Path | None = None
+) -> tuple[RobotSuiteModel | None, list[FeatureParseError]]:
+    """Converts one block; error lines are relative to the start of the block."""
+    content = text if is_header else _BLOCK_FEATURE_LINE + text
+    ast, errors = parse_feature_with_errors(content)
+    if not is_header:
+        errors = [e._replace(line=e.line - 1) for e in errors]
+    return (build_robot_model(ast, keyword_index, output_file) if ast else None), errors
+
+
+def _read_lines(source: Path) -> Iterator[str]:
+    with source.open("rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty files cannot be mapped
+        with mapped:
+            for raw in iter(mapped.readline, b""):
+                yield raw.decode("utf-8")
+
+
+class _LineWriter:
+    """Writes lines, holding back blank lines so the output never ends with one."""
+
+    def __init__(self, output: IO[str]) -> None:
+        self._output = output
+        self._blank_lines = 0
+
+    def write(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            if not line:
+                self._blank_lines += 1
+                continue
+            self._output.write("\n" * self._blank_lines + line + "\n")
+            self._blank_lines = 0
+
+
+def convert_incremental(
+    source: Path,
+    output: IO[str],
+    keyword_index: "KeywordIndex | None" = None,
+    output_file: Path | None = None,
+) -> None:
+    """Converts a feature file to Robot Framework text, one block at a time.
+
+    output_file is where the text will end up; resource imports are made
+    relative to it (see build_robot_model).
+
+    Raises ValueError with the file line of the first Gherkin error, and
+    UnsupportedLayout for features that must be converted as a whole.
+    """
+    writer = _LineWriter(output)
+    blocks = iter_blocks(_read_lines(source))
+    header_start, header_text = next(blocks)
+    header, errors = convert_block(header_text, True, keyword_index, output_file)
+    if errors:
+        raise ValueError(f"line {header_start + errors[0].line}: {errors[0].message}")
+    if header is None:
+        raise ValueError("The file contains no feature.")
+
+    documentation = header.documentation
+    settings = ["*** Settings ***", f"Documentation    {documentation[0]}"]
+    settings.extend(f"...    {part}" for part in documentation[1:])
+    settings_written = False
+    defined: set[str] = set()
+    stubs: set[str] = set()
+    libraries: dict[str, None] = {}
+    resources: dict[str, None] = {}
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as keywords:
+        for start, text in blocks:
+            model, errors = convert_block(text, False, keyword_index, output_file)
+            if errors:
+                raise ValueError(f"line {start + errors[0].line}: {errors[0].message}")
+            if model is None:
+                raise ValueError(f"line {start + 1}: the block could not be converted.")
+            if model.test_setup:
+                if settings_written:
+                    raise ValueError(f"line {start + 1}: a Background must come before the scenarios.")
+                settings.append(f"Test Setup       {model.test_setup}")
+            if model.tests and not settings_written:
+                writer.write([*settings, "", "*** Test Cases ***"])
+                settings_written = True
+            for test in model.tests:
+                writer.write(render_test(test, []))
+
+            libraries.update(dict.fromkeys(model.libraries))
+            resources.update(dict.fromkeys(model.resources))
+            for kw in model.keywords:
+                if kw.implemented:
+                    defined.add(kw.name)
+                    keywords.write("\n".join(render_keyword(kw)) + "\n")
+                else:
+                    stubs.add(kw.name)
+
+        if not settings_written:
+            writer.write([*settings, ""])
+        if libraries or resources:
+            writer.write(["*** Settings ***"])
+            writer.write(f"Library          {library}" for library in libraries)
+            writer.write(f"Resource         {resource}" for resource in resources)
+            writer.write([""])
+        stub_names = sorted(stubs - defined)
+        if defined or stub_names:
+            writer.write(["*** Keywords ***"])
+        keywords.seek(0)
+        writer.write(line.rstrip("\n") for line in keywords)
+        for name in stub_names:
+            writer.write(render_keyword(RobotKeywordModel(name=name, implemented=False)))
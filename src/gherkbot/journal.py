@@ -0,0 +1,103 @@
+"""Append-only journal that makes directory syncs resumable after a crash.
+
+Before touching any output, a sync writes every planned operation to the
+journal in the output directory. Each finished operation appends a ``done``
+record, and the journal is removed once the whole sync has completed. If the
+process is killed in between, the journal lists exactly which operations
+still have to be redone.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+from typing import IO, NamedTuple
+
+from gherkbot.fs import LOCAL, FileSystem
+
+JOURNAL_NAME = ".gherkbot-journal"
+
+
+class SyncOperation(NamedTuple):
+    """One planned change to the output directory.
+
+    ``action`` is "create", "update", "delete" or "move". Paths are POSIX
+    strings relative to the output directory (``dest``, ``moved_from``) or
+    the input directory (``sources``).
+    """
+
+    action: str
+    dest: str
+    sources: tuple[str, ...] = ()
+    bundle: bool = False
+    moved_from: str | None = None
+
+
+class SyncJournal:
+    """Records planned and completed operations of one sync run."""
+
+    def __init__(self, path: Path, stream: IO[str], fs: FileSystem = LOCAL) -> None:
+        self.path = path
+        self._stream = stream
+        self._fs = fs
+
+    @classmethod
+    def start(cls, output_dir: Path, operations: list[SyncOperation], fs: FileSystem = LOCAL) -> "SyncJournal":
+        """Creates a new journal holding the plan, replacing any previous one."""
+        path = output_dir / JOURNAL_NAME
+        stream = fs.open_log(path)
+        for operation in operations:
+            stream.write(json.dumps({"op": "plan", **operation._asdict()}) + "\n")
+        stream.write(json.dumps({"op": "planned"}) + "\n")
+        stream.flush()
+        try:
+            os.fsync(stream.fileno())
+        except (OSError, io.UnsupportedOperation):
+            pass  # Not backed by a local file
+        return cls(path, stream, fs)
+
+    def complete(self, operation: SyncOperation) -> None:
+        # Flushing is enough to survive the process being killed; the plan
+        # itself was fsynced when the journal was started.
+        self._stream.write(json.dumps({"op": "done", "dest": operation.dest, "action": operation.action}) + "\n")
+        self._stream.flush()
+
+    def finish(self) -> None:
+        """Closes and removes the journal after all operations completed."""
+        self._stream.close()
+        self._fs.unlink(self.path, missing_ok=True)
+
+    def close(self) -> None:
+        """Closes the journal but keeps it, so an interrupted run can be resumed."""
+        self._stream.close()
+
+
+def pending_operations(output_dir: Path, fs: FileSystem = LOCAL) -> list[SyncOperation] | None:
+    """Returns the unfinished operations of an interrupted sync, or None if there is none.
+
+    A journal whose plan was not completely written also returns None: no
+    output was touched before the plan was, so a normal sync is correct.
+    """
+    path = output_dir / JOURNAL_NAME
+    if not fs.exists(path):
+        return None
+
+    planned: list[SyncOperation] = []
+    plan_complete = False
+    done: set[tuple[str, str]] = set()
+    for line in fs.read_text(path).splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break  # A torn last line from the interrupted run
+        if record.get("op") == "plan":
+            record.pop("op")
+            record["sources"] = tuple(record.get("sources", ()))
+            planned.append(SyncOperation(**record))
+        elif record.get("op") == "planned":
+            plan_complete = True
+        elif record.get("op") == "done":
+            done.add((record["action"], record["dest"]))
+    if not plan_complete:
+        return None
+    return [op for op in planned if (op.action, op.dest) not in done]
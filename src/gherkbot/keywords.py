@@ -0,0 +1,165 @@
+"""Index of existing Robot Framework keywords that generated steps can call.
+
+Keywords are read from resource files and libraries with Robot's libdoc API.
+Steps are matched with a dictionary of normalized literal names first. For
+embedded-argument keywords, a trie of their literal prefixes (the text before
+the first ``${``) narrows the candidates down before their precompiled
+regular expressions are tried, so matching stays cheap for thousands of
+keywords. The index is cached on disk and only sources whose file changed are
+read again.
+"""
+
+import importlib.util
+import os
+import re
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from gherkbot import __version__
+
+RESOURCE_SUFFIXES = (".resource", ".robot")
+_TRIE_IDS = ""  # Trie node key holding the ids of keywords whose prefix ends there
+_NORMALIZE = re.compile(r"[\s_]+")
+
+
+class KeywordSource(BaseModel):
+    name: str  # Resource file path or library name, as configured
+    kind: str  # "resource" or "library"
+    mtime: float | None = None  # Modification time of the file the keywords came from
+    keywords: list[str] = Field(default_factory=list)
+
+
+class KeywordIndexCache(BaseModel):
+    version: str
+    sources: list[KeywordSource] = Field(default_factory=list)
+
+
+def _normalize(name: str) -> str:
+    """Normalizes a keyword name the way Robot does (case, spaces and underscores)."""
+    return _NORMALIZE.sub("", name).lower()
+
+
+def _locate(name: str) -> tuple[str, Path | None]:
+    """Returns the kind of a keyword source and the file its keywords come from."""
+    path = Path(name)
+    if path.suffix in RESOURCE_SUFFIXES:
+        return "resource", path
+    if path.suffix == ".py" or path.exists():
+        return "library", path
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    origin = spec.origin if spec and spec.origin else None
+    if origin is None:
+        # Robot's standard libraries live in robot.libraries
+        try:
+            spec = importlib.util.find_spec(f"robot.libraries.{name}")
+        except ImportError:
+            spec = None
+        origin = spec.origin if spec and spec.origin else None
+    return "library", Path(origin) if origin else None
+
+
+def _mtime(path: Path | None) -> float | None:
+    try:
+        return os.stat(path).st_mtime if path else None
+    except OSError:
+        return None
+
+
+def _read_source(name: str) -> KeywordSource:
+    from robot.libdocpkg import LibraryDocumentation
+
+    kind, path = _locate(name)
+    doc = LibraryDocumentation(name)
+    return KeywordSource(name=name, kind=kind, mtime=_mtime(path), keywords=[kw.name for kw in doc.keywords])
+
+
+class KeywordIndex:
+    """Matches step texts against the keywords of the indexed sources."""
+
+    def __init__(self, sources: list[KeywordSource]) -> None:
+        from robot.running.arguments.embedded import EmbeddedArguments
+
+        self.sources = sources
+        self._literals: dict[str, KeywordSource] = {}
+        self._embedded: list[tuple[re.Pattern[str], KeywordSource]] = []
+        self._trie: dict = {}
+        for source in sources:
+            for keyword in source.keywords:
+                args = EmbeddedArguments.from_name(keyword) if "${" in keyword else None
+                if args is None:
+                    self._literals.setdefault(_normalize(keyword), source)
+                    continue
+                node = self._trie
+                for char in keyword.split("${", 1)[0].lower():
+                    node = node.setdefault(" " if char.isspace() else char, {})
+                node.setdefault(_TRIE_IDS, []).append(len(self._embedded))
+                self._embedded.append((args.name, source))
+        self._matches: dict[str, KeywordSource | None] = {}
+
+    def __len__(self) -> int:
+        return sum(len(source.keywords) for source in self.sources)
+
+    def match(self, step_text: str) -> KeywordSource | None:
+        """Returns the source defining a keyword that step_text calls, or None."""
+        try:
+            return self._matches[step_text]
+        except KeyError:
+            pass
+        source = self._literals.get(_normalize(step_text))
+        if source is None:
+            source = self._match_embedded(step_text)
+        self._matches[step_text] = source
+        return source
+
+    def _match_embedded(self, step_text: str) -> KeywordSource | None:
+        candidates: list[int] = []
+        node = self._trie
+        for char in step_text.lower():
+            candidates.extend(node.get(_TRIE_IDS, ()))
+            node = node.get(" " if char.isspace() else char)
+            if node is None:
+                break
+        else:
+            candidates.extend(node.get(_TRIE_IDS, ()))
+
+        for keyword_id in sorted(candidates):
+            pattern, source = self._embedded[keyword_id]
+            if pattern.fullmatch(step_text):
+                return source
+        return None
+
+
+def load_keyword_index(names: list[str], cache_file: Path | None = None) -> KeywordIndex:
+    """Builds a KeywordIndex for resource files and libraries, reusing the disk cache.
+
+    Sources whose file has not changed since they were cached are not read
+    again; the cache is rewritten only when something changed.
+    """
+    cached: dict[str, KeywordSource] = {}
+    if cache_file is not None and cache_file.exists():
+        try:
+            cache = KeywordIndexCache.model_validate_json(cache_file.read_text())
+        except ValueError:
+            cache = None
+        if cache is not None and cache.version == __version__:
+            cached = {source.name: source for source in cache.sources}
+
+    sources: list[KeywordSource] = []
+    changed = set(cached) != set(names)
+    for name in names:
+        source = cached.get(name)
+        if source is None or source.mtime is None or source.mtime != _mtime(_locate(name)[1]):
+            source = _read_source(name)
+            changed = True
+        sources.append(source)
+
+    if cache_file is not None and changed:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(KeywordIndexCache(version=__version__, sources=sources).model_dump_json())
+        tmp.replace(cache_file)
+    return KeywordIndex(sources)
@@ -0,0 +1,304 @@
+"""Language server with a live Robot Framework preview of .feature files.
+
+Run with ``gherkbot lsp``; it speaks JSON-RPC (LSP framing) over stdio.
+Open documents are kept in memory and split into blocks: the feature header
+and one block per Background or Scenario. Each block is parsed and converted
+on its own and cached by its text, so an edit only re-parses and re-renders
+the block it touched; unchanged blocks are reused from the cache.
+
+Besides publishing diagnostics for Gherkin parse errors, the server answers
+the custom ``gherkbot/preview`` request with the generated Robot code. A
+message that fails is answered with a JSON-RPC error (or logged, for
+notifications) and the server keeps running.
+"""
+
+import json
+from typing import BinaryIO, Callable, NamedTuple
+
+from gherkbot import __version__
+from gherkbot.converter import (
+    RobotKeywordModel,
+    RobotSuiteModel,
+    build_robot_model,
+    render_robot,
+)
+from gherkbot.incremental import UnsupportedLayout, convert_block, iter_blocks
+from gherkbot.parser import FeatureParseError, parse_feature_with_errors
+
+# LSP constants
+_SYNC_INCREMENTAL = 2
+_SEVERITY_ERROR = 1
+_MESSAGE_ERROR = 1
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INVALID_PARAMS = -32602
+_INTERNAL_ERROR = -32603
+
+
+class _Block(NamedTuple):
+    model: RobotSuiteModel | None
+    errors: list[FeatureParseError]  # Lines are relative to the block start
+
+
+def _split_blocks(text: str) -> list[tuple[int, str]] | None:
+    """Splits a feature into (first line, text) blocks, or None if it must be converted whole."""
+    try:
+        return list(iter_blocks(text.splitlines(keepends=True)))
+    except UnsupportedLayout:
+        return None
+
+
+def _convert_block(text: str, is_header: bool) -> _Block:
+    return _Block(*convert_block(text, is_header))
+
+
+def _assemble(header: RobotSuiteModel, children: list[RobotSuiteModel]) -> RobotSuiteModel:
+    """Combines per-block models into the model a full conversion would build."""
+    suite = RobotSuiteModel.model_construct(
+        name=header.name,
+        documentation=header.documentation,
+        test_setup=None,
+        test_templates=[],
+        tests=[],
+        keywords=[],
+    )
+    stubs: dict[str, RobotKeywordModel] = {}
+    for child in children:
+        suite.test_setup = child.test_setup or suite.test_setup
+        suite.test_templates.extend(child.test_templates)
+        suite.tests.extend(child.tests)
+        for kw in child.keywords:
+            if kw.implemented:
+                suite.keywords.append(kw)
+            else:
+                stubs.setdefault(kw.name, kw)
+
+    defined_keywords = {kw.name for kw in suite.keywords}
+    for name in sorted(stubs.keys() - defined_keywords):
+        suite.keywords.append(stubs[name])
+    return suite
+
+
+def _offset(text: str, position: dict) -> int:
+    """Converts an LSP position (line, UTF-16 character) into an index into text."""
+    line_start = 0
+    for _ in range(position["line"]):
+        newline = text.find("\n", line_start)
+        if newline == -1:
+            return len(text)
+        line_start = newline + 1
+    line_end = text.find("\n", line_start)
+    line = text[line_start : line_end if line_end != -1 else len(text)]
+
+    index = units = 0
+    while index < len(line) and units < position["character"]:
+        units += 2 if ord(line[index]) > 0xFFFF else 1
+        index += 1
+    return line_start + index
+
+
+class Document:
+    """An open .feature document with its per-block conversion cache."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._blocks: dict[tuple[str, bool], _Block] = {}
+        self._result: tuple[str, list[FeatureParseError]] | None = None
+
+    def apply_change(self, change: dict) -> None:
+        """Applies a TextDocumentContentChangeEvent (ranged or full)."""
+        if "range" in change:
+            start = _offset(self.text, change["range"]["start"])
+            end = _offset(self.text, change["range"]["end"])
+            self.text = self.text[:start] + change["text"] + self.text[end:]
+        else:
+            self.text = change["text"]
+        self._result = None
+
+    def convert(self) -> tuple[str, list[FeatureParseError]]:
+        """Returns the generated Robot code and the parse errors of the document."""
+        if self._result is None:
+            self._result = self._convert()
+        return self._result
+
+    def _convert(self) -> tuple[str, list[FeatureParseError]]:
+        blocks = _split_blocks(self.text)
+        if blocks is None:
+            ast, errors = parse_feature_with_errors(self.text)
+            model = build_robot_model(ast) if ast else None
+            return (render_robot(model) if model else ""), errors
+
+        cache: dict[tuple[str, bool], _Block] = {}
+        converted: list[_Block] = []
+        errors: list[FeatureParseError] = []
+        for index, (first_line, text) in enumerate(blocks):
+            key = (text, index == 0)
+            block = self._blocks.get(key) or _convert_block(text, index == 0)
+            cache[key] = block
+            converted.append(block)
+            errors.extend(e._replace(line=e.line + first_line) for e in block.errors)
+        self._blocks = cache  # Drop blocks that are no longer in the document
+
+        # Blocks with errors are left out, so the preview stays useful while typing.
+        header, children = converted[0].model, [b.model for b in converted[1:]]
+        if header is None:
+            return "", errors
+        return render_robot(_assemble(header, [c for c in children if c])), errors
+
+
+class RequestError(Exception):
+    """A failed request, answered with a JSON-RPC error of the given code."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class LanguageServer:
+    """Handles LSP messages; responses and notifications are passed to send."""
+
+    def __init__(self, send: Callable[[dict], None]) -> None:
+        self.send = send
+        self.documents: dict[str, Document] = {}
+        self.running = True
+
+    def handle(self, message: dict) -> None:
+        """Handles one message; a failing message is answered or logged, never raised."""
+        if not isinstance(message, dict):
+            self._error(None, RequestError(_INVALID_REQUEST, "Message must be a JSON object"))
+            return
+        try:
+            result = self._dispatch(message.get("method"), message.get("params") or {})
+        except RequestError as exc:
+            if "id" in message:
+                self._error(message["id"], exc)
+            elif exc.code != _METHOD_NOT_FOUND:  # Unknown notifications are ignored
+                self._notify("window/logMessage", {"type": _MESSAGE_ERROR, "message": str(exc)})
+            return
+        if "id" in message:
+            self.send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    def _dispatch(self, method: object, params: object) -> object:
+        handler = getattr(self, _HANDLERS.get(method, ""), None) if isinstance(method, str) else None
+        if handler is None:
+            raise RequestError(_METHOD_NOT_FOUND, f"Unknown method: {method}")
+        if not isinstance(params, dict):
+            raise RequestError(_INVALID_PARAMS, f"{method}: params must be a JSON object")
+        try:
+            return handler(params)
+        except RequestError:
+            raise
+        except (KeyError, TypeError, ValueError) as exc:
+            raise RequestError(_INVALID_PARAMS, f"{method}: invalid params: {type(exc).__name__}: {exc}") from exc
+        except Exception as exc:
+            raise RequestError(_INTERNAL_ERROR, f"{method}: {type(exc).__name__}: {exc}") from exc
+
+    def initialize(self, params: dict) -> dict:
+        return {
+            "capabilities": {"textDocumentSync": {"openClose": True, "change": _SYNC_INCREMENTAL}},
+            "serverInfo": {"name": "gherkbot", "version": __version__},
+        }
+
+    def shutdown(self, params: dict) -> None:
+        return None
+
+    def exit(self, params: dict) -> None:
+        self.running = False
+
+    def did_open(self, params: dict) -> None:
+        document = params["textDocument"]
+        self.documents[document["uri"]] = Document(document["text"])
+        self._publish_diagnostics(document["uri"])
+
+    def did_change(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        document = self._document(uri)
+        for change in params["contentChanges"]:
+            document.apply_change(change)
+        self._publish_diagnostics(uri)
+
+    def did_close(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def preview(self, params: dict) -> dict:
+        uri = params["textDocument"]["uri"]
+        robot_code, _ = self._document(uri).convert()
+        return {"uri": uri, "robot": robot_code}
+
+    def _document(self, uri: str) -> Document:
+        try:
+            return self.documents[uri]
+        except KeyError:
+            raise RequestError(_INVALID_PARAMS, f"Document is not open: {uri}") from None
+
+    def _publish_diagnostics(self, uri: str) -> None:
+        _, errors = self._document(uri).convert()
+        diagnostics = [
+            {
+                "range": {
+                    "start": {"line": e.line - 1, "character": e.column - 1},
+                    "end": {"line": e.line - 1, "character": e.column - 1},
+                },
+                "severity": _SEVERITY_ERROR,
+                "source": "gherkbot",
+                "message": e.message,
+            }
+            for e in errors
+        ]
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+
+    def _error(self, request_id: int | str | None, error: RequestError) -> None:
+        self.send({"jsonrpc": "2.0", "id": request_id, "error": {"code": error.code, "message": str(error)}})
+
+    def _notify(self, method: str, params: dict) -> None:
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+
+_HANDLERS = {
+    "initialize": "initialize",
+    "initialized": "",
+    "shutdown": "shutdown",
+    "exit": "exit",
+    "textDocument/didOpen": "did_open",
+    "textDocument/didChange": "did_change",
+    "textDocument/didClose": "did_close",
+    "gherkbot/preview": "preview",
+}
+
+
+def read_message(stream: BinaryIO) -> dict | None:
+    """Reads one Content-Length framed JSON-RPC message, or None at end of input."""
+    headers: dict[str, str] = {}
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return json.loads(stream.read(int(headers["content-length"])))
+
+
+def write_message(stream: BinaryIO, message: dict) -> None:
+    body = json.dumps(message).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+def serve(stdin: BinaryIO, stdout: BinaryIO) -> None:
+    """Runs the language server until the client sends exit or closes stdin."""
+    server = LanguageServer(lambda message: write_message(stdout, message))
+    while server.running:
+        try:
+            message = read_message(stdin)
+        except (KeyError, ValueError) as exc:  # Bad framing or invalid JSON
+            server._error(None, RequestError(_PARSE_ERROR, f"Parse error: {exc}"))
+            continue
+        if message is None:
+            break
+        server.handle(message)
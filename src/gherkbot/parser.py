@@ -1,5 +1,15 @@
+import re
+from typing import NamedTuple
+
 from gherkin import Parser
-from gherkin.errors import CompositeParserException
+from gherkin.errors import CompositeParserException, ParserError, ParserException
+from gherkin.token_matcher import TokenMatcher
+
+
+class FeatureParseError(NamedTuple):
+    line: int
+    column: int
+    message: str
 
 
 def parse_feature(content: str):
@@ -8,3 +18,27 @@ def parse_feature(content: str):
         return Parser().parse(content)
     except CompositeParserException:
         return None
+
+
+def _to_parse_error(error: ParserException) -> FeatureParseError:
+    location = error.location
+    message = re.sub(r"^\(\d+:\d+\): ", "", str(error))
+    return FeatureParseError(location["line"], location.get("column") or 1, message)
+
+
+def parse_feature_with_errors(
+    content: str, parser: Parser | None = None, token_matcher: TokenMatcher | None = None
+) -> tuple[object | None, list[FeatureParseError]]:
+    """Parses content like parse_feature, but also returns the Gherkin errors with locations.
+
+    A parser and token matcher may be passed in to be reused; they are reset
+    before parsing, but must not be used by two threads at once.
+    """
+    try:
+        return (parser or Parser()).parse(content, token_matcher), []
+    except CompositeParserException as e:
+        return None, [_to_parse_error(err) for err in e.errors]
+    except ParserException as e:
+        return None, [_to_parse_error(e)]
+    except ParserError as e:
+        return None, [FeatureParseError(1, 1, str(e))]
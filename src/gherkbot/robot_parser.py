@@ -0,0 +1,83 @@
+"""Robot Framework parser plugin that runs .feature files directly.
+
+Usage::
+
+    robot --parser gherkbot.RobotParser tests/
+    robot --parser gherkbot.RobotParser:.gherkbot_cache tests/
+
+Feature files are converted in memory while Robot builds the suite, so no
+generated .robot files are written next to the sources. The optional argument
+is a cache directory where converted suites are stored as Robot JSON by
+content hash, which lets repeated runs over large, mostly unchanged suites
+skip conversion. Suites are built directly as model objects, so Robot never
+has to tokenise generated text.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from robot.api import TestSuite
+from robot.api.interfaces import Parser, TestDefaults
+from robot.errors import DataError
+
+from gherkbot import __version__
+from gherkbot.converter import convert_ast_to_suite
+from gherkbot.parser import parse_feature
+
+
+class RobotParser(Parser):
+    """Converts .feature files to Robot Framework suites at suite-build time."""
+
+    extension = ".feature"
+
+    def __init__(self, cache: str | None = None) -> None:
+        self.cache_dir = Path(cache) if cache else None
+
+    def parse(self, source: Path, defaults: TestDefaults | None) -> TestSuite:
+        suite = self.convert(source.read_text(encoding="utf-8"), source)
+        suite.name = TestSuite.name_from_source(source)
+        suite.source = source
+        if defaults is not None:
+            for test in suite.tests:
+                defaults.set_to(test)
+        return suite
+
+    def convert(self, content: str, source: Path | None = None) -> TestSuite:
+        """Returns a new suite for content, using the cache when possible."""
+        key = self._cache_key(content)
+        data = self._read_cache(key)
+        if data is not None:
+            return TestSuite.from_json(data)
+        ast = parse_feature(content)
+        if ast is None:
+            raise DataError(f"Failed to parse Gherkin feature file '{source}'.")
+        suite = convert_ast_to_suite(ast)
+        if suite is None:
+            raise DataError(f"Failed to convert Gherkin feature file '{source}'.")
+        if self.cache_dir is not None:
+            self._write_cache(key, suite.to_json())
+        return suite
+
+    @staticmethod
+    def _cache_key(content: str) -> str:
+        digest = hashlib.sha256(__version__.encode())
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _read_cache(self, key: str) -> str | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            return (self.cache_dir / f"{key}.json").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write_cache(self, key: str, data: str) -> None:
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self.cache_dir / f"{key}.json"
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(data, encoding="utf-8")
+        tmp.replace(target)
@@ -0,0 +1,91 @@
+"""Thread-safe conversion sessions.
+
+A Converter holds what repeated conversions share: the output format, the
+keyword index and one Gherkin parser per thread. Building a parser loads
+its dialect tables, so reusing one saves work on every file, but a parser
+keeps state while it parses, so threads cannot share one; each thread gets
+its own on first use.
+
+Everything else a conversion touches is safe to share: the converter
+functions build new models and write no module-level state, and the only
+mutable shared state, the match cache of a KeywordIndex, is a dict whose
+entries are computed the same way by whichever thread gets there first.
+Nothing here prints; the CLI's console is only used by the main thread.
+This makes one Converter usable from a thread pool, including on
+free-threaded CPython builds where the threads run in parallel.
+"""
+
+import threading
+from pathlib import PurePath
+from typing import TYPE_CHECKING
+
+from gherkin import Parser
+from gherkin.stream.id_generator import IdGenerator
+from gherkin.token_matcher import TokenMatcher
+
+from gherkbot.converter import (
+    OutputFormat,
+    build_robot_model,
+    build_test_suite,
+    render_robot,
+)
+from gherkbot.parser import FeatureParseError, parse_feature_with_errors
+
+if TYPE_CHECKING:
+    from gherkbot.keywords import KeywordIndex
+
+
+class Converter:
+    """Parses and converts feature texts; one instance can be shared by many threads."""
+
+    def __init__(
+        self, output_format: OutputFormat = OutputFormat.ROBOT, keyword_index: "KeywordIndex | None" = None
+    ) -> None:
+        self.output_format = output_format
+        self.keyword_index = keyword_index
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict:
+        # Parsers are per thread and rebuilt on demand, so they are not pickled for worker processes.
+        return {"output_format": self.output_format, "keyword_index": self.keyword_index}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["output_format"], state["keyword_index"])  # type: ignore[misc]
+
+    def _parser(self) -> tuple[Parser, TokenMatcher]:
+        try:
+            return self._local.parser
+        except AttributeError:
+            parser = self._local.parser = (Parser(), TokenMatcher())
+            return parser
+
+    def parse(self, content: str) -> tuple[object | None, list[FeatureParseError]]:
+        """Parses content like parse_feature_with_errors, with this thread's parser."""
+        parser, token_matcher = self._parser()
+        parser.ast_builder.id_generator = IdGenerator()  # Number AST nodes as a fresh parser would
+        return parse_feature_with_errors(content, parser, token_matcher)
+
+    def parse_feature(self, content: str) -> object | None:
+        """Parses content like parse_feature: returns the AST, or None on errors."""
+        return self.parse(content)[0]
+
+    def convert(self, content: str, path: str | None = None) -> str:
+        """Returns the generated suite, or raises ValueError with the reason.
+
+        path names the feature; for the JSON format the suite is named after it.
+        """
+        ast, errors = self.parse(content)
+        if errors:
+            error = errors[0]
+            raise ValueError(f"({error.line}:{error.column}): {error.message}")
+        model = build_robot_model(ast, self.keyword_index)
+        if model is None:
+            raise ValueError("The feature could not be converted.")
+        if self.output_format is OutputFormat.JSON:
+            from robot.running import TestSuite
+
+            suite = build_test_suite(model)
+            if path:
+                suite.name = TestSuite.name_from_source(PurePath(path).with_suffix(self.output_format.extension))
+            return suite.to_json()
+        return render_robot(model)
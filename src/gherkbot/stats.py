@@ -0,0 +1,204 @@
+"""Corpus statistics for finding conversion and execution hot spots.
+
+The default scan is a single pass over the lines of each feature that only
+recognises Gherkin keywords (in the feature's own language), table rows and
+doc strings. It does not build an AST, so it is cheap enough to run on every
+CI build. Output size and conversion cost are estimated from that pass; with
+``exact`` each file is also parsed and converted to measure the real output.
+"""
+
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from gherkin.dialect import Dialect
+from pydantic import BaseModel, Field
+
+from gherkbot.converter import convert_ast_to_robot
+from gherkbot.parser import parse_feature
+
+_LANGUAGE_RE = re.compile(r"^\s*#\s*language\s*:\s*([a-zA-Z\-_]+)\s*$")
+_STUB_OVERHEAD = 60  # "# TODO: implement keyword ..." and "Fail    Not Implemented" lines
+
+
+class FeatureStats(BaseModel):
+    path: str
+    scenarios: int = 0
+    outlines: int = 0
+    backgrounds: int = 0
+    steps: int = 0
+    example_rows: int = 0
+    table_rows: int = 0
+    doc_string_lines: int = 0
+    unique_steps: int = 0
+    tests: int = 0  # Generated test cases: scenarios plus outline example rows
+    estimated_output_bytes: int = 0
+    estimated_cost: int = 0  # Relative conversion cost, in AST nodes
+    output_bytes: int | None = None  # Only measured in exact mode
+    error: str | None = None
+
+
+class StepUsage(BaseModel):
+    text: str
+    count: int
+
+
+class CorpusStats(BaseModel):
+    files: list[FeatureStats] = Field(default_factory=list)
+    total_files: int = 0
+    total_tests: int = 0
+    total_steps: int = 0
+    total_example_rows: int = 0
+    total_estimated_output_bytes: int = 0
+    total_estimated_cost: int = 0
+    top_steps: list[StepUsage] = Field(default_factory=list)
+
+
+class _DialectKeywords:
+    def __init__(self, language: str) -> None:
+        dialect = Dialect.for_name(language) or Dialect.for_name("en")
+        self.scenario = tuple(f"{k}:" for k in dialect.scenario_keywords)
+        self.outline = tuple(f"{k}:" for k in dialect.scenario_outline_keywords)
+        self.examples = tuple(f"{k}:" for k in dialect.examples_keywords)
+        self.background = tuple(f"{k}:" for k in dialect.background_keywords)
+        steps = {
+            *dialect.given_keywords,
+            *dialect.when_keywords,
+            *dialect.then_keywords,
+            *dialect.and_keywords,
+            *dialect.but_keywords,
+        }
+        self.steps = tuple(sorted(steps, key=len, reverse=True))
+
+
+def scan_feature(content: str, path: str = "") -> tuple[FeatureStats, Counter[str]]:
+    """Collects statistics for one feature with a single line-based pass.
+
+    Returns the statistics and a counter of the step texts it uses.
+    """
+    stats = FeatureStats(path=path)
+    step_texts: Counter[str] = Counter()
+    keywords: _DialectKeywords | None = None
+    delimiter = None
+    in_examples = examples_header_seen = False
+    outline_name = ""
+    output_bytes = cells = 0
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if delimiter:
+            if stripped.startswith(delimiter):
+                delimiter = None
+            else:
+                stats.doc_string_lines += 1
+                output_bytes += 11 + len(stripped)
+            continue
+        first = stripped[0]
+        if first == "#":
+            match = _LANGUAGE_RE.match(stripped)
+            if match and keywords is None:
+                keywords = _DialectKeywords(match.group(1))
+            continue
+        if first == "@":
+            continue
+        if keywords is None:
+            keywords = _DialectKeywords("en")
+        if stripped.startswith(('"""', "```")):
+            delimiter = stripped[:3]
+            continue
+        if first == "|":
+            cells += stripped.count("|") - 1
+            if not in_examples:
+                stats.table_rows += 1
+                output_bytes += 11 + len(stripped)
+            elif examples_header_seen:
+                stats.example_rows += 1
+                output_bytes += len(outline_name) + 4 + 2 * len(stripped)
+            else:
+                examples_header_seen = True
+            continue
+
+        if stripped.startswith(keywords.outline):
+            stats.outlines += 1
+            in_examples = False
+            outline_name = stripped.split(":", 1)[1].strip()
+            output_bytes += 2 * len(outline_name) + 12
+        elif stripped.startswith(keywords.scenario):
+            stats.scenarios += 1
+            in_examples = False
+            output_bytes += len(stripped)
+        elif stripped.startswith(keywords.examples):
+            in_examples = True
+            examples_header_seen = False
+        elif stripped.startswith(keywords.background):
+            stats.backgrounds += 1
+            in_examples = False
+        else:
+            for step_keyword in keywords.steps:
+                if stripped.startswith(step_keyword):
+                    stats.steps += 1
+                    step_texts[stripped[len(step_keyword) :].strip()] += 1
+                    output_bytes += 5 + len(stripped)
+                    break
+
+    stats.unique_steps = len(step_texts)
+    stats.tests = stats.scenarios + stats.example_rows
+    output_bytes += sum(2 * len(text) + _STUB_OVERHEAD for text in step_texts)
+    stats.estimated_output_bytes = output_bytes
+    stats.estimated_cost = (
+        stats.scenarios + stats.outlines + stats.backgrounds + stats.steps
+        + stats.table_rows + stats.example_rows + cells + stats.doc_string_lines
+    )
+    return stats, step_texts
+
+
+def _stats_for_file(args: tuple[Path, str, bool]) -> tuple[FeatureStats, Counter[str]]:
+    source_file, rel_path, exact = args
+    try:
+        content = source_file.read_text()
+    except (OSError, UnicodeDecodeError) as e:
+        return FeatureStats(path=rel_path, error=str(e)), Counter()
+    stats, step_texts = scan_feature(content, rel_path)
+    if exact:
+        ast = parse_feature(content)
+        robot_code = convert_ast_to_robot(ast) if ast else ""
+        stats.output_bytes = len(robot_code.encode())
+        if ast is None:
+            stats.error = "Failed to parse the Gherkin feature file."
+        elif not robot_code:
+            stats.error = "Conversion produced no output."
+    return stats, step_texts
+
+
+def collect_stats(
+    input_dir: Path, jobs: int | None = None, exact: bool = False, top: int = 10
+) -> CorpusStats:
+    """Scans all .feature files under input_dir, in parallel when jobs allows it."""
+    source_files = sorted(input_dir.rglob("*.feature"))
+    work = [(p, str(p.relative_to(input_dir)), exact) for p in source_files]
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, len(work) // (jobs * 4))
+            results = list(executor.map(_stats_for_file, work, chunksize=chunksize))
+    else:
+        results = [_stats_for_file(item) for item in work]
+
+    corpus = CorpusStats()
+    step_texts: Counter[str] = Counter()
+    for stats, texts in results:
+        corpus.files.append(stats)
+        step_texts.update(texts)
+        corpus.total_tests += stats.tests
+        corpus.total_steps += stats.steps
+        corpus.total_example_rows += stats.example_rows
+        corpus.total_estimated_output_bytes += stats.estimated_output_bytes
+        corpus.total_estimated_cost += stats.estimated_cost
+    corpus.total_files = len(corpus.files)
+    corpus.top_steps = [StepUsage(text=text, count=count) for text, count in step_texts.most_common(top)]
+    return corpus
@@ -0,0 +1,68 @@
+"""NDJSON filter mode for converting features produced by other tools.
+
+Each input line is a JSON record ``{"path": ..., "content": ...}`` and each
+output line is ``{"path": ..., "robot": ..., "error": ...}``, where exactly
+one of ``robot`` and ``error`` is set. Records are converted one at a time
+and written as soon as they are done, so memory stays flat however long the
+stream is. The Gherkin parser and its dialect tables are built once and
+reused for every record (see gherkbot.session).
+"""
+
+import json
+import re
+from collections.abc import Iterable
+from typing import IO, TYPE_CHECKING
+
+from gherkbot.converter import OutputFormat
+from gherkbot.session import Converter
+
+if TYPE_CHECKING:
+    from gherkbot.keywords import KeywordIndex
+
+
+class StreamConverter(Converter):
+    """Converts NDJSON records, reusing one Gherkin parser across calls."""
+
+    def convert_record(self, line: str) -> dict:
+        """Converts one NDJSON input line into an output record."""
+        try:
+            record = json.loads(line)
+            path, content = record.get("path"), record["content"]
+            if not isinstance(content, str):
+                raise TypeError("content must be a string")
+            if path is not None and not isinstance(path, str):
+                raise TypeError("path must be a string")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return {"path": None, "robot": None, "error": f"Invalid record: {_reason(e)}"}
+        try:
+            return {"path": path, "robot": self.convert(content, path), "error": None}
+        except ValueError as e:
+            return {"path": path, "robot": None, "error": str(e)}
+
+
+def _reason(error: Exception) -> str:
+    if isinstance(error, KeyError):
+        return f"missing {error}"
+    return re.sub(r": line \d+ column \d+ \(char \d+\)$", "", str(error))
+
+
+def convert_stream(
+    lines: Iterable[str],
+    output: IO[str],
+    output_format: OutputFormat = OutputFormat.ROBOT,
+    keyword_index: "KeywordIndex | None" = None,
+) -> int:
+    """Converts NDJSON records from lines and writes the results to output.
+
+    Blank lines are skipped. Returns the number of records that failed.
+    """
+    converter = StreamConverter(output_format, keyword_index)
+    failed = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        result = converter.convert_record(line)
+        failed += result["error"] is not None
+        output.write(json.dumps(result) + "\n")
+        output.flush()  # Downstream stages see each record as soon as it is done
+    return failed
@@ -1,63 +1,580 @@
-from pathlib import Path
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, NamedTuple
 
-from gherkbot.converter import convert_ast_to_robot
-from gherkbot.parser import parse_feature
+from pydantic import ValidationError
 
+from gherkbot.archive import ArchiveWriter, archive_stem, is_archive, iter_members
+from gherkbot.converter import (
+    GherkinASTModel,
+    OutputFormat,
+    RobotSuiteModel,
+    build_robot_model,
+    build_test_suite,
+    merge_robot_models,
+    render_robot,
+)
+from gherkbot.fs import LOCAL, FileSystem
+from gherkbot.gitdiff import FeatureChange, changed_features
+from gherkbot.journal import (
+    JOURNAL_NAME,
+    SyncJournal,
+    SyncOperation,
+    pending_operations,
+)
+from gherkbot.session import Converter
+from gherkbot.workers import (
+    TaskError,
+    WorkerLimits,
+    run_inline,
+    run_supervised,
+    run_threaded,
+)
 
-def _get_relevant_files(base_dir: Path, extension: str) -> list[Path]:
+if TYPE_CHECKING:
+    from gherkbot.config import SyncTarget
+    from gherkbot.keywords import KeywordIndex
+
+
+class SyncFailure(NamedTuple):
+    dest: str
+    sources: tuple[str, ...]
+    reason: str
+
+
+def _get_relevant_files(base_dir: Path, extension: str, fs: FileSystem = LOCAL) -> list[Path]:
     """Recursively finds all files with a given extension in a directory."""
-    return list(base_dir.rglob(f"*{extension}"))
+    return list(fs.walk(base_dir, extension))
+
+
+def _bundle_path(rel_dir: Path, input_dir: Path, extension: str) -> Path:
+    """Returns where the bundle of a directory is written, relative to the output directory.
+
+    The bundle of ``a/b`` is ``a/b.robot`` so that Robot nests it like the
+    directory it came from; the bundle of the input root is named after it.
+    """
+    name = rel_dir.name or input_dir.resolve().name
+    return rel_dir.parent / f"{name}{extension}"
+
+
+def _output_format(dest_file: Path) -> OutputFormat:
+    return OutputFormat.JSON if dest_file.suffix == OutputFormat.JSON.extension else OutputFormat.ROBOT
+
+
+def _model_from_text(content: str, name: str, converter: Converter, dest_file: Path) -> RobotSuiteModel:
+    """Parses and converts one feature for dest_file, raising TaskError with the reason if that fails."""
+    ast, errors = converter.parse(content)
+    if errors:
+        error = errors[0]
+        raise TaskError(f"{name}:{error.line}:{error.column}: {error.message}")
+    model = build_robot_model(ast, converter.keyword_index, dest_file)
+    if model is None:
+        try:
+            GherkinASTModel.model_validate(ast)
+        except ValidationError as e:
+            detail = e.errors()[0]
+            location = ".".join(str(part) for part in detail["loc"])
+            raise TaskError(f"{name}: unsupported Gherkin at {location}: {detail['msg']}") from None
+        raise TaskError(f"{name}: the file contains no feature")
+    return model
+
+
+def _render_model(model: RobotSuiteModel, dest_file: Path) -> str:
+    """Renders a suite model in the format that dest_file's extension selects."""
+    if _output_format(dest_file) is OutputFormat.JSON:
+        from robot.running import TestSuite
+
+        suite = build_test_suite(model)
+        suite.name = TestSuite.name_from_source(dest_file)
+        return suite.to_json()
+    return render_robot(model)
+
+
+def _convert_task(
+    converters: list[Converter], task: tuple[list[tuple[str, str | TaskError]], Path, bool, int]
+) -> tuple[str | None, list[tuple[int, str]]]:
+    """Renders the output of one create/update operation.
+
+    The sources are sent as (name, content) pairs, so workers never access
+    the filesystem backend themselves; a source that could not be read is
+    sent as the TaskError describing why. Returns the output, or None if no
+    source could be converted, and the position and reason of each source
+    that failed. A bundle is rendered from the members that converted.
+    """
+    sources, dest_file, bundle, converter_id = task
+    converter = converters[converter_id]
+    models: list[RobotSuiteModel] = []
+    errors: list[tuple[int, str]] = []
+    for position, (name, content) in enumerate(sources):
+        try:
+            if isinstance(content, TaskError):
+                raise content
+            models.append(_model_from_text(content, name, converter, dest_file))
+        except TaskError as e:
+            errors.append((position, str(e)))
+    if not models:
+        return None, errors
+    return _render_model(merge_robot_models(dest_file.stem, models) if bundle else models[0], dest_file), errors
+
+
+def _remove_output(dest_file: Path, fs: FileSystem = LOCAL) -> None:
+    """Deletes a generated file and its parent directory if it became empty."""
+    fs.unlink(dest_file)
+    fs.rmdir_if_empty(dest_file.parent)
+
+
+def _apply_operation(output_dir: Path, operation: SyncOperation, fs: FileSystem = LOCAL) -> None:
+    """Performs a planned delete or move. Operations are idempotent, so resuming can redo them."""
+    dest_file = output_dir / operation.dest
+
+    if operation.action == "delete":
+        if fs.exists(dest_file):
+            _remove_output(dest_file, fs)
+        # console.log(f"Deleted: {dest_file}")
+    elif operation.action == "move":
+        old_dest = output_dir / operation.moved_from if operation.moved_from else None
+        if old_dest is not None and fs.exists(old_dest):
+            fs.rename(old_dest, dest_file)
+            fs.rmdir_if_empty(old_dest.parent)
+
+
+class SyncPlan(NamedTuple):
+    """The planned operations for one input/output directory pair."""
+
+    input_dir: Path
+    output_dir: Path
+    operations: list[SyncOperation]
+    keyword_index: "KeywordIndex | None" = None
+
+
+def _apply_plans(
+    plans: list[SyncPlan],
+    jobs: int | None = None,
+    limits: WorkerLimits | None = None,
+    fs: FileSystem = LOCAL,
+    threads: int | None = None,
+) -> list[list[SyncFailure]]:
+    """Journals the planned operations of every plan and then performs them.
+
+    Deletes and moves are done first. Every create and update then goes
+    through _convert_task: in the calling thread by default, in supervised
+    worker processes with limits (see gherkbot.workers), or in a pool of
+    threads sharing one Converter per keyword index (see gherkbot.session).
+    All plans share one pool. Either way, files that failed, timed out or
+    exceeded their memory allowance are returned instead of stopping the
+    sync, and their existing outputs are left alone. Files are read and
+    written by the calling thread only, and each source is read just before
+    its conversion starts; a source that cannot be read is reported like
+    one that cannot be converted. Returns the failures of each plan.
+
+    A plan without operations removes any journal left in its output
+    directory, since a stale journal would replay outdated operations.
+    """
+    failures: list[list[SyncFailure]] = [[] for _ in plans]
+    journals: dict[int, SyncJournal] = {}
+    # Each worker receives the converters once; tasks refer to them by position.
+    keyword_indexes = list({id(plan.keyword_index): plan.keyword_index for plan in plans}.values())
+    converters = [Converter(keyword_index=keyword_index) for keyword_index in keyword_indexes]
+    writes: list[tuple[int, SyncOperation]] = []
+
+    def read_source(input_dir: Path, name: str) -> tuple[str, str | TaskError]:
+        try:
+            return Path(name).name, fs.read_text(input_dir / name)
+        except (OSError, UnicodeDecodeError) as e:
+            return Path(name).name, TaskError(f"{Path(name).name}: cannot be read: {e}")
+
+    def tasks() -> Iterator[tuple[list[tuple[str, str | TaskError]], Path, bool, int]]:
+        # Sources are read only when a worker is ready for them, so memory does not grow with the tree.
+        for number, operation in writes:
+            plan = plans[number]
+            sources = [read_source(plan.input_dir, name) for name in operation.sources]
+            converter_id = keyword_indexes.index(plan.keyword_index)
+            yield sources, plan.output_dir / operation.dest, operation.bundle, converter_id
+
+    try:
+        for number, plan in enumerate(plans):
+            if not plan.operations:
+                # Nothing to do, so a journal left by an older run no longer matches the trees.
+                fs.unlink(plan.output_dir / JOURNAL_NAME, missing_ok=True)
+                continue
+            journal = journals[number] = SyncJournal.start(plan.output_dir, plan.operations, fs)
+            for operation in plan.operations:
+                if operation.action in ("create", "update"):
+                    writes.append((number, operation))
+                    continue
+                _apply_operation(plan.output_dir, operation, fs)
+                journal.complete(operation)
+
+        if threads:
+            results = run_threaded(_convert_task, tasks(), converters, threads)
+        elif limits is not None:
+            results = run_supervised(_convert_task, tasks(), converters, jobs, limits)
+        else:
+            results = run_inline(_convert_task, tasks(), converters)
+        for result in results:
+            number, operation = writes[result.index]
+            if result.error is not None:
+                failures[number].append(SyncFailure(operation.dest, operation.sources, result.error))
+            else:
+                output, errors = result.value
+                if output is not None:
+                    fs.write_text(plans[number].output_dir / operation.dest, output)
+                failures[number].extend(
+                    SyncFailure(operation.dest, (operation.sources[position],), reason) for position, reason in errors
+                )
+            journals[number].complete(operation)
+    except BaseException:
+        for journal in journals.values():
+            journal.close()  # Keep the journals so the run can be resumed
+        raise
+    for journal in journals.values():
+        journal.finish()
+    return failures
+
+
+def _apply(
+    input_dir: Path,
+    output_dir: Path,
+    operations: list[SyncOperation],
+    keyword_index: "KeywordIndex | None" = None,
+    jobs: int | None = None,
+    limits: WorkerLimits | None = None,
+    fs: FileSystem = LOCAL,
+    threads: int | None = None,
+) -> list[SyncFailure]:
+    return _apply_plans([SyncPlan(input_dir, output_dir, operations, keyword_index)], jobs, limits, fs, threads)[0]
+
+
+def sync_directories(
+    input_dir: Path,
+    output_dir: Path,
+    output_format: OutputFormat = OutputFormat.ROBOT,
+    bundle: bool = False,
+    keyword_index: "KeywordIndex | None" = None,
+    jobs: int | None = None,
+    limits: WorkerLimits | None = None,
+    fs: FileSystem = LOCAL,
+    threads: int | None = None,
+) -> list[SyncFailure]:
+    """Synchronizes a directory of .feature files to a directory of generated suites.
+
+    Suites are written as .robot files, or as .rbt JSON suites when
+    output_format is OutputFormat.JSON. Only files with the extension of the
+    selected format are considered for updates and deletion.
+
+    With ``bundle``, all features in a directory are merged into a single
+    suite (see _bundle_path), which is only rebuilt when one of its members
+    changes or a member is added or removed.
 
+    Steps matching a keyword in keyword_index call it instead of a stub.
 
-def sync_directories(input_dir: Path, output_dir: Path) -> None:
-    """Synchronizes a directory of .feature files to a directory of .robot files."""
+    All operations are planned first and recorded in a journal (see
+    gherkbot.journal), and every file is written atomically, so an
+    interrupted run can be continued with resume_sync.
+
+    Files that cannot be converted are skipped, keeping their previous
+    output, and returned with the reason; a bundle is written from the
+    members that converted. With limits, conversions run in up to ``jobs``
+    supervised worker processes; with ``threads``, in a thread pool.
+
+    All storage access goes through fs (see gherkbot.fs).
+    """
     # console.log(f"Starting sync from '{input_dir}' to '{output_dir}'...")
+    operations = plan_directories(input_dir, output_dir, output_format, bundle, fs)
+    return _apply(input_dir, output_dir, operations, keyword_index, jobs, limits, fs, threads)
+
 
-    source_files = _get_relevant_files(input_dir, ".feature")
-    dest_files = _get_relevant_files(output_dir, ".robot")
+def plan_directories(
+    input_dir: Path,
+    output_dir: Path,
+    output_format: OutputFormat = OutputFormat.ROBOT,
+    bundle: bool = False,
+    fs: FileSystem = LOCAL,
+) -> list[SyncOperation]:
+    """Returns the operations sync_directories would perform, without performing them.
 
-    source_map = {p.relative_to(input_dir).with_suffix(".robot"): p for p in source_files}
-    dest_map = {p.relative_to(output_dir): p for p in dest_files}
+    Both trees are listed with one walk each, which also yields every
+    modification time needed to find stale outputs.
+    """
+    extension = output_format.extension
+
+    source_files = fs.walk(input_dir, ".feature")
+    dest_files = fs.walk(output_dir, extension)
+
+    source_map: dict[Path, list[Path]] = {}
+    for p in sorted(source_files):
+        rel = p.relative_to(input_dir)
+        key = _bundle_path(rel.parent, input_dir, extension) if bundle else rel.with_suffix(extension)
+        source_map.setdefault(key, []).append(p)
+    dest_map = {p.relative_to(output_dir): mtime for p, mtime in dest_files.items()}
 
     source_rel_paths = set(source_map.keys())
     dest_rel_paths = set(dest_map.keys())
+    dir_mtimes = fs.stat({p.parent for p in source_files}) if bundle else {}
+
+    def write_operation(action: str, rel_path: Path) -> SyncOperation:
+        sources = tuple(p.relative_to(input_dir).as_posix() for p in source_map[rel_path])
+        return SyncOperation(action, rel_path.as_posix(), sources, bundle)
+
+    operations: list[SyncOperation] = []
 
     # 1. Create new files
-    paths_to_create = source_rel_paths - dest_rel_paths
-    for rel_path in paths_to_create:
-        source_file = source_map[rel_path]
-        dest_file = output_dir / rel_path
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        content = source_file.read_text()
-        ast = parse_feature(content)
-        if ast:
-            robot_content = convert_ast_to_robot(ast)
-            dest_file.write_text(robot_content)
-            # console.log(f"Created: {dest_file}")
+    for rel_path in sorted(source_rel_paths - dest_rel_paths):
+        operations.append(write_operation("create", rel_path))
 
     # 2. Delete old files
-    paths_to_delete = dest_rel_paths - source_rel_paths
-    for rel_path in paths_to_delete:
-        dest_file = dest_map[rel_path]
-        dest_file.unlink()
-        # console.log(f"Deleted: {dest_file}")
-        # Clean up empty parent directories
-        try:
-            dest_file.parent.rmdir()
-            # console.log(f"Removed empty directory: {dest_file.parent}")
-        except OSError:
-            pass  # Directory is not empty
+    for rel_path in sorted(dest_rel_paths - source_rel_paths):
+        operations.append(SyncOperation("delete", rel_path.as_posix()))
 
     # 3. Update existing files
-    paths_to_update = source_rel_paths.intersection(dest_rel_paths)
-    for rel_path in paths_to_update:
-        source_file = source_map[rel_path]
-        dest_file = dest_map[rel_path]
-
-        if source_file.stat().st_mtime > dest_file.stat().st_mtime:
-            content = source_file.read_text()
-            ast = parse_feature(content)
-            if ast:
-                robot_content = convert_ast_to_robot(ast)
-                dest_file.write_text(robot_content)
-                # console.log(f"Updated: {dest_file}")
+    for rel_path in sorted(source_rel_paths & dest_rel_paths):
+        sources = source_map[rel_path]
+        newest = max(source_files[p] for p in sources)
+        if bundle:
+            # Adding or removing a member updates the directory's mtime.
+            newest = max(newest, dir_mtimes.get(sources[0].parent) or 0.0)
+        if newest > dest_map[rel_path]:
+            operations.append(write_operation("update", rel_path))
+
+    return operations
+
+
+def sync_changes(
+    input_dir: Path,
+    output_dir: Path,
+    changes: list[FeatureChange],
+    output_format: OutputFormat = OutputFormat.ROBOT,
+    bundle: bool = False,
+    keyword_index: "KeywordIndex | None" = None,
+    jobs: int | None = None,
+    limits: WorkerLimits | None = None,
+    fs: FileSystem = LOCAL,
+    threads: int | None = None,
+) -> list[SyncFailure]:
+    """Applies a list of git-reported .feature changes to the output directory.
+
+    Unlike sync_directories, neither tree is scanned: only the changed paths
+    are touched, so the cost scales with the size of the diff. Renamed
+    features move their existing output and regenerate it only if git
+    reports that the content changed or the output depends on its path
+    (see _output_survives_move). With ``bundle``, only the
+    bundles of the directories containing changes are rebuilt or removed.
+    """
+    operations = plan_changes(input_dir, output_dir, changes, output_format, bundle, fs)
+    return _apply(input_dir, output_dir, operations, keyword_index, jobs, limits, fs, threads)
+
+
+def _output_survives_move(output_dir: Path, old_dest: str, rel_dest: str, fs: FileSystem) -> bool:
+    """Tells whether a moved output is what converting its unchanged feature at rel_dest would produce.
+
+    JSON suites store a name derived from their path, so they are always
+    regenerated. Robot suites import resource files relative to their
+    directory, so they survive a move to another directory only if they
+    import none.
+    """
+    if _output_format(Path(rel_dest)) is OutputFormat.JSON:
+        return False
+    if PurePosixPath(old_dest).parent == PurePosixPath(rel_dest).parent:
+        return True
+    return not any(line.startswith("Resource ") for line in fs.read_text(output_dir / old_dest).splitlines())
+
+
+def plan_changes(
+    input_dir: Path,
+    output_dir: Path,
+    changes: list[FeatureChange],
+    output_format: OutputFormat = OutputFormat.ROBOT,
+    bundle: bool = False,
+    fs: FileSystem = LOCAL,
+) -> list[SyncOperation]:
+    """Returns the operations sync_changes would perform, without performing them.
+
+    The existence of all affected outputs is checked with one batched stat.
+    """
+    extension = output_format.extension
+    operations: list[SyncOperation] = []
+
+    if bundle:
+        rel_dirs = {c.path.parent for c in changes}
+        rel_dirs.update(c.old_path.parent for c in changes if c.old_path is not None)
+        rel_dests = {rel_dir: _bundle_path(rel_dir, input_dir, extension) for rel_dir in rel_dirs}
+        mtimes = fs.stat(output_dir / rel_dest for rel_dest in rel_dests.values())
+        for rel_dir in sorted(rel_dirs):
+            rel_dest = rel_dests[rel_dir]
+            members = fs.list_dir(input_dir / rel_dir, ".feature")
+            exists = mtimes[output_dir / rel_dest] is not None
+            if members:
+                sources = tuple(p.relative_to(input_dir).as_posix() for p in members)
+                operations.append(SyncOperation("update" if exists else "create", rel_dest.as_posix(), sources, True))
+            elif exists:
+                operations.append(SyncOperation("delete", rel_dest.as_posix()))
+        return operations
+
+    candidates = [output_dir / c.path.with_suffix(extension) for c in changes]
+    candidates.extend(output_dir / c.old_path.with_suffix(extension) for c in changes if c.old_path is not None)
+    mtimes = fs.stat(candidates)
+
+    def exists(rel_dest: str) -> bool:
+        return mtimes[output_dir / rel_dest] is not None
+
+    for change in changes:
+        rel_dest = change.path.with_suffix(extension).as_posix()
+
+        if change.status == "D":
+            if exists(rel_dest):
+                operations.append(SyncOperation("delete", rel_dest))
+            continue
+
+        if change.status == "R" and change.old_path is not None:
+            old_dest = change.old_path.with_suffix(extension).as_posix()
+            if exists(old_dest):
+                operations.append(SyncOperation("move", rel_dest, moved_from=old_dest))
+                if change.similarity == 100 and _output_survives_move(output_dir, old_dest, rel_dest, fs):
+                    continue
+
+        action = "update" if exists(rel_dest) else "create"
+        operations.append(SyncOperation(action, rel_dest, (change.path.as_posix(),)))
+
+    return operations
+
+
+def resume_sync(
+    input_dir: Path,
+    output_dir: Path,
+    keyword_index: "KeywordIndex | None" = None,
+    jobs: int | None = None,
+    limits: WorkerLimits | None = None,
+    fs: FileSystem = LOCAL,
+    threads: int | None = None,
+) -> list[SyncFailure] | None:
+    """Redoes the unfinished operations of an interrupted sync.
+
+    Returns the failures like sync_directories, or None if output_dir has no
+    journal of an interrupted sync, in which case nothing is done.
+    """
+    operations = pending_operations(output_dir, fs)
+    if operations is None:
+        return None
+    failures = _apply(input_dir, output_dir, operations, keyword_index, jobs, limits, fs, threads)
+    fs.unlink(output_dir / JOURNAL_NAME, missing_ok=True)
+    return failures
+
+
+class TargetReport(NamedTuple):
+    target: "SyncTarget"
+    operations: list[SyncOperation]
+    failures: list[SyncFailure]
+
+
+def sync_targets(
+    targets: "list[SyncTarget]",
+    keyword_indexes: "list[KeywordIndex | None]",
+    jobs: int | None = None,
+    limits: WorkerLimits | None = None,
+    since: str | None = None,
+    staged: bool = False,
+    resume: bool = False,
+    fs: FileSystem = LOCAL,
+    threads: int | None = None,
+) -> list[TargetReport]:
+    """Synchronizes several configured targets in one run (see gherkbot.config).
+
+    All targets are planned first and then converted together, so one pool
+    of workers serves every target. keyword_indexes holds the index of each
+    target; targets with the same keywords should share one index. With
+    ``resume``, targets with an interrupted sync redo its unfinished
+    operations and the other targets are planned as usual, like resume_sync
+    followed by a normal sync. The journal of a resumed target is replaced
+    only when its operations are journaled again, so a crash never loses it.
+    """
+    plans: list[SyncPlan] = []
+    for target, keyword_index in zip(targets, keyword_indexes, strict=True):
+        operations = pending_operations(target.output, fs) if resume else None
+        if operations is None and (since or staged):
+            changes = changed_features(target.input, since=since, staged=staged)
+            operations = plan_changes(target.input, target.output, changes, target.format, target.bundle, fs)
+        elif operations is None:
+            operations = plan_directories(target.input, target.output, target.format, target.bundle, fs)
+        plans.append(SyncPlan(target.input, target.output, operations, keyword_index))
+
+    failures = _apply_plans(plans, jobs, limits, fs, threads)
+    return [TargetReport(target, plan.operations, failed) for target, plan, failed in zip(targets, plans, failures)]
+
+
+def sync_archive(
+    source: Path,
+    destination: Path,
+    output_format: OutputFormat = OutputFormat.ROBOT,
+    bundle: bool = False,
+    keyword_index: "KeywordIndex | None" = None,
+    fs: FileSystem = LOCAL,
+) -> list[SyncFailure]:
+    """Converts the features of a directory or archive into a directory or archive.
+
+    Tar and zip archives (see gherkbot.archive) are read and written member
+    by member, without extracting anything. An output archive is always
+    written from scratch and replaces the old one once it is complete; an
+    output directory is synced, so generated files without a source are
+    removed. Features that cannot be converted are skipped and returned; in
+    an output directory their previous output is kept, as sync_directories
+    does.
+    Archives are always local files; directories are accessed through fs.
+    """
+    extension = output_format.extension
+    if is_archive(source):
+        root_name = archive_stem(source)
+        members = iter_members(source)
+    else:
+        root_name = source.resolve().name
+        members = (
+            (PurePosixPath(p.relative_to(source).as_posix()), fs.read_text(p))
+            for p in sorted(_get_relevant_files(source, ".feature", fs))
+        )
+
+    writer = ArchiveWriter(destination) if is_archive(destination) else None
+    written: set[str] = set()
+    failures: list[SyncFailure] = []
+    bundles: dict[str, list[RobotSuiteModel]] = {}
+    converter = Converter(output_format, keyword_index)
+    # Resources are imported relative to the output; an archive is assumed to be extracted next to itself.
+    output_root = destination.parent if writer is not None else destination
+
+    def emit(rel_dest: str, model: RobotSuiteModel) -> None:
+        output = _render_model(model, Path(rel_dest))
+        if writer is not None:
+            writer.write(rel_dest, output)
+        else:
+            fs.write_text(destination / rel_dest, output)
+        written.add(rel_dest)
+
+    try:
+        for rel_path, content in members:
+            if bundle:
+                rel_dir = rel_path.parent
+                rel_dest = (rel_dir.parent / f"{rel_dir.name or root_name}{extension}").as_posix()
+            else:
+                rel_dest = rel_path.with_suffix(extension).as_posix()
+            try:
+                model = _model_from_text(content, rel_path.name, converter, output_root / rel_dest)
+            except TaskError as e:
+                failures.append(SyncFailure(rel_dest, (rel_path.as_posix(),), str(e)))
+                continue
+            if bundle:
+                bundles.setdefault(rel_dest, []).append(model)
+            else:
+                emit(rel_dest, model)
+        for rel_dest, models in sorted(bundles.items()):
+            emit(rel_dest, merge_robot_models(PurePosixPath(rel_dest).stem, models))
+    except BaseException:
+        if writer is not None:
+            writer.close(commit=False)
+        raise
+
+    if writer is not None:
+        writer.close()
+    else:
+        keep = written | {failure.dest for failure in failures}
+        for dest_file in _get_relevant_files(destination, extension, fs):
+            if dest_file.relative_to(destination).as_posix() not in keep:
+                _remove_output(dest_file, fs)
+    return failures
@@ -0,0 +1,228 @@
+"""Supervised worker processes that isolate slow or memory-hungry tasks.
+
+Each worker runs one task at a time. The supervisor hands out tasks as
+workers become free and enforces the limits: a task running longer than the
+wall-time limit gets its worker killed, a worker running out of its memory
+allowance reports the task and exits, and a worker that dies for any other
+reason is noticed through its sentinel. In all cases the task is reported as
+failed with the reason, a fresh worker takes the place of the old one, and
+the other workers keep going.
+
+run_threaded runs the same kind of tasks in a thread pool instead, without
+limits but also without process startup and pickling costs; it suits
+free-threaded Python builds, where the threads run in parallel. run_inline
+runs them one after another in the calling thread. All three report
+failures the same way.
+"""
+
+import os
+import signal
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from itertools import islice
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from typing import Any, NamedTuple
+
+
+class WorkerLimits(NamedTuple):
+    timeout: float | None = None  # Wall time per task, in seconds
+    max_memory: int | None = None  # Memory a worker may allocate on top of its startup size, in MiB
+
+
+class TaskError(Exception):
+    """Raised by a task for an expected failure; the message is reported as the reason."""
+
+
+class TaskResult(NamedTuple):
+    index: int  # Position of the task in the submitted sequence
+    value: Any = None
+    error: str | None = None
+
+
+def _run_task(func: Callable[[Any, Any], Any], context: Any, index: int, task: Any) -> TaskResult:
+    try:
+        return TaskResult(index, func(context, task))
+    except TaskError as e:
+        return TaskResult(index, error=str(e))
+    except Exception as e:
+        return TaskResult(index, error=f"{type(e).__name__}: {e}")
+
+
+def _limit_memory(max_memory: int) -> None:
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows
+    try:
+        with open("/proc/self/statm") as statm:
+            baseline = int(statm.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        baseline = 0
+    limit = baseline + max_memory * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker_main(conn: Connection, func: Callable[[Any, Any], Any], context: Any, max_memory: int | None) -> None:
+    if max_memory:
+        _limit_memory(max_memory)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((func(context, task), None, False))
+        except MemoryError:
+            limit = f"the memory limit of {max_memory} MiB" if max_memory else "the available memory"
+            # Memory may stay fragmented after a failed allocation, so the worker is recycled.
+            conn.send((None, f"exceeded {limit}", True))
+            return
+        except TaskError as e:
+            conn.send((None, str(e), False))
+        except Exception as e:
+            conn.send((None, f"{type(e).__name__}: {e}", False))
+
+
+class _Worker:
+    def __init__(self, func: Callable[[Any, Any], Any], context: Any, max_memory: int | None) -> None:
+        self.conn, child_conn = Pipe()
+        self.process = Process(target=_worker_main, args=(child_conn, func, context, max_memory), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task: int | None = None
+        self.deadline: float | None = None
+
+    def stop(self) -> None:
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+
+def _crash_reason(exitcode: int | None) -> str:
+    if exitcode is not None and exitcode < 0:
+        try:
+            name = signal.Signals(-exitcode).name
+        except ValueError:
+            name = str(-exitcode)
+        reason = f"worker was killed by {name}"
+        if exitcode == -signal.SIGKILL:
+            reason += " (possibly out of memory)"
+        return reason
+    return f"worker exited unexpectedly with code {exitcode}"
+
+
+def run_supervised(
+    func: Callable[[Any, Any], Any],
+    tasks: Iterable[Any],
+    context: Any = None,
+    jobs: int | None = None,
+    limits: WorkerLimits = WorkerLimits(),
+) -> Iterator[TaskResult]:
+    """Runs ``func(context, task)`` for every task in supervised worker processes.
+
+    Results are yielded as tasks finish, not in submission order. func,
+    context, tasks and the values returned must be picklable; context is sent
+    to each worker once, when it starts. tasks is consumed lazily, one task
+    whenever a worker becomes free, so it may be a generator that loads each
+    task only then; workers are started as tasks arrive, up to jobs.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    pending = enumerate(tasks)
+    next_task = next(pending, None)
+    workers: list[_Worker] = []
+
+    def replace(worker: _Worker) -> None:
+        worker.stop()
+        workers[workers.index(worker)] = _Worker(func, context, limits.max_memory)
+
+    def assign(worker: _Worker, index: int, task: Any) -> None:
+        worker.task = index
+        if limits.timeout:
+            worker.deadline = time.monotonic() + limits.timeout
+        worker.conn.send(task)
+
+    try:
+        while True:
+            for worker in workers:
+                if worker.task is None and next_task is not None:
+                    assign(worker, *next_task)
+                    next_task = next(pending, None)
+            while next_task is not None and len(workers) < jobs:
+                workers.append(_Worker(func, context, limits.max_memory))
+                assign(workers[-1], *next_task)
+                next_task = next(pending, None)
+            busy = [worker for worker in workers if worker.task is not None]
+            if not busy:
+                return
+
+            deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = set(wait([w.conn for w in busy] + [w.process.sentinel for w in busy], timeout))
+
+            for worker in busy:
+                index = worker.task
+                assert index is not None
+                if worker.conn in ready:
+                    try:
+                        value, error, recycle = worker.conn.recv()
+                    except (EOFError, OSError):
+                        worker.process.join()
+                        value, error, recycle = None, _crash_reason(worker.process.exitcode), True
+                elif worker.process.sentinel in ready:
+                    worker.process.join()
+                    value, error, recycle = None, _crash_reason(worker.process.exitcode), True
+                elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                    value, error, recycle = None, f"timed out after {limits.timeout:g}s", True
+                else:
+                    continue
+                worker.task = worker.deadline = None
+                if recycle:
+                    replace(worker)
+                yield TaskResult(index, value, error)
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+def run_threaded(
+    func: Callable[[Any, Any], Any],
+    tasks: Iterable[Any],
+    context: Any = None,
+    threads: int | None = None,
+) -> Iterator[TaskResult]:
+    """Runs ``func(context, task)`` for every task in a pool of threads.
+
+    Results are yielded as tasks finish, like run_supervised, and failures
+    are reported the same way. func must be safe to call from several
+    threads at once with the shared context. tasks is consumed lazily by the
+    calling thread, keeping at most two tasks per thread in flight.
+    """
+    threads = threads or os.cpu_count() or 1
+    pending = enumerate(tasks)
+    running: set[Future[TaskResult]] = set()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        try:
+            while True:
+                for index, task in islice(pending, 2 * threads - len(running)):
+                    running.add(pool.submit(_run_task, func, context, index, task))
+                if not running:
+                    return
+                done, running = wait_futures(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def run_inline(func: Callable[[Any, Any], Any], tasks: Iterable[Any], context: Any = None) -> Iterator[TaskResult]:
+    """Runs ``func(context, task)`` for every task in the calling thread, in order."""
+    for index, task in enumerate(tasks):
+        yield _run_task(func, context, index, task)
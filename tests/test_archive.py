@@ -0,0 +1,62 @@
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from gherkbot.archive import ArchiveWriter, archive_stem, is_archive, iter_members
+
+
+def _add(tf: tarfile.TarFile, name: str, text: str) -> None:
+    data = text.encode()
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tf.addfile(info, io.BytesIO(data))
+
+
+def test_is_archive_and_archive_stem() -> None:
+    assert is_archive(Path("features.tar.gz"))
+    assert is_archive(Path("FEATURES.ZIP"))
+    assert not is_archive(Path("features"))
+    assert archive_stem(Path("build/features.tar.gz")) == "features"
+    assert archive_stem(Path("suites.tgz")) == "suites"
+
+
+def test_iter_members_streams_features_and_skips_unsafe_paths(tmp_path: Path) -> None:
+    archive = tmp_path / "features.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        _add(tf, "./a/login.feature", "Feature: Login")
+        _add(tf, "a/README.md", "docs")
+        _add(tf, "../evil.feature", "Feature: Evil")
+        _add(tf, "/abs.feature", "Feature: Abs")
+
+    assert [(str(p), text) for p, text in iter_members(archive)] == [("a/login.feature", "Feature: Login")]
+
+
+@pytest.mark.parametrize("name", ["suites.zip", "suites.tar", "suites.tar.xz"])
+def test_archive_writer_round_trips_members(tmp_path: Path, name: str) -> None:
+    archive = tmp_path / "out" / name
+
+    with ArchiveWriter(archive) as writer:
+        writer.write("a/login.robot", "*** Test Cases ***\n")
+        writer.write("b.robot", "ü")
+
+    assert [(str(p), text) for p, text in iter_members(archive, ".robot")] == [
+        ("a/login.robot", "*** Test Cases ***\n"),
+        ("b.robot", "ü"),
+    ]
+    assert [p.name for p in archive.parent.iterdir()] == [name]
+
+
+def test_archive_writer_keeps_old_archive_on_error(tmp_path: Path) -> None:
+    archive = tmp_path / "suites.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("old.robot", "old")
+
+    with pytest.raises(RuntimeError), ArchiveWriter(archive) as writer:
+        writer.write("new.robot", "new")
+        raise RuntimeError("interrupted")
+
+    assert zipfile.ZipFile(archive).namelist() == ["old.robot"]
+    assert [p.name for p in tmp_path.iterdir()] == ["suites.zip"]
@@ -226,3 +226,274 @@ Feature: Advanced Gherkin Features
     assert "the system should process the data correctly" in robot_content
     assert "# TODO: implement keyword \"the system should process the data correctly\"." in robot_content
     assert robot_content.count("Fail    Not Implemented") == 3
+
+
+def test_sync_since_and_staged_are_exclusive(tmp_path: Path) -> None:
+    """Test that --since and --staged cannot be used together."""
+    result = runner.invoke(app, ["sync", str(tmp_path), str(tmp_path / "out"), "--since", "HEAD", "--staged"])
+    assert result.exit_code == 1
+    assert "cannot be combined" in result.stdout
+
+
+def test_sync_command_since_revision(tmp_path: Path) -> None:
+    """End-to-end test for sync --since, which only converts changed features."""
+    import subprocess
+
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    subprocess.run(["git", "-C", str(tmp_path), "init", "-q"], check=True)
+    (input_dir / "unchanged.feature").write_text("Feature: Unchanged")
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+    subprocess.run(
+        ["git", "-C", str(tmp_path), "-c", "user.name=Test", "-c", "user.email=t@e.com", "commit", "-q", "-m", "init"],
+        check=True,
+    )
+    (input_dir / "new.feature").write_text("Feature: New")
+
+    result = runner.invoke(app, ["sync", str(input_dir), str(output_dir), "--since", "HEAD"])
+
+    assert result.exit_code == 0
+    assert "Sync complete." in result.stdout
+    assert "Feature: New" in (output_dir / "new.robot").read_text()
+    assert not (output_dir / "unchanged.robot").exists()
+
+
+def test_convert_json_format(tmp_path: Path) -> None:
+    """Test that convert --format json writes a loadable Robot JSON suite."""
+    from robot.running import TestSuite
+
+    input_file = tmp_path / "calculator.feature"
+    input_file.write_text("Feature: Calculator\n  Scenario: Adding\n    Given I add\n")
+    output_file = tmp_path / "calculator.rbt"
+
+    result = runner.invoke(app, ["convert", str(input_file), "--format", "json", "-o", str(output_file)])
+
+    assert result.exit_code == 0
+    suite = TestSuite.from_json(output_file)
+    assert suite.name == "Calculator"
+    assert [kw.name for kw in suite.tests[0].body] == ["Given I add"]
+
+
+def test_sync_command_resume_without_journal_runs_full_sync(tmp_path: Path) -> None:
+    """Test that --resume falls back to a normal sync when no interrupted sync exists."""
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    (input_dir / "a.feature").write_text("Feature: A\n  Scenario: S\n    Given a step\n")
+
+    result = runner.invoke(app, ["sync", str(input_dir), str(output_dir), "--resume"])
+
+    assert result.exit_code == 0
+    assert "Sync complete." in result.stdout
+    assert (output_dir / "a.robot").exists()
+
+
+def test_sync_command_reports_files_that_failed_in_workers(tmp_path: Path) -> None:
+    """Test that supervised sync reports failed files with a reason and exits with an error."""
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    (input_dir / "good.feature").write_text("Feature: Good\n  Scenario: S\n    Given a step\n")
+    (input_dir / "bad.feature").write_text("Feature: Bad\n  Scenario: S\n    Given a\n    not a step\n")
+
+    result = runner.invoke(app, ["sync", str(input_dir), str(output_dir), "--timeout", "30"])
+
+    assert result.exit_code == 1
+    assert "Skipped bad.feature: bad.feature:4:5:" in result.stdout
+    assert (output_dir / "good.robot").exists()
+
+
+def test_convert_stream_reads_stdin_and_writes_stdout() -> None:
+    """Test that convert --stream turns NDJSON records on stdin into result records."""
+    import json
+
+    stdin = json.dumps({"path": "a.feature", "content": "Feature: A\n  Scenario: S\n    Given a step\n"}) + "\n"
+
+    result = runner.invoke(app, ["convert", "--stream"], input=stdin)
+
+    assert result.exit_code == 0
+    record = json.loads(result.stdout)
+    assert record["path"] == "a.feature"
+    assert "*** Test Cases ***" in record["robot"]
+    assert record["error"] is None
+
+
+def test_convert_stream_exits_non_zero_when_a_record_fails() -> None:
+    """Test that convert --stream still writes every record but fails when any record failed."""
+    import json
+
+    stdin = "not json\n" + json.dumps({"path": "a.feature", "content": "Feature: A\n  Scenario: S\n    Given a step\n"}) + "\n"
+
+    result = runner.invoke(app, ["convert", "--stream"], input=stdin)
+
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["error"] is None for record in records] == [False, True]
+
+
+def test_sync_command_without_arguments_syncs_configured_targets(tmp_path: Path, monkeypatch) -> None:
+    """Test that sync without directories processes the targets of gherkbot.toml."""
+    for name in ["a", "b"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}.feature").write_text(f"Feature: {name}\n  Scenario: S\n    Given a step\n")
+    (tmp_path / "gherkbot.toml").write_text(
+        'jobs = 2\n\n[[targets]]\ninput = "a"\noutput = "out/a"\n\n[[targets]]\ninput = "b"\noutput = "out/b"\nbundle = true\n'
+    )
+    monkeypatch.chdir(tmp_path)
+
+    result = runner.invoke(app, ["sync"])
+
+    assert result.exit_code == 0, result.stdout
+    assert "Synced 2 target(s)." in result.stdout
+    assert (tmp_path / "out" / "a" / "a.robot").exists()
+    assert (tmp_path / "out" / "b" / "b.robot").exists()  # The bundle of the input root is named after it
+
+
+def test_sync_command_without_arguments_or_config_fails(tmp_path: Path, monkeypatch) -> None:
+    """Test that sync without directories explains that no configuration was found."""
+    monkeypatch.chdir(tmp_path)
+
+    result = runner.invoke(app, ["sync"])
+
+    assert result.exit_code == 1
+    assert "no gherkbot.toml" in result.stdout
+
+
+def test_sync_command_reports_unreadable_config(tmp_path: Path, monkeypatch) -> None:
+    """Test that a malformed pyproject.toml is reported as an error instead of a traceback."""
+    (tmp_path / "pyproject.toml").write_text("[tool.gherkbot\n")
+    monkeypatch.chdir(tmp_path)
+
+    result = runner.invoke(app, ["sync"])
+
+    assert result.exit_code == 1
+    assert "Cannot read" in result.stdout
+    assert not isinstance(result.exception, ValueError)
+
+
+def test_convert_archive_writes_output_archive(tmp_path: Path) -> None:
+    """Test that convert accepts an archive of features and writes an archive of suites."""
+    import zipfile
+
+    source = tmp_path / "features.zip"
+    with zipfile.ZipFile(source, "w") as zf:
+        zf.writestr("a/login.feature", "Feature: Login\n  Scenario: S\n    Given a step\n")
+
+    result = runner.invoke(app, ["convert", str(source), "-o", str(tmp_path / "suites.tar.gz")])
+
+    assert result.exit_code == 0, result.stdout
+    from gherkbot.archive import iter_members
+
+    [(path, robot_code)] = list(iter_members(tmp_path / "suites.tar.gz", ".robot"))
+    assert str(path) == "a/login.robot"
+    assert "*** Test Cases ***" in robot_code
+
+
+def test_sync_archive_rejects_worker_options(tmp_path: Path) -> None:
+    """Test that sync refuses worker options for archives instead of silently ignoring them."""
+    import zipfile
+
+    source = tmp_path / "features.zip"
+    with zipfile.ZipFile(source, "w") as zf:
+        zf.writestr("login.feature", "Feature: Login\n  Scenario: S\n    Given a step\n")
+
+    for option in [["--jobs", "2"], ["--timeout", "30"], ["--max-memory", "512"], ["--threads", "2"]]:
+        result = runner.invoke(app, ["sync", str(source), str(tmp_path / "robot"), *option])
+
+        assert result.exit_code == 1
+        assert "do not apply to archives" in result.stdout
+    assert not (tmp_path / "robot").exists()
+
+
+def test_convert_low_memory(tmp_path: Path) -> None:
+    """Test that --low-memory output matches a normal conversion and falls back for Rules."""
+    feature = tmp_path / "big.feature"
+    feature.write_text("Feature: Big\n  Background:\n    Given a\n  Scenario: S1\n    When b\n  Scenario: S2\n    Then c\n")
+
+    normal = runner.invoke(app, ["convert", str(feature), "-o", str(tmp_path / "normal.robot")])
+    low = runner.invoke(app, ["convert", str(feature), "-o", str(tmp_path / "low.robot"), "--low-memory"])
+
+    assert normal.exit_code == 0 and low.exit_code == 0, low.stdout
+    assert (tmp_path / "low.robot").read_text() == (tmp_path / "normal.robot").read_text()
+
+    feature.write_text("Feature: Rules\n  Rule: R\n    Scenario: S\n      Given a\n")
+    result = runner.invoke(app, ["convert", str(feature), "-o", str(tmp_path / "rules.robot"), "--low-memory"])
+
+    assert result.exit_code == 0, result.stdout
+    assert "Converting the whole file" in result.stdout
+    assert "Feature: Rules" in (tmp_path / "rules.robot").read_text()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["big.feature", "low.robot", "normal.robot", "rules.robot"]
+
+
+def test_sync_command_threads(tmp_path: Path) -> None:
+    """Test that sync --threads converts in threads and rejects worker process options."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for i in range(10):
+        (input_dir / f"f{i}.feature").write_text(f"Feature: F{i}\n  Scenario: S\n    Given step {i}\n")
+
+    result = runner.invoke(app, ["sync", str(input_dir), str(tmp_path / "output"), "--threads", "4"])
+    rejected = runner.invoke(app, ["sync", str(input_dir), str(tmp_path / "other"), "--threads", "4", "-j", "2"])
+
+    assert result.exit_code == 0, result.stdout
+    assert len(list((tmp_path / "output").glob("*.robot"))) == 10
+    assert rejected.exit_code == 1
+    assert "--threads cannot be combined" in rejected.stdout
+
+
+def test_convert_never_writes_empty_output(tmp_path: Path) -> None:
+    """Test that a feature that cannot be converted fails instead of producing an empty suite."""
+    feature = tmp_path / "bad.feature"
+    feature.write_text("Feature: Bad\n  Scenario Outline: O\n    Given <x>\n    Examples:\n")
+
+    result = runner.invoke(app, ["convert", str(feature), "-f", "json", "-o", str(tmp_path / "bad.rbt")])
+
+    assert result.exit_code == 1
+    assert "cannot be converted" in result.stdout
+    assert not (tmp_path / "bad.rbt").exists()
+
+
+def test_sync_imports_resources_relative_to_each_output(tmp_path: Path, monkeypatch) -> None:
+    """Test that a --keywords resource given relative to the working directory resolves from the suites."""
+    from robot.running import TestSuite
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "kw").mkdir()
+    (tmp_path / "kw" / "shop.resource").write_text("*** Keywords ***\nI open the shop\n    No Operation\n")
+    (tmp_path / "feat" / "sub").mkdir(parents=True)
+    (tmp_path / "feat" / "sub" / "a.feature").write_text("Feature: A\n  Scenario: S\n    Given I open the shop\n")
+
+    result = runner.invoke(
+        app, ["sync", "feat", "out", "-k", "kw/shop.resource", "--keyword-cache", str(tmp_path / "cache.json")]
+    )
+
+    assert result.exit_code == 0, result.stdout
+    robot_file = tmp_path / "out" / "sub" / "a.robot"
+    assert "Resource         ../../kw/shop.resource" in robot_file.read_text()
+    monkeypatch.chdir(tmp_path / "kw")
+    run = TestSuite.from_file_system(robot_file).run(dryrun=True, output=None, console="none")
+    assert run.return_code == 0
+
+
+def test_json_suites_import_resources_by_absolute_path(tmp_path: Path, monkeypatch) -> None:
+    """Test that JSON suites, which have no source directory, import --keywords resources by absolute path."""
+    from robot.running import TestSuite
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "kw").mkdir()
+    (tmp_path / "kw" / "shop.resource").write_text("*** Keywords ***\nI open the shop\n    No Operation\n")
+    (tmp_path / "feat" / "sub").mkdir(parents=True)
+    (tmp_path / "feat" / "sub" / "a.feature").write_text("Feature: A\n  Scenario: S\n    Given I open the shop\n")
+    keywords = ["-k", "kw/shop.resource", "--keyword-cache", str(tmp_path / "cache.json")]
+
+    synced = runner.invoke(app, ["sync", "feat", "out", "-f", "json", *keywords])
+    converted = runner.invoke(app, ["convert", "feat/sub/a.feature", "-o", "single/a.rbt", "-f", "json", *keywords])
+
+    assert synced.exit_code == 0, synced.stdout
+    assert converted.exit_code == 0, converted.stdout
+    monkeypatch.chdir(tmp_path / "kw")
+    for suite_file in [tmp_path / "out" / "sub" / "a.rbt", tmp_path / "single" / "a.rbt"]:
+        assert (tmp_path / "kw" / "shop.resource").as_posix() in suite_file.read_text()
+        run = TestSuite.from_file_system(suite_file).run(dryrun=True, output=None, console="none")
+        assert run.return_code == 0
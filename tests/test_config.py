@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+
+from gherkbot.config import ConfigError, find_config, load_config
+from gherkbot.converter import OutputFormat
+
+PYPROJECT = """
+[project]
+name = "shop"
+
+[tool.gherkbot]
+jobs = 4
+
+[[tool.gherkbot.targets]]
+input = "cart/features"
+output = "cart/robot"
+bundle = true
+keywords = ["cart/keywords.resource", "Collections"]
+
+[[tool.gherkbot.targets]]
+name = "payment"
+input = "payment/features"
+output = "payment/robot"
+format = "json"
+"""
+
+
+def test_load_config_reads_targets_and_resolves_paths(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+
+    config = load_config(tmp_path / "pyproject.toml")
+
+    assert config.jobs == 4
+    assert config.keyword_cache == tmp_path / ".gherkbot_keywords.json"
+    cart, payment = config.targets
+    assert (cart.name, cart.input, cart.output, cart.bundle) == ("cart/features", tmp_path / "cart/features", tmp_path / "cart/robot", True)
+    assert cart.keywords == [str(tmp_path / "cart/keywords.resource"), "Collections"]
+    assert (payment.name, payment.format) == ("payment", OutputFormat.JSON)
+
+
+def test_find_config_prefers_gherkbot_toml_and_skips_unrelated_pyproject(tmp_path: Path) -> None:
+    nested = tmp_path / "services" / "cart"
+    nested.mkdir(parents=True)
+    (nested / "pyproject.toml").write_text('[project]\nname = "cart"\n')
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+
+    assert find_config(nested) == tmp_path / "pyproject.toml"
+
+    (tmp_path / "gherkbot.toml").write_text('[[targets]]\ninput = "a"\noutput = "b"\n')
+    assert find_config(nested) == tmp_path / "gherkbot.toml"
+    assert load_config(tmp_path / "gherkbot.toml").targets[0].output == tmp_path / "b"
+
+
+def test_load_config_reports_invalid_settings(tmp_path: Path) -> None:
+    path = tmp_path / "gherkbot.toml"
+    path.write_text('[[targets]]\ninput = "a"\noutput = "b"\nbundel = true\n')
+
+    with pytest.raises(ConfigError, match=r"at targets\.0\.bundel: Extra inputs are not permitted"):
+        load_config(path)
+
+
+def test_load_config_rejects_threads_with_worker_limits(tmp_path: Path) -> None:
+    path = tmp_path / "gherkbot.toml"
+    path.write_text('threads = 2\ntimeout = 0.5\n\n[[targets]]\ninput = "a"\noutput = "b"\n')
+
+    with pytest.raises(ConfigError, match="threads cannot be combined with jobs, timeout or max_memory"):
+        load_config(path)
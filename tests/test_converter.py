@@ -2,6 +2,7 @@ import pytest
 
 from gherkbot.converter import (
     convert_ast_to_robot,
+    convert_ast_to_suite,
     GherkinASTModel,
     FeatureModel,
     ChildModel,
@@ -233,18 +234,87 @@ eating Template
     When I eat ${eat} cucumbers
     Then I should have ${left} cucumbers
 
-I eat <eat> cucumbers
-    # TODO: implement keyword "I eat <eat> cucumbers".
+I eat ${eat} cucumbers
+    # TODO: implement keyword "I eat ${eat} cucumbers".
     Fail    Not Implemented
 
-I should have <left> cucumbers
-    # TODO: implement keyword "I should have <left> cucumbers".
+I should have ${left} cucumbers
+    # TODO: implement keyword "I should have ${left} cucumbers".
     Fail    Not Implemented
 
-there are <start> cucumbers
-    # TODO: implement keyword "there are <start> cucumbers".
+there are ${start} cucumbers
+    # TODO: implement keyword "there are ${start} cucumbers".
     Fail    Not Implemented
 
 """
     actual_robot_output = convert_ast_to_robot(scenario_outline_feature_ast)
     assert actual_robot_output.strip() == expected_robot_output.strip()
+
+
+def _without_linenos(data: object) -> object:
+    if isinstance(data, dict):
+        return {k: _without_linenos(v) for k, v in data.items() if k not in ("lineno", "name")}
+    if isinstance(data, (list, tuple)):
+        return [_without_linenos(v) for v in data]
+    return data
+
+
+@pytest.mark.parametrize("ast_fixture", ["feature_with_background_ast", "scenario_outline_feature_ast"])
+def test_convert_ast_to_suite_matches_parsed_robot_text(ast_fixture: str, request: pytest.FixtureRequest):
+    from robot.running import TestSuite
+
+    ast = request.getfixturevalue(ast_fixture)
+
+    suite = convert_ast_to_suite(ast)
+    parsed = TestSuite.from_string(convert_ast_to_robot(ast))
+
+    assert suite is not None
+    assert _without_linenos(suite.to_dict()) == _without_linenos(parsed.to_dict())
+
+
+def test_convert_ast_to_suite_builds_model_objects(scenario_outline_feature_ast: object):
+    suite = convert_ast_to_suite(scenario_outline_feature_ast)
+
+    assert suite is not None
+    assert suite.name == "Scenario Outline Example"
+    assert [test.name for test in suite.tests] == ["eating - 12, 5, 7", "eating - 20, 5, 15"]
+    assert suite.tests[0].template == "eating Template"
+    assert suite.tests[0].body[0].args == ("12", "5", "7")
+    template = suite.resource.keywords[0]
+    assert template.name == "eating Template"
+    assert list(template.args.positional_or_named) == ["start", "eat", "left"]
+    assert template.body[0].name == "Given there are ${start} cucumbers"
+
+
+def test_convert_ast_to_suite_invalid_ast():
+    assert convert_ast_to_suite({}) is None
+    assert convert_ast_to_suite({"feature": {"name": "missing required fields"}}) is None
+
+
+def test_merge_robot_models_scopes_backgrounds_and_dedupes_names(
+    feature_with_background_ast: object, scenario_outline_feature_ast: object
+):
+    from robot.running import TestSuite
+
+    from gherkbot.converter import build_robot_model, merge_robot_models, render_robot
+
+    background = build_robot_model(feature_with_background_ast)
+    outline = build_robot_model(scenario_outline_feature_ast)
+    assert background is not None and outline is not None
+
+    bundle = merge_robot_models("Bundle", [background, outline, background])
+    suite = TestSuite.from_string(render_robot(bundle))
+
+    assert [test.name for test in suite.tests] == [
+        "First scenario",
+        "eating - 12, 5, 7",
+        "eating - 20, 5, 15",
+        "Feature with Background - First scenario",
+    ]
+    assert suite.tests[0].setup.name == "Feature with Background Background"
+    assert not suite.tests[1].setup
+    assert suite.tests[1].template == "eating Template"
+    assert list(suite.tests[1].body[0].args) == ["12", "5", "7"]
+    assert suite.tests[3].setup.name == "Feature with Background Background (2)"
+    keyword_names = [kw.name for kw in suite.resource.keywords]
+    assert len(keyword_names) == len(set(keyword_names))
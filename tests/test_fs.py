@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from gherkbot.fs import FileSystem, LocalFileSystem, MemoryFileSystem
+
+
+@pytest.fixture(params=["local", "memory"])
+def fs_root(request: pytest.FixtureRequest, tmp_path: Path) -> tuple[FileSystem, Path]:
+    if request.param == "local":
+        return LocalFileSystem(), tmp_path
+    return MemoryFileSystem(), Path("/data")
+
+
+def test_filesystems_walk_list_and_stat(fs_root: tuple[FileSystem, Path]) -> None:
+    fs, root = fs_root
+    fs.write_text(root / "a.feature", "A")
+    fs.write_text(root / "sub" / "b.feature", "B")
+    fs.write_text(root / "sub" / "notes.txt", "N")
+
+    assert sorted(fs.walk(root, ".feature")) == [root / "a.feature", root / "sub" / "b.feature"]
+    assert fs.list_dir(root, ".feature") == [root / "a.feature"]
+    assert fs.walk(root / "missing", ".feature") == {}
+    mtimes = fs.stat([root / "a.feature", root / "sub", root / "missing"])
+    assert mtimes[root / "a.feature"] is not None
+    assert mtimes[root / "sub"] is not None
+    assert mtimes[root / "missing"] is None
+    assert fs.read_text(root / "sub" / "b.feature") == "B"
+
+
+def test_filesystems_rename_unlink_and_rmdir(fs_root: tuple[FileSystem, Path]) -> None:
+    fs, root = fs_root
+    fs.write_text(root / "old" / "a.robot", "A")
+
+    fs.rename(root / "old" / "a.robot", root / "new" / "a.robot")
+    fs.rmdir_if_empty(root / "old")
+    fs.rmdir_if_empty(root / "new")
+
+    assert not fs.exists(root / "old")
+    assert fs.read_text(root / "new" / "a.robot") == "A"
+    fs.unlink(root / "new" / "a.robot")
+    fs.unlink(root / "new" / "a.robot", missing_ok=True)
+    with pytest.raises(FileNotFoundError):
+        fs.unlink(root / "new" / "a.robot")
+
+
+def test_filesystems_log_is_readable_after_flush(fs_root: tuple[FileSystem, Path]) -> None:
+    fs, root = fs_root
+    log = fs.open_log(root / "journal")
+    log.write("line\n")
+    log.flush()
+
+    assert fs.read_text(root / "journal") == "line\n"
+    log.close()
+
+
+def test_memory_filesystem_clock_orders_changes() -> None:
+    fs = MemoryFileSystem({"in/a.feature": "A"})
+    fs.write_text(Path("out/a.robot"), "A")
+    directory_mtime = fs.stat([Path("in")])[Path("in")]
+
+    fs.write_text(Path("in/b.feature"), "B")
+
+    mtimes = fs.stat([Path("in/a.feature"), Path("out/a.robot"), Path("in")])
+    assert mtimes[Path("in/a.feature")] < mtimes[Path("out/a.robot")]
+    assert mtimes[Path("in")] > directory_mtime  # Adding a member touches the directory
@@ -0,0 +1,77 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gherkbot.gitdiff import (
+    FeatureChange,
+    GitError,
+    _parse_name_status,
+    changed_features,
+)
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+    features = tmp_path / "features"
+    features.mkdir()
+    (features / "keep.feature").write_text("Feature: Keep\n")
+    (features / "edit.feature").write_text("Feature: Edit\n")
+    (features / "remove.feature").write_text("Feature: Remove\n")
+    (features / "move.feature").write_text("Feature: Move\n  Scenario: A long enough scenario\n")
+    (features / "notes.txt").write_text("not a feature")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_parse_name_status_handles_renames_and_filters() -> None:
+    output = "\0".join(
+        ["M", "a.feature", "A", "b.txt", "R100", "old.feature", "new.feature", "R050", "x.feature", "x.txt", ""]
+    )
+
+    changes = _parse_name_status(output)
+
+    assert changes == [
+        FeatureChange("M", Path("a.feature")),
+        FeatureChange("R", Path("new.feature"), Path("old.feature"), 100),
+        FeatureChange("D", Path("x.feature")),
+    ]
+
+
+def test_changed_features_since_revision(repo: Path) -> None:
+    features = repo / "features"
+    (features / "edit.feature").write_text("Feature: Edited\n")
+    (features / "remove.feature").unlink()
+    (features / "new.feature").write_text("Feature: New\n")
+    (features / "notes.txt").write_text("changed")
+
+    changes = changed_features(features, since="HEAD")
+
+    assert set(changes) == {
+        FeatureChange("M", Path("edit.feature")),
+        FeatureChange("D", Path("remove.feature")),
+        FeatureChange("A", Path("new.feature")),
+    }
+
+
+def test_changed_features_staged_detects_rename(repo: Path) -> None:
+    features = repo / "features"
+    _git(repo, "mv", "features/move.feature", "features/moved.feature")
+    (features / "untracked.feature").write_text("Feature: Untracked\n")
+
+    changes = changed_features(features, staged=True)
+
+    assert changes == [FeatureChange("R", Path("moved.feature"), Path("move.feature"), 100)]
+
+
+def test_changed_features_outside_repository(tmp_path: Path) -> None:
+    with pytest.raises(GitError):
+        changed_features(tmp_path, since="HEAD")
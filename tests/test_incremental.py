@@ -0,0 +1,94 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from gherkbot.converter import convert_ast_to_robot
+from gherkbot.incremental import UnsupportedLayout, convert_incremental, iter_blocks
+from gherkbot.parser import parse_feature
+
+FEATURE = '''Feature: Shopping
+  Users buy things.
+
+  Background:
+    Given an empty cart
+
+  Scenario: Add an item
+    When the user adds "apple"
+    Then the cart contains 1 item
+
+  Scenario: Check out
+    Given a full cart
+    When the user checks out
+      """
+      card: 1234
+      Scenario: not a block
+      """
+    Then the cart contains 1 item
+'''
+
+OUTLINE = '''Feature: Outlines
+
+  Scenario Outline: Eat
+    Given there are <start> cucumbers
+    When I eat <eat> cucumbers
+
+    Examples:
+      | start | eat |
+      | 12    | 5   |
+      | 20    | 5   |
+
+  Scenario: Plain
+    Given there are 1 cucumbers
+'''
+
+
+def _convert(tmp_path: Path, text: str) -> str:
+    source = tmp_path / "big.feature"
+    source.write_text(text)
+    output = io.StringIO()
+    convert_incremental(source, output)
+    return output.getvalue()
+
+
+def test_iter_blocks_carries_tags_and_skips_docstrings() -> None:
+    text = FEATURE.replace("  Scenario: Check out", "  # Checkout comes last\n  @slow\n  Scenario: Check out")
+
+    blocks = list(iter_blocks(text.splitlines(keepends=True)))
+
+    assert [start for start, _ in blocks] == [0, 3, 6, 10]
+    assert blocks[3][1].startswith("  # Checkout comes last\n  @slow\n  Scenario: Check out")
+
+
+def test_convert_incremental_matches_full_conversion(tmp_path: Path) -> None:
+    assert _convert(tmp_path, FEATURE) == convert_ast_to_robot(parse_feature(FEATURE))
+
+
+def test_convert_incremental_templates_outline_tests_only(tmp_path: Path) -> None:
+    from robot.running import TestSuite
+
+    suite = TestSuite.from_string(_convert(tmp_path, OUTLINE))
+
+    assert [(t.name, t.template) for t in suite.tests] == [
+        ("Eat - 12, 5", "Eat Template"),
+        ("Eat - 20, 5", "Eat Template"),
+        ("Plain", None),
+    ]
+    assert [kw.name for kw in suite.tests[2].body] == ["Given there are 1 cucumbers"]
+
+
+def test_convert_incremental_reports_file_lines(tmp_path: Path) -> None:
+    broken = FEATURE.replace("    Then the cart contains 1 item\n\n", "    Then the cart contains 1 item\n    not a step\n\n", 1)
+
+    with pytest.raises(ValueError, match=r"^line 10:"):
+        _convert(tmp_path, broken)
+
+
+def test_convert_incremental_rejects_rules(tmp_path: Path) -> None:
+    with pytest.raises(UnsupportedLayout, match="line 3"):
+        _convert(tmp_path, "Feature: F\n\n  Rule: R\n    Scenario: S\n      Given a\n")
+
+
+def test_convert_incremental_empty_file(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="no feature"):
+        _convert(tmp_path, "")
@@ -0,0 +1,112 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from gherkbot.converter import convert_ast_to_robot
+from gherkbot.keywords import KeywordIndex, KeywordSource, load_keyword_index
+from gherkbot.parser import parse_feature
+
+RESOURCE = """*** Keywords ***
+I have ${count:\\d+} items in the cart
+    No Operation
+
+the user "${name}" logs in
+    No Operation
+
+I open the shop
+    No Operation
+"""
+
+
+@pytest.fixture
+def resource_file(tmp_path: Path) -> Path:
+    path = tmp_path / "shop.resource"
+    path.write_text(RESOURCE)
+    return path
+
+
+def test_index_matches_literal_and_embedded_keywords() -> None:
+    shop = KeywordSource(
+        name="shop.resource",
+        kind="resource",
+        keywords=["I open the shop", "I have ${count:\\d+} items in the cart", 'the user "${name}" logs in'],
+    )
+    index = KeywordIndex([shop, KeywordSource(name="BuiltIn", kind="library", keywords=["Log"])])
+
+    assert index.match("i open_the   Shop") is shop
+    assert index.match("I have 3 items in the cart") is shop
+    assert index.match('the user "alice" logs in') is shop
+    assert index.match("log").name == "BuiltIn"
+    assert index.match("I have three items in the cart") is None
+    assert index.match("I close the shop") is None
+
+
+def test_load_keyword_index_reads_resources_and_libraries(resource_file: Path) -> None:
+    index = load_keyword_index([str(resource_file), "Collections"])
+
+    assert index.match("I have 2 items in the cart").name == str(resource_file)
+    assert index.match("Append To List").name == "Collections"
+
+
+def test_load_keyword_index_reuses_cache_for_unchanged_sources(
+    mocker: MagicMock, resource_file: Path, tmp_path: Path
+) -> None:
+    cache_file = tmp_path / "cache" / "keywords.json"
+    load_keyword_index([str(resource_file)], cache_file)
+    assert cache_file.exists()
+
+    spy = mocker.patch("gherkbot.keywords._read_source", wraps=__import__("gherkbot.keywords").keywords._read_source)
+    index = load_keyword_index([str(resource_file)], cache_file)
+    assert spy.call_count == 0
+    assert index.match("I open the shop") is not None
+
+    resource_file.write_text(RESOURCE + "\nI leave the shop\n    No Operation\n")
+    index = load_keyword_index([str(resource_file)], cache_file)
+    assert spy.call_count == 1
+    assert index.match("I leave the shop") is not None
+
+
+def test_converter_calls_indexed_keywords_instead_of_stubs(resource_file: Path) -> None:
+    from robot.running import TestSuite
+
+    index = load_keyword_index([str(resource_file)])
+    ast = parse_feature(
+        "Feature: Shop\n"
+        "  Scenario: Buying\n"
+        "    Given I open the shop\n"
+        "    When I have 2 items in the cart\n"
+        "    Then I can pay\n"
+    )
+
+    robot_code = convert_ast_to_robot(ast, index)
+
+    assert f"Resource         {resource_file}" in robot_code
+    assert robot_code.count("Fail    Not Implemented") == 1
+    assert '# TODO: implement keyword "I can pay".' in robot_code
+    result = TestSuite.from_string(robot_code).run(dryrun=True, output=None, console="none")
+    assert result.return_code == 0  # The resource is imported and every step resolves
+
+
+def test_converter_matches_outline_steps_by_their_example_values(resource_file: Path) -> None:
+    index = load_keyword_index([str(resource_file)])
+    outline = (
+        "Feature: Cart\n"
+        "  Scenario Outline: Filling\n"
+        "    Given I have <n> items in the cart\n"
+        "    Then I see <n> items\n"
+        "    Examples:\n"
+        "      | n |\n"
+        "      | 2 |\n"
+        "      | 3 |\n"
+    )
+
+    robot_code = convert_ast_to_robot(parse_feature(outline), index)
+    partial = convert_ast_to_robot(parse_feature(outline + "      | two |\n"), index)
+
+    assert f"Resource         {resource_file}" in robot_code
+    assert "<n>" not in robot_code
+    assert robot_code.count("Fail    Not Implemented") == 1
+    assert '# TODO: implement keyword "I see ${n} items".' in robot_code
+    assert '# TODO: implement keyword "I have two items in the cart".' in partial
+    assert partial.count("Fail    Not Implemented") == 2
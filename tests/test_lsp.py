@@ -0,0 +1,165 @@
+import io
+from unittest.mock import MagicMock
+
+from gherkbot.converter import convert_ast_to_robot
+from gherkbot.lsp import (
+    Document,
+    LanguageServer,
+    _split_blocks,
+    read_message,
+    serve,
+    write_message,
+)
+from gherkbot.parser import parse_feature
+
+FEATURE = '''Feature: Shopping
+  Buying things online
+
+  Background:
+    Given I am logged in
+
+  Scenario: Add to cart
+    When I add "socks" to the cart
+    Then the cart contains 1 item
+
+  Scenario Outline: Checkout
+    Given a cart with <count> items
+      """
+      Scenario: not a real scenario
+      """
+    Then I pay <total>
+
+    Examples:
+      | count | total |
+      | 1     | 5     |
+      | 2     | 10    |
+'''
+
+
+def test_document_preview_matches_full_conversion() -> None:
+    document = Document(FEATURE)
+
+    robot_code, errors = document.convert()
+
+    assert errors == []
+    assert robot_code == convert_ast_to_robot(parse_feature(FEATURE))
+
+
+def test_split_blocks_attaches_tags_and_skips_docstrings() -> None:
+    text = 'Feature: F\n\n  @slow\n  # note\n  Scenario: A\n    Given x\n      """\n      Scenario: B\n      """\n'
+
+    blocks = _split_blocks(text)
+
+    assert blocks == [(0, "Feature: F\n\n"), (2, text.split("\n", 2)[2])]
+    assert _split_blocks("Feature: F\n  Rule: R\n") is None
+
+
+def test_document_edit_reconverts_only_the_changed_block(mocker: MagicMock) -> None:
+    document = Document(FEATURE)
+    document.convert()
+    spy = mocker.patch("gherkbot.lsp.convert_block", wraps=__import__("gherkbot.lsp").lsp.convert_block)
+
+    # Replace "1 item" on line 8 (0-based) with "2 items"
+    document.apply_change(
+        {
+            "range": {"start": {"line": 8, "character": 27}, "end": {"line": 8, "character": 33}},
+            "text": "2 items",
+        }
+    )
+    robot_code, errors = document.convert()
+
+    assert errors == []
+    assert spy.call_count == 1
+    assert "Then the cart contains 2 items" in robot_code
+    assert robot_code == convert_ast_to_robot(parse_feature(document.text))
+
+
+def test_document_reports_errors_with_document_lines() -> None:
+    broken = FEATURE.replace("    Then the cart contains 1 item", "    this is not a step")
+
+    robot_code, errors = Document(broken).convert()
+
+    assert [(e.line, e.column) for e in errors] == [(9, 5)]
+    assert "this is not a step" in errors[0].message
+    assert "Run Background Steps" in robot_code  # The other blocks are still previewed
+
+
+def test_server_publishes_diagnostics_and_serves_preview() -> None:
+    sent: list[dict] = []
+    server = LanguageServer(sent.append)
+    uri = "file:///shopping.feature"
+
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": "Feature: X\n  Scenario: Y\n    Given a\n    oops\n"}}})
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didChange", "params": {"textDocument": {"uri": uri}, "contentChanges": [{"text": FEATURE}]}})
+    server.handle({"jsonrpc": "2.0", "id": 1, "method": "gherkbot/preview", "params": {"textDocument": {"uri": uri}}})
+    server.handle({"jsonrpc": "2.0", "id": 2, "method": "unknown/method"})
+
+    assert sent[0]["method"] == "textDocument/publishDiagnostics"
+    assert sent[0]["params"]["diagnostics"][0]["range"]["start"] == {"line": 3, "character": 4}
+    assert sent[1]["params"]["diagnostics"] == []
+    assert sent[2]["result"]["robot"] == convert_ast_to_robot(parse_feature(FEATURE))
+    assert sent[3]["error"]["code"] == -32601
+
+
+def test_serve_speaks_lsp_framing() -> None:
+    stdin = io.BytesIO()
+    for message in [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+        {"jsonrpc": "2.0", "method": "exit"},
+    ]:
+        write_message(stdin, message)
+    stdin.seek(0)
+    stdout = io.BytesIO()
+
+    serve(stdin, stdout)
+
+    stdout.seek(0)
+    initialize = read_message(stdout)
+    assert initialize is not None
+    assert initialize["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    assert read_message(stdout) == {"jsonrpc": "2.0", "id": 2, "result": None}
+    assert read_message(stdout) is None
+
+
+def test_server_answers_failing_requests_with_errors(mocker: MagicMock) -> None:
+    sent: list[dict] = []
+    server = LanguageServer(sent.append)
+    uri = "file:///missing.feature"
+
+    server.handle({"jsonrpc": "2.0", "id": 1, "method": "gherkbot/preview", "params": {"textDocument": {"uri": uri}}})
+    server.handle({"jsonrpc": "2.0", "id": 2, "method": "gherkbot/preview", "params": {}})
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didChange", "params": {"textDocument": {"uri": uri}, "contentChanges": []}})
+    server.handle([1, 2])  # type: ignore[arg-type]
+    mocker.patch.object(Document, "convert", side_effect=RuntimeError("boom"))
+    server.handle({"jsonrpc": "2.0", "id": 3, "method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": "Feature: X\n"}}})
+
+    assert sent[0]["id"] == 1
+    assert sent[0]["error"]["code"] == -32602
+    assert uri in sent[0]["error"]["message"]
+    assert sent[1]["error"]["code"] == -32602
+    assert sent[2]["method"] == "window/logMessage"
+    assert sent[3] == {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Message must be a JSON object"}}
+    assert sent[4]["error"] == {"code": -32603, "message": "textDocument/didOpen: RuntimeError: boom"}
+
+
+def test_serve_survives_malformed_messages() -> None:
+    stdin = io.BytesIO()
+    body = b"{not json"
+    stdin.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    write_message(stdin, {"jsonrpc": "2.0", "id": 1, "method": "gherkbot/preview", "params": {"textDocument": {"uri": "file:///x"}}})
+    write_message(stdin, {"jsonrpc": "2.0", "id": 2, "method": "shutdown"})
+    stdin.seek(0)
+    stdout = io.BytesIO()
+
+    serve(stdin, stdout)
+
+    stdout.seek(0)
+    parse_error = read_message(stdout)
+    assert parse_error is not None
+    assert parse_error["id"] is None
+    assert parse_error["error"]["code"] == -32700
+    preview = read_message(stdout)
+    assert preview is not None
+    assert preview["error"]["code"] == -32602
+    assert read_message(stdout) == {"jsonrpc": "2.0", "id": 2, "result": None}
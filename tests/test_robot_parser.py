@@ -0,0 +1,71 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from robot.errors import DataError
+
+import gherkbot
+from gherkbot.robot_parser import RobotParser
+
+FEATURE = """Feature: Calculator
+  Scenario: Adding
+    Given I have entered 50
+    When I press add
+    Then the result should be 50
+"""
+
+
+def test_parser_is_exported_from_package() -> None:
+    assert gherkbot.RobotParser is RobotParser
+
+
+def test_parse_builds_suite_in_memory(tmp_path: Path) -> None:
+    source = tmp_path / "calculator.feature"
+    source.write_text(FEATURE)
+
+    suite = RobotParser().parse(source, None)
+
+    assert suite.name == "Calculator"
+    assert suite.source == source
+    assert [test.name for test in suite.tests] == ["Adding"]
+    assert [kw.name for kw in suite.tests[0].body] == [
+        "Given I have entered 50",
+        "When I press add",
+        "Then the result should be 50",
+    ]
+    assert list(tmp_path.iterdir()) == [source]
+
+
+def test_parse_reuses_disk_cache(mocker: MagicMock, tmp_path: Path) -> None:
+    source = tmp_path / "calculator.feature"
+    source.write_text(FEATURE)
+    cache_dir = tmp_path / "cache"
+    RobotParser(str(cache_dir)).parse(source, None)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    mock_parse = mocker.patch("gherkbot.robot_parser.parse_feature")
+    suite = RobotParser(str(cache_dir)).parse(source, None)
+
+    mock_parse.assert_not_called()
+    assert [test.name for test in suite.tests] == ["Adding"]
+
+
+def test_parse_keeps_no_converted_suites_without_cache(mocker: MagicMock, tmp_path: Path) -> None:
+    source = tmp_path / "calculator.feature"
+    source.write_text(FEATURE)
+    spy = mocker.spy(gherkbot.robot_parser, "parse_feature")
+    parser = RobotParser()
+
+    first, second = parser.parse(source, None), parser.parse(source, None)
+
+    assert spy.call_count == 2
+    assert first is not second
+    assert vars(parser) == {"cache_dir": None}
+
+
+def test_parse_error_is_reported_as_data_error(tmp_path: Path) -> None:
+    source = tmp_path / "broken.feature"
+    source.write_text("not gherkin")
+
+    with pytest.raises(DataError, match="Failed to parse"):
+        RobotParser().parse(source, None)
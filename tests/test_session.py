@@ -0,0 +1,102 @@
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gherkbot.converter import OutputFormat, convert_ast_to_json, convert_ast_to_robot
+from gherkbot.keywords import KeywordIndex, KeywordSource
+from gherkbot.parser import parse_feature
+from gherkbot.session import Converter
+
+GERMAN = "# language: de\nFunktionalität: Anmeldung\n  Szenario: Gültig\n    Angenommen ein Benutzer\n"
+
+
+def _feature(i: int) -> str:
+    return (
+        f"Feature: F{i}\n"
+        "  Background:\n"
+        f"    Given a user named u{i}\n"
+        f"  Scenario Outline: Buy {i}\n"
+        "    When they add <count> items\n"
+        "    Then the cart has <count> items\n"
+        "    Examples:\n"
+        "      | count |\n"
+        f"      | {i} |\n"
+        f"      | {i + 1} |\n"
+    )
+
+
+FEATURES = [GERMAN if i % 7 == 0 else _feature(i) for i in range(200)]
+
+
+def test_converter_matches_module_functions() -> None:
+    converter = Converter()
+
+    for content in FEATURES[:10]:
+        assert converter.convert(content) == convert_ast_to_robot(parse_feature(content))
+        assert converter.parse_feature(content) == parse_feature(content)
+
+
+def test_converter_json_names_suite_after_path() -> None:
+    converter = Converter(OutputFormat.JSON)
+
+    assert converter.convert(FEATURES[1], "shop/buy.feature") == convert_ast_to_json(
+        parse_feature(FEATURES[1]), name="Buy"
+    )
+
+
+def test_converter_reports_errors() -> None:
+    converter = Converter()
+
+    with pytest.raises(ValueError, match=r"^\(4:5\): expected:"):
+        converter.convert("Feature: F\n  Scenario: S\n    Given a\n    not a step\n")
+    with pytest.raises(ValueError, match="could not be converted"):
+        converter.convert("# only a comment\n")
+    # The parser recovers from errors, and from another dialect, for the next call
+    assert converter.convert(FEATURES[1]) == convert_ast_to_robot(parse_feature(FEATURES[1]))
+
+
+def test_converter_shared_by_threads_matches_serial_output() -> None:
+    index = KeywordIndex([KeywordSource(name="Shop", kind="library", keywords=["they add ${n} items"])])
+    serial = [Converter(keyword_index=index).convert(content) for content in FEATURES]
+    converter = Converter(keyword_index=KeywordIndex(index.sources))
+    start = threading.Barrier(8)
+
+    def convert(content: str) -> str:
+        if not start.broken:
+            try:
+                start.wait(timeout=5)  # Start all threads at once to maximize interleaving
+            except threading.BrokenBarrierError:
+                pass
+        return converter.convert(content)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(3):
+            assert list(pool.map(convert, FEATURES)) == serial
+    assert "Library          Shop" in serial[1]
+
+
+def test_converter_uses_one_parser_per_thread() -> None:
+    converter = Converter()
+    parsers: dict[int, object] = {}
+
+    def record(_: int) -> None:
+        converter.convert(FEATURES[1])
+        parser = converter._parser()[0]
+        assert parsers.setdefault(threading.get_ident(), parser) is parser
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(record, range(40)))
+
+    assert len(set(map(id, parsers.values()))) == len(parsers)
+
+
+def test_converter_pickles_without_parsers() -> None:
+    converter = Converter(OutputFormat.JSON)
+    converter.convert(FEATURES[1])
+
+    copy = pickle.loads(pickle.dumps(converter))
+
+    assert copy.output_format is OutputFormat.JSON
+    assert copy.convert(FEATURES[1], "a.feature") == converter.convert(FEATURES[1], "a.feature")
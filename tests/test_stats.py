@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from gherkbot.cli import app
+from gherkbot.converter import convert_ast_to_robot
+from gherkbot.parser import parse_feature
+from gherkbot.stats import collect_stats, scan_feature
+
+FEATURE = '''@shop
+Feature: Shop
+  Background:
+    Given I am logged in
+
+  Scenario: Buying
+    Given I am logged in
+    When I pay with:
+      """
+      card
+      """
+    Then I get a receipt
+
+  Scenario Outline: Stock
+    Given there are <n> items
+    Then I can buy <n>
+      | item  |
+      | socks |
+
+    Examples:
+      | n |
+      | 1 |
+      | 2 |
+      | 3 |
+'''
+
+
+def test_scan_feature_counts_structure() -> None:
+    stats, step_texts = scan_feature(FEATURE, "shop.feature")
+
+    assert (stats.scenarios, stats.outlines, stats.backgrounds) == (1, 1, 1)
+    assert stats.steps == 6
+    assert stats.example_rows == 3
+    assert stats.table_rows == 2
+    assert stats.doc_string_lines == 1
+    assert stats.tests == 4
+    assert step_texts["I am logged in"] == 2
+    assert stats.unique_steps == 5
+
+
+def test_scan_feature_estimate_is_close_to_real_output() -> None:
+    feature = "Feature: Big\n" + "".join(
+        f"  Scenario: S{i}\n    Given step {i % 7}\n    When action {i}\n    Then result {i % 3}\n" for i in range(50)
+    )
+    stats, _ = scan_feature(feature)
+    actual = len(convert_ast_to_robot(parse_feature(feature)))
+
+    assert 0.5 * actual < stats.estimated_output_bytes < 1.5 * actual
+
+
+def test_scan_feature_uses_the_feature_language() -> None:
+    feature = "# language: de\nFunktionalität: Laden\n  Szenario: Kaufen\n    Angenommen ich bin da\n    Dann zahle ich\n"
+
+    stats, _ = scan_feature(feature)
+
+    assert (stats.scenarios, stats.steps) == (1, 2)
+
+
+def test_collect_stats_in_parallel(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "shop.feature").write_text(FEATURE)
+    (tmp_path / "sub" / "small.feature").write_text("Feature: Small\n  Scenario: A\n    Given I am logged in\n")
+    (tmp_path / "sub" / "broken.feature").write_text("not gherkin")
+
+    corpus = collect_stats(tmp_path, jobs=2, exact=True, top=1)
+
+    assert [f.path for f in corpus.files] == ["shop.feature", "sub/broken.feature", "sub/small.feature"]
+    assert corpus.total_tests == 5
+    assert corpus.top_steps[0].text == "I am logged in"
+    assert corpus.top_steps[0].count == 3
+    assert corpus.files[1].error == "Failed to parse the Gherkin feature file."
+    assert corpus.files[2].output_bytes == len(convert_ast_to_robot(parse_feature("Feature: Small\n  Scenario: A\n    Given I am logged in\n")))
+
+
+def test_stats_command_writes_json(tmp_path: Path) -> None:
+    (tmp_path / "shop.feature").write_text(FEATURE)
+    report = tmp_path / "report.json"
+
+    result = CliRunner().invoke(app, ["stats", str(tmp_path), "--json", str(report), "--jobs", "1"])
+
+    assert result.exit_code == 0
+    assert "1 feature files, 4 tests, 6 steps" in result.stdout
+    assert "Most reused step texts" in result.stdout
+    data = json.loads(report.read_text())
+    assert data["files"][0]["path"] == "shop.feature"
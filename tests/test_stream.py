@@ -0,0 +1,62 @@
+import io
+import json
+
+from gherkbot.converter import OutputFormat, convert_ast_to_robot
+from gherkbot.parser import parse_feature
+from gherkbot.stream import convert_stream
+
+FEATURE = "Feature: Login\n  Scenario: Valid user\n    Given a valid user\n    When they log in\n"
+GERMAN = "# language: de\nFunktionalität: Anmeldung\n  Szenario: Gültig\n    Angenommen ein Benutzer\n"
+
+
+def _run(lines: list[str], output_format: OutputFormat = OutputFormat.ROBOT) -> tuple[list[dict], int]:
+    output = io.StringIO()
+    failed = convert_stream(lines, output, output_format)
+    return [json.loads(line) for line in output.getvalue().splitlines()], failed
+
+
+def test_convert_stream_converts_each_record() -> None:
+    lines = [
+        json.dumps({"path": "login.feature", "content": FEATURE}),
+        "\n",
+        json.dumps({"path": "de.feature", "content": GERMAN}),
+        json.dumps({"path": "again.feature", "content": FEATURE}),
+    ]
+
+    records, failed = _run(lines)
+
+    assert failed == 0
+    assert [r["path"] for r in records] == ["login.feature", "de.feature", "again.feature"]
+    assert records[0] == {"path": "login.feature", "robot": convert_ast_to_robot(parse_feature(FEATURE)), "error": None}
+    assert records[1]["robot"] == convert_ast_to_robot(parse_feature(GERMAN))
+    assert records[2]["robot"] == records[0]["robot"]  # The reused parser is reset to English
+
+
+def test_convert_stream_reports_errors_per_record() -> None:
+    lines = [
+        "not json",
+        json.dumps({"path": "no_content.feature"}),
+        json.dumps({"path": 5, "content": FEATURE}),
+        json.dumps({"path": "broken.feature", "content": "Feature: X\n  Scenario: Y\n    Given a\n    oops\n"}),
+        json.dumps({"path": "login.feature", "content": FEATURE}),
+    ]
+
+    records, failed = _run(lines)
+
+    assert failed == 4
+    assert records[0] == {"path": None, "robot": None, "error": "Invalid record: Expecting value"}
+    assert records[1]["error"] == "Invalid record: missing 'content'"
+    assert records[2] == {"path": None, "robot": None, "error": "Invalid record: path must be a string"}
+    assert records[3]["path"] == "broken.feature"
+    assert records[3]["error"].startswith("(4:5): expected:")
+    assert records[4]["error"] is None
+
+
+def test_convert_stream_json_format_names_suites_after_path() -> None:
+    from robot.running import TestSuite
+
+    records, _ = _run([json.dumps({"path": "features/login_page.feature", "content": FEATURE})], OutputFormat.JSON)
+
+    suite = TestSuite.from_json(records[0]["robot"])
+    assert suite.name == "Login Page"
+    assert [test.name for test in suite.tests] == ["Valid user"]
@@ -1,9 +1,14 @@
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import os
 import time
 import pytest
-from gherkbot.synchronizer import sync_directories, _get_relevant_files
+from gherkbot.converter import RobotSuiteModel
+from gherkbot.gitdiff import FeatureChange
+from gherkbot.synchronizer import sync_changes, sync_directories, _get_relevant_files
+
+MODEL = RobotSuiteModel(name="Test")
 
 @pytest.fixture
 def temp_dir_with_files(tmp_path: Path) -> Path:
@@ -70,8 +75,8 @@ def test_sync_creates_new_robot_file(mocker: MagicMock, tmp_path: Path) -> None:
     robot_file = output_dir / "test.robot"
     robot_content = "*** Test Cases ***\nTest"
 
-    mock_parse = mocker.patch("gherkbot.synchronizer.parse_feature", return_value={"feature": {}})
-    mock_convert = mocker.patch("gherkbot.synchronizer.convert_ast_to_robot", return_value=robot_content)
+    mock_parse = mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL)
+    mock_convert = mocker.patch("gherkbot.synchronizer._render_model", return_value=robot_content)
 
     # Act
     sync_directories(input_dir, output_dir)
@@ -79,8 +84,9 @@ def test_sync_creates_new_robot_file(mocker: MagicMock, tmp_path: Path) -> None:
     # Assert
     assert robot_file.exists()
     assert robot_file.read_text() == robot_content
-    mock_parse.assert_called_once_with(feature_content)
-    mock_convert.assert_called_once_with({"feature": {}})
+    mock_parse.assert_called_once()
+    assert mock_parse.call_args.args[0] == feature_content
+    mock_convert.assert_called_once_with(MODEL, robot_file)
 
 
 def test_sync_creates_new_robot_file_in_subfolder(mocker: MagicMock, tmp_path: Path) -> None:
@@ -100,8 +106,8 @@ def test_sync_creates_new_robot_file_in_subfolder(mocker: MagicMock, tmp_path: P
     robot_file = robot_dir / "test.robot"
     robot_content = "*** Test Cases ***\nTest in subfolder"
 
-    mock_parse = mocker.patch("gherkbot.synchronizer.parse_feature", return_value={"feature": {}})
-    mock_convert = mocker.patch("gherkbot.synchronizer.convert_ast_to_robot", return_value=robot_content)
+    mock_parse = mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL)
+    mock_convert = mocker.patch("gherkbot.synchronizer._render_model", return_value=robot_content)
 
     # Act
     sync_directories(input_dir, output_dir)
@@ -110,8 +116,9 @@ def test_sync_creates_new_robot_file_in_subfolder(mocker: MagicMock, tmp_path: P
     assert robot_dir.is_dir()
     assert robot_file.exists()
     assert robot_file.read_text() == robot_content
-    mock_parse.assert_called_once_with(feature_content)
-    mock_convert.assert_called_once_with({"feature": {}})
+    mock_parse.assert_called_once()
+    assert mock_parse.call_args.args[0] == feature_content
+    mock_convert.assert_called_once_with(MODEL, robot_file)
 
 
 def test_sync_updates_existing_robot_file(mocker: MagicMock, tmp_path: Path) -> None:
@@ -137,16 +144,17 @@ def test_sync_updates_existing_robot_file(mocker: MagicMock, tmp_path: Path) ->
     assert feature_file.stat().st_mtime > robot_file.stat().st_mtime
 
     updated_robot_content = "*** Test Cases ***\nNewer Content"
-    mock_parse = mocker.patch("gherkbot.synchronizer.parse_feature", return_value={"feature": {}})
-    mock_convert = mocker.patch("gherkbot.synchronizer.convert_ast_to_robot", return_value=updated_robot_content)
+    mock_parse = mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL)
+    mock_convert = mocker.patch("gherkbot.synchronizer._render_model", return_value=updated_robot_content)
 
     # Act
     sync_directories(input_dir, output_dir)
 
     # Assert
     assert robot_file.read_text() == updated_robot_content
-    mock_parse.assert_called_once_with(feature_content)
-    mock_convert.assert_called_once_with({"feature": {}})
+    mock_parse.assert_called_once()
+    assert mock_parse.call_args.args[0] == feature_content
+    mock_convert.assert_called_once_with(MODEL, robot_file)
 
 
 def test_sync_deletes_robot_file_when_feature_file_is_removed(mocker: MagicMock, tmp_path: Path) -> None:
@@ -164,8 +172,8 @@ def test_sync_deletes_robot_file_when_feature_file_is_removed(mocker: MagicMock,
     robot_file.write_text("Robot content for deletion")
 
     # Simulate running sync once to establish the output file
-    mocker.patch("gherkbot.synchronizer.parse_feature") # No need to parse/convert for this setup
-    mocker.patch("gherkbot.synchronizer.convert_ast_to_robot")
+    mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL) # No need to parse/convert for this setup
+    mocker.patch("gherkbot.synchronizer._render_model", return_value="content")
     sync_directories(input_dir, output_dir) # This call ensures the robot_files_map is populated correctly
     assert robot_file.exists() # Verify it was "created/updated" initially
 
@@ -200,8 +208,8 @@ def test_sync_deletes_robot_file_and_empty_subfolder(mocker: MagicMock, tmp_path
     robot_file = output_sub_dir / "test_in_sub_to_delete.robot"
 
     # Simulate running sync once to establish the output file and folder
-    mocker.patch("gherkbot.synchronizer.parse_feature", return_value={"feature": {}})
-    mocker.patch("gherkbot.synchronizer.convert_ast_to_robot", return_value="content")
+    mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL)
+    mocker.patch("gherkbot.synchronizer._render_model", return_value="content")
     sync_directories(input_dir, output_dir)
     assert robot_file.exists()
     assert output_sub_dir.exists()
@@ -220,3 +228,543 @@ def test_sync_deletes_robot_file_and_empty_subfolder(mocker: MagicMock, tmp_path
     assert not robot_file.exists()
     assert not output_sub_dir.exists() # Check if the subfolder was removed
 
+
+
+def test_sync_changes_only_touches_changed_paths(mocker: MagicMock, tmp_path: Path) -> None:
+    """Test that sync_changes converts, deletes and moves only the listed paths."""
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    (input_dir / "sub").mkdir(parents=True)
+    (output_dir / "old").mkdir(parents=True)
+
+    (input_dir / "added.feature").write_text("Feature: Added")
+    (input_dir / "sub" / "moved.feature").write_text("Feature: Moved")
+    (input_dir / "untouched.feature").write_text("Feature: Untouched")
+    (output_dir / "gone.robot").write_text("gone")
+    (output_dir / "old" / "moved.robot").write_text("moved content")
+
+    mock_parse = mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL)
+    mocker.patch("gherkbot.synchronizer._render_model", return_value="converted")
+
+    changes = [
+        FeatureChange("A", Path("added.feature")),
+        FeatureChange("D", Path("gone.feature")),
+        FeatureChange("R", Path("sub/moved.feature"), Path("old/moved.feature"), 100),
+    ]
+
+    # Act
+    sync_changes(input_dir, output_dir, changes)
+
+    # Assert
+    assert (output_dir / "added.robot").read_text() == "converted"
+    assert not (output_dir / "gone.robot").exists()
+    assert (output_dir / "sub" / "moved.robot").read_text() == "moved content"
+    assert not (output_dir / "old").exists()
+    assert not (output_dir / "untouched.robot").exists()
+    mock_parse.assert_called_once()
+    assert mock_parse.call_args.args[0] == "Feature: Added"
+
+
+def test_sync_changes_regenerates_edited_rename(mocker: MagicMock, tmp_path: Path) -> None:
+    """Test that a rename with content changes moves and then regenerates the output."""
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    (input_dir / "new.feature").write_text("Feature: Renamed and edited")
+    (output_dir / "old.robot").write_text("stale")
+
+    mocker.patch("gherkbot.synchronizer._model_from_text", return_value=MODEL)
+    mocker.patch("gherkbot.synchronizer._render_model", return_value="fresh")
+
+    # Act
+    sync_changes(input_dir, output_dir, [FeatureChange("R", Path("new.feature"), Path("old.feature"), 80)])
+
+    # Assert
+    assert not (output_dir / "old.robot").exists()
+    assert (output_dir / "new.robot").read_text() == "fresh"
+
+
+def test_sync_changes_regenerates_renames_importing_resources_from_another_directory(tmp_path: Path) -> None:
+    """Test that a pure rename into another directory regenerates a suite that imports resource files."""
+    # Arrange
+    input_dir = tmp_path / "input"
+    (input_dir / "b" / "c").mkdir(parents=True)
+    (input_dir / "b" / "c" / "z.feature").write_text("Feature: Z\n  Scenario: S\n    Given a step\n")
+    output_dir = tmp_path / "output"
+    (output_dir / "a").mkdir(parents=True)
+    (output_dir / "a" / "w.robot").write_text("*** Settings ***\nResource         ../../kw/shop.resource\n")
+
+    # Act
+    sync_changes(input_dir, output_dir, [FeatureChange("R", Path("b/c/z.feature"), Path("a/w.feature"), 100)])
+
+    # Assert
+    assert "Resource" not in (output_dir / "b" / "c" / "z.robot").read_text()
+    assert not (output_dir / "a").exists()
+
+
+def test_sync_changes_regenerates_renamed_json_suites(tmp_path: Path) -> None:
+    """Test that a pure rename regenerates a JSON suite, whose name comes from its path."""
+    import json
+
+    from gherkbot.converter import OutputFormat
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "y.feature").write_text("Feature: Y\n  Scenario: S\n    Given a step\n")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "x.rbt").write_text('{"name": "X"}')
+
+    # Act
+    sync_changes(input_dir, output_dir, [FeatureChange("R", Path("y.feature"), Path("x.feature"), 100)], OutputFormat.JSON)
+
+    # Assert
+    assert json.loads((output_dir / "y.rbt").read_text())["name"] == "Y"
+    assert not (output_dir / "x.rbt").exists()
+
+
+def test_sync_json_format_tracks_rbt_files(tmp_path: Path) -> None:
+    """Test that JSON output creates and deletes .rbt suites and ignores .robot files."""
+    from robot.running import TestSuite
+
+    from gherkbot.converter import OutputFormat
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    (input_dir / "login_page.feature").write_text(
+        "Feature: Login\n  Scenario: Valid user\n    Given a valid user\n"
+    )
+    (output_dir / "stale.rbt").write_text("{}")
+    (output_dir / "handwritten.robot").write_text("*** Test Cases ***")
+
+    # Act
+    sync_directories(input_dir, output_dir, OutputFormat.JSON)
+
+    # Assert
+    suite = TestSuite.from_json(output_dir / "login_page.rbt")
+    assert suite.name == "Login Page"
+    assert [test.name for test in suite.tests] == ["Valid user"]
+    assert not (output_dir / "stale.rbt").exists()
+    assert (output_dir / "handwritten.robot").exists()
+    assert not (output_dir / "login_page.robot").exists()
+
+
+def test_sync_bundle_merges_directory_features(tmp_path: Path) -> None:
+    """Test that bundle mode writes one suite per directory and rebuilds it on membership changes."""
+    from robot.running import TestSuite
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    (input_dir / "checkout").mkdir(parents=True)
+    (input_dir / "checkout" / "cart.feature").write_text(
+        "Feature: Cart\n  Background:\n    Given an empty cart\n  Scenario: Add item\n    When I add an item\n"
+    )
+    (input_dir / "checkout" / "payment.feature").write_text(
+        "Feature: Payment\n  Scenario: Add item\n    When I pay\n"
+    )
+
+    # Act
+    sync_directories(input_dir, output_dir, bundle=True)
+
+    # Assert
+    bundle_file = output_dir / "checkout.robot"
+    assert [p.name for p in output_dir.iterdir()] == ["checkout.robot"]
+    suite = TestSuite.from_string(bundle_file.read_text())
+    assert [test.name for test in suite.tests] == ["Add item", "Payment - Add item"]
+    assert suite.tests[0].setup.name == "Cart Background"
+    assert not suite.tests[1].setup
+
+    # Removing a member rebuilds the bundle even though no remaining member changed
+    (input_dir / "checkout" / "cart.feature").unlink()
+    past = bundle_file.stat().st_mtime - 10
+    os.utime(bundle_file, (past, past))
+    sync_directories(input_dir, output_dir, bundle=True)
+    suite = TestSuite.from_string(bundle_file.read_text())
+    assert [test.name for test in suite.tests] == ["Add item"]
+
+
+def test_sync_changes_bundle_rebuilds_affected_directories(tmp_path: Path) -> None:
+    """Test that git-driven bundle sync rebuilds changed bundles and removes emptied ones."""
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    (input_dir / "kept").mkdir(parents=True)
+    (input_dir / "kept" / "a.feature").write_text("Feature: A\n  Scenario: One\n    Given a step\n")
+    (output_dir / "emptied.robot").parent.mkdir(parents=True)
+    (output_dir / "emptied.robot").write_text("old bundle")
+
+    changes = [FeatureChange("M", Path("kept/a.feature")), FeatureChange("D", Path("emptied/b.feature"))]
+
+    # Act
+    sync_changes(input_dir, output_dir, changes, bundle=True)
+
+    # Assert
+    assert "Feature: A" in (output_dir / "kept.robot").read_text()
+    assert not (output_dir / "emptied.robot").exists()
+
+
+def test_sync_interrupted_run_can_be_resumed(mocker: MagicMock, tmp_path: Path) -> None:
+    """Test that an interrupted sync keeps its journal and resuming redoes only unfinished operations."""
+    from gherkbot.journal import JOURNAL_NAME
+    from gherkbot.synchronizer import resume_sync
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    for name in ["a", "b", "c"]:
+        (input_dir / f"{name}.feature").write_text(f"Feature: {name}\n  Scenario: S\n    Given a step\n")
+    render_model = __import__("gherkbot.synchronizer").synchronizer._render_model
+    mock_write = mocker.patch("gherkbot.synchronizer._render_model")
+    mock_write.side_effect = lambda *args: render_model(*args) if mock_write.call_count < 2 else _interrupt()
+
+    # Act 1: the second write is interrupted
+    with pytest.raises(KeyboardInterrupt):
+        sync_directories(input_dir, output_dir)
+
+    # Assert 1
+    assert (output_dir / "a.robot").exists()
+    assert not (output_dir / "b.robot").exists()
+    assert (output_dir / JOURNAL_NAME).exists()
+    assert not list(output_dir.glob(".*.tmp"))
+
+    # Act 2: resume
+    mock_write.reset_mock()
+    mock_write.side_effect = render_model
+    assert resume_sync(input_dir, output_dir) == []
+
+    # Assert 2
+    assert [call.args[1].name for call in mock_write.call_args_list] == ["b.robot", "c.robot"]
+    assert sorted(p.name for p in output_dir.iterdir()) == ["a.robot", "b.robot", "c.robot"]
+    assert resume_sync(input_dir, output_dir) is None
+
+
+def test_sync_with_nothing_to_do_removes_a_stale_journal(tmp_path: Path) -> None:
+    """Test that an up-to-date sync drops an old journal, so resuming cannot replay its operations."""
+    from gherkbot.journal import SyncJournal, SyncOperation
+    from gherkbot.synchronizer import resume_sync
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    (input_dir / "a.feature").write_text("Feature: A\n  Scenario: S\n    Given a step\n")
+    sync_directories(input_dir, output_dir)
+    SyncJournal.start(output_dir, [SyncOperation("delete", "a.robot")]).close()
+
+    # Act
+    sync_directories(input_dir, output_dir)
+
+    # Assert
+    assert resume_sync(input_dir, output_dir) is None
+    assert (output_dir / "a.robot").exists()
+
+
+def _interrupt() -> None:
+    raise KeyboardInterrupt
+
+
+def test_sync_supervised_reports_failures_and_matches_serial_output(tmp_path: Path) -> None:
+    """Test that supervised workers write the same files as a serial sync and report broken features."""
+    from gherkbot.workers import WorkerLimits
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    (input_dir / "sub").mkdir(parents=True)
+    (input_dir / "a.feature").write_text("Feature: A\n  Background:\n    Given a\n  Scenario: S\n    When b\n")
+    (input_dir / "sub" / "b.feature").write_text(
+        "Feature: B\n  Scenario Outline: O\n    Given <x>\n    Examples:\n      | x |\n      | 1 |\n"
+    )
+    (input_dir / "broken.feature").write_text("Feature: Broken\n  Scenario: S\n    Given a\n    not a step\n")
+
+    # Act
+    sync_directories(input_dir, tmp_path / "serial")
+    failures = sync_directories(input_dir, tmp_path / "workers", jobs=2, limits=WorkerLimits(timeout=30))
+
+    # Assert
+    for rel_path in ["a.robot", "sub/b.robot"]:
+        assert (tmp_path / "workers" / rel_path).read_text() == (tmp_path / "serial" / rel_path).read_text()
+    assert not (tmp_path / "workers" / "broken.robot").exists()
+    assert [(f.dest, f.sources) for f in failures] == [("broken.robot", ("broken.feature",))]
+    assert failures[0].reason.startswith("broken.feature:4:5: ")
+
+
+def test_sync_reports_unreadable_sources_and_converts_the_rest(tmp_path: Path) -> None:
+    """Test that a feature that cannot be decoded is reported without stopping the sync, in every mode."""
+    from gherkbot.journal import JOURNAL_NAME
+    from gherkbot.workers import WorkerLimits
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.feature").write_bytes(b"Feature: \xff\xfe\n")
+    (input_dir / "b.feature").write_text("Feature: B\n  Scenario: S\n    Given a step\n")
+
+    for output_dir, options in [
+        (tmp_path / "inline", {}),
+        (tmp_path / "workers", {"jobs": 2, "limits": WorkerLimits(timeout=5)}),
+        (tmp_path / "threads", {"threads": 2}),
+    ]:
+        # Act
+        failures = sync_directories(input_dir, output_dir, **options)
+
+        # Assert
+        assert [(f.dest, f.sources) for f in failures] == [("a.robot", ("a.feature",))]
+        assert failures[0].reason.startswith("a.feature: cannot be read: 'utf-8' codec can't decode")
+        assert sorted(p.name for p in output_dir.iterdir()) == ["b.robot"]
+        assert not (output_dir / JOURNAL_NAME).exists()
+
+
+def test_sync_targets_processes_all_targets_in_one_pool(mocker: MagicMock, tmp_path: Path) -> None:
+    """Test that several configured targets are synced with a single supervised worker pool."""
+    from gherkbot.config import SyncTarget
+    from gherkbot.converter import OutputFormat
+    from gherkbot.synchronizer import sync_targets
+    from gherkbot.workers import WorkerLimits
+
+    # Arrange
+    for name in ["cart", "payment"]:
+        (tmp_path / name / "features").mkdir(parents=True)
+        (tmp_path / name / "features" / f"{name}.feature").write_text(f"Feature: {name}\n  Scenario: S\n    Given a step\n")
+    (tmp_path / "payment" / "robot").mkdir()
+    (tmp_path / "payment" / "robot" / "old.rbt").write_text("{}")
+    targets = [
+        SyncTarget(name="cart", input=tmp_path / "cart/features", output=tmp_path / "cart/robot"),
+        SyncTarget(input=tmp_path / "payment/features", output=tmp_path / "payment/robot", format=OutputFormat.JSON),
+    ]
+    spy = mocker.spy(__import__("gherkbot.synchronizer").synchronizer, "run_supervised")
+
+    # Act
+    reports = sync_targets(targets, [None, None], jobs=2, limits=WorkerLimits())
+
+    # Assert
+    assert spy.call_count == 1
+    assert [[op.action for op in report.operations] for report in reports] == [["create"], ["create", "delete"]]
+    assert all(report.failures == [] for report in reports)
+    assert (tmp_path / "cart" / "robot" / "cart.robot").exists()
+    assert (tmp_path / "payment" / "robot" / "payment.rbt").exists()
+    assert not (tmp_path / "payment" / "robot" / "old.rbt").exists()
+
+
+def test_sync_targets_resume_redoes_journals_and_plans_other_targets(mocker: MagicMock, tmp_path: Path) -> None:
+    """Test that resume keeps each journal until it is replaced and plans targets without one normally."""
+    from gherkbot.config import SyncTarget
+    from gherkbot.journal import JOURNAL_NAME, SyncJournal, SyncOperation
+    from gherkbot.synchronizer import sync_targets
+
+    # Arrange: "cart" was interrupted before writing b.robot, "payment" has no journal
+    for name in ["cart", "payment"]:
+        (tmp_path / name / "features").mkdir(parents=True)
+        for feature in ["a", "b"]:
+            (tmp_path / name / "features" / f"{feature}.feature").write_text(
+                f"Feature: {feature}\n  Scenario: S\n    Given a step\n"
+            )
+    cart_output = tmp_path / "cart" / "robot"
+    SyncJournal.start(cart_output, [SyncOperation("create", "b.robot", ("b.feature",))]).close()
+    targets = [
+        SyncTarget(input=tmp_path / "cart/features", output=cart_output),
+        SyncTarget(input=tmp_path / "payment/features", output=tmp_path / "payment/robot"),
+    ]
+
+    # Act 1: a crash before anything is applied keeps the journal
+    mocker.patch("gherkbot.synchronizer._apply_plans", side_effect=KeyboardInterrupt)
+    with pytest.raises(KeyboardInterrupt):
+        sync_targets(targets, [None, None], resume=True)
+    assert (cart_output / JOURNAL_NAME).exists()
+
+    # Act 2
+    mocker.stopall()
+    reports = sync_targets(targets, [None, None], resume=True)
+
+    # Assert
+    assert [[op.dest for op in report.operations] for report in reports] == [["b.robot"], ["a.robot", "b.robot"]]
+    assert sorted(p.name for p in cart_output.iterdir()) == ["b.robot"]
+    assert sorted(p.name for p in (tmp_path / "payment" / "robot").iterdir()) == ["a.robot", "b.robot"]
+
+
+def test_sync_archive_converts_between_archives_and_directories(tmp_path: Path) -> None:
+    """Test that features are read from a tar archive and written into a zip archive or a directory."""
+    import io
+    import tarfile
+    import zipfile
+
+    from gherkbot.synchronizer import sync_archive
+
+    # Arrange
+    source = tmp_path / "features.tar.gz"
+    members = {
+        "checkout/cart.feature": "Feature: Cart\n  Scenario: Add item\n    Given an empty cart\n",
+        "checkout/payment.feature": "Feature: Payment\n  Scenario: Pay\n    When I pay\n",
+        "login.feature": "Feature: Login\n  Scenario: S\n    Given a\n    oops\n",
+    }
+    with tarfile.open(source, "w:gz") as tf:
+        for name, text in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(text.encode())
+            tf.addfile(info, io.BytesIO(text.encode()))
+    output_dir = tmp_path / "robot"
+    (output_dir / "checkout").mkdir(parents=True)
+    (output_dir / "stale.robot").write_text("old")
+    (output_dir / "login.robot").write_text("last good output")
+
+    # Act
+    zip_failures = sync_archive(source, tmp_path / "suites.zip", bundle=True)
+    dir_failures = sync_archive(source, output_dir)
+
+    # Assert
+    assert zipfile.ZipFile(tmp_path / "suites.zip").namelist() == ["checkout.robot"]
+    assert [(f.dest, f.sources) for f in zip_failures] == [("features.robot", ("login.feature",))]
+    assert sorted(p.relative_to(output_dir).as_posix() for p in output_dir.rglob("*.robot")) == [
+        "checkout/cart.robot",
+        "checkout/payment.robot",
+        "login.robot",
+    ]
+    assert (output_dir / "login.robot").read_text() == "last good output"  # Kept while its feature fails
+    assert [f.dest for f in dir_failures] == ["login.robot"]
+
+
+def test_sync_directories_on_memory_filesystem_at_scale() -> None:
+    """Test that a large sync runs entirely in memory, including incremental updates and deletes."""
+    from gherkbot.fs import MemoryFileSystem
+    from gherkbot.synchronizer import plan_directories
+
+    # Arrange
+    fs = MemoryFileSystem(
+        {f"in/area{i % 50}/f{i}.feature": f"Feature: F{i}\n  Scenario: S\n    Given step {i}\n" for i in range(2000)}
+    )
+    input_dir, output_dir = Path("in"), Path("out")
+
+    # Act 1
+    sync_directories(input_dir, output_dir, fs=fs)
+
+    # Assert 1
+    assert len(fs.walk(output_dir, ".robot")) == 2000
+    assert "Given step 7" in fs.read_text(output_dir / "area7" / "f7.robot")
+    assert not fs.exists(output_dir / ".gherkbot-journal")
+
+    # Act 2: edit one feature, delete another
+    fs.write_text(input_dir / "area1" / "f1.feature", "Feature: F1\n  Scenario: S\n    Given edited\n")
+    fs.unlink(input_dir / "area2" / "f2.feature")
+    operations = plan_directories(input_dir, output_dir, fs=fs)
+
+    # Assert 2
+    assert [(op.action, op.dest) for op in operations] == [("delete", "area2/f2.robot"), ("update", "area1/f1.robot")]
+    sync_directories(input_dir, output_dir, fs=fs)
+    assert "Given edited" in fs.read_text(output_dir / "area1" / "f1.robot")
+    assert not fs.exists(output_dir / "area2" / "f2.robot")
+
+
+def test_sync_threads_match_serial_output(tmp_path: Path) -> None:
+    """Test that a threaded sync writes the same files as a serial sync and reports broken features."""
+    # Arrange
+    input_dir = tmp_path / "input"
+    for i in range(60):
+        area = input_dir / f"area{i % 4}"
+        area.mkdir(parents=True, exist_ok=True)
+        (area / f"f{i}.feature").write_text(
+            f"Feature: F{i}\n  Background:\n    Given user {i}\n"
+            "  Scenario Outline: O\n    When <x> happens\n    Examples:\n      | x |\n      | 1 |\n      | 2 |\n"
+        )
+    (input_dir / "broken.feature").write_text("Feature: Broken\n  Scenario: S\n    Given a\n    not a step\n")
+
+    # Act
+    sync_directories(input_dir, tmp_path / "plain")
+    sync_directories(input_dir, tmp_path / "serial", bundle=True)
+    failures = sync_directories(input_dir, tmp_path / "threads", threads=8)
+    bundle_failures = sync_directories(input_dir, tmp_path / "bundles", bundle=True, threads=8)
+
+    # Assert
+    plain = sorted(p.relative_to(tmp_path / "plain") for p in (tmp_path / "plain").rglob("*.robot"))
+    assert len(plain) == 60
+    for rel_path in plain:
+        assert (tmp_path / "threads" / rel_path).read_text() == (tmp_path / "plain" / rel_path).read_text()
+    assert [(f.dest, f.sources) for f in failures] == [("broken.robot", ("broken.feature",))]
+    assert failures[0].reason.startswith("broken.feature:4:5: ")
+    assert [f.dest for f in bundle_failures] == ["input.robot"]
+    for rel_path in [f"area{i}.robot" for i in range(4)]:
+        assert (tmp_path / "bundles" / rel_path).read_text() == (tmp_path / "serial" / rel_path).read_text()
+
+
+def test_sync_reports_bad_features_the_same_way_in_every_mode(tmp_path: Path) -> None:
+    """Test that in-process, threaded and worker syncs report broken features and skip only them in bundles."""
+    from gherkbot.workers import WorkerLimits
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    (input_dir / "area").mkdir(parents=True)
+    (input_dir / "area" / "good.feature").write_text("Feature: Good\n  Scenario: S\n    Given a step\n")
+    (input_dir / "area" / "broken.feature").write_text("Feature: Broken\n  Scenario: S\n    Given a\n    not a step\n")
+    (input_dir / "area" / "empty.feature").write_text("")
+    modes = {"inline": {}, "threads": {"threads": 2}, "workers": {"jobs": 2, "limits": WorkerLimits(timeout=30)}}
+
+    for name, options in modes.items():
+        # Act
+        failures = sync_directories(input_dir, tmp_path / name, **options)
+        bundle_failures = sync_directories(input_dir, tmp_path / f"{name}-bundle", bundle=True, **options)
+
+        # Assert
+        assert sorted((f.dest, f.sources) for f in failures) == [
+            ("area/broken.robot", ("area/broken.feature",)),
+            ("area/empty.robot", ("area/empty.feature",)),
+        ], name
+        reasons = sorted(f.reason for f in failures)
+        assert reasons[0].startswith("broken.feature:4:5: expected:")
+        assert reasons[1] == "empty.feature: the file contains no feature"
+        assert sorted(p.name for p in (tmp_path / name / "area").iterdir()) == ["good.robot"]
+        assert sorted((f.dest, f.sources) for f in bundle_failures) == [
+            ("area.robot", ("area/broken.feature",)),
+            ("area.robot", ("area/empty.feature",)),
+        ], name
+        assert "Feature: Good" in (tmp_path / f"{name}-bundle" / "area.robot").read_text()
+    assert (tmp_path / "threads-bundle" / "area.robot").read_text() == (
+        tmp_path / "inline-bundle" / "area.robot"
+    ).read_text()
+
+
+def test_sync_json_reports_unconvertible_feature_instead_of_writing_empty_suite(tmp_path: Path) -> None:
+    """Test that a feature that parses but cannot be converted leaves no empty .rbt behind."""
+    from gherkbot.converter import OutputFormat
+
+    # Arrange
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "bad.feature").write_text("Feature: Bad\n  Scenario Outline: O\n    Given <x>\n    Examples:\n")
+
+    # Act
+    failures = sync_directories(input_dir, tmp_path / "output", OutputFormat.JSON)
+
+    # Assert
+    assert [(f.dest, f.reason) for f in failures] == [
+        ("bad.rbt", "bad.feature: unsupported Gherkin at feature.children.0.scenario.examples.0.tableHeader: Field required")
+    ]
+    assert not (tmp_path / "output" / "bad.rbt").exists()
+
+
+def test_sync_reads_sources_only_as_they_are_converted(mocker: MagicMock) -> None:
+    """Test that the sources of a sync are not all loaded into memory before converting."""
+    from gherkbot.fs import MemoryFileSystem
+
+    # Arrange
+    fs = MemoryFileSystem({f"in/f{i}.feature": f"Feature: F{i}\n  Scenario: S\n    Given step {i}\n" for i in range(20)})
+    events: list[str] = []
+    read_text, write_text = fs.read_text, fs.write_text
+    mocker.patch.object(fs, "read_text", side_effect=lambda path: events.append("read") or read_text(path))
+    mocker.patch.object(
+        fs, "write_text", side_effect=lambda path, text: events.append(f"write {path.suffix}") or write_text(path, text)
+    )
+
+    # Act
+    sync_directories(Path("in"), Path("out"), fs=fs, threads=2)
+
+    # Assert
+    robot_writes = [i for i, event in enumerate(events) if event == "write .robot"]
+    assert len(robot_writes) == 20
+    assert events[: robot_writes[0]].count("read") <= 5
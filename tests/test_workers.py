@@ -0,0 +1,87 @@
+import os
+import time
+
+from gherkbot.workers import TaskError, WorkerLimits, run_supervised, run_threaded
+
+
+def _task(context: str, task: str) -> str:
+    if task == "sleep":
+        time.sleep(60)
+    elif task == "allocate":
+        return str(len(bytearray(512 * 1024 * 1024)))
+    elif task == "crash":
+        os._exit(3)
+    elif task == "invalid":
+        raise TaskError("not a feature")
+    elif task == "bug":
+        raise KeyError("missing")
+    return f"{context}:{task}"
+
+
+def _results(tasks: list[str], **kwargs) -> dict[str, tuple]:
+    return {tasks[r.index]: (r.value, r.error) for r in run_supervised(_task, tasks, "ctx", **kwargs)}
+
+
+def test_run_supervised_returns_values_and_errors() -> None:
+    results = _results(["a", "invalid", "b", "bug"], jobs=2)
+
+    assert results == {
+        "a": ("ctx:a", None),
+        "b": ("ctx:b", None),
+        "invalid": (None, "not a feature"),
+        "bug": (None, "KeyError: 'missing'"),
+    }
+
+
+def test_run_supervised_recycles_workers_that_time_out_or_crash() -> None:
+    start = time.monotonic()
+
+    results = _results(["sleep", "crash", "a", "b", "c"], jobs=2, limits=WorkerLimits(timeout=1))
+
+    assert time.monotonic() - start < 10
+    assert results["sleep"] == (None, "timed out after 1s")
+    assert results["crash"] == (None, "worker exited unexpectedly with code 3")
+    assert [results[task] for task in "abc"] == [("ctx:a", None), ("ctx:b", None), ("ctx:c", None)]
+
+
+def test_run_supervised_enforces_memory_limit() -> None:
+    results = _results(["allocate", "a"], jobs=1, limits=WorkerLimits(max_memory=64))
+
+    assert results["allocate"] == (None, "exceeded the memory limit of 64 MiB")
+    assert results["a"] == ("ctx:a", None)
+
+
+def test_run_threaded_reports_like_run_supervised() -> None:
+    tasks = ["a", "invalid", "b", "bug"]
+
+    results = {tasks[r.index]: (r.value, r.error) for r in run_threaded(_task, tasks, "ctx", threads=2)}
+
+    assert results == _results(tasks, jobs=2)
+
+
+def test_runners_consume_tasks_lazily() -> None:
+    pulled: list[int] = []
+
+    def tasks():
+        for i in range(50):
+            pulled.append(i)
+            yield str(i)
+
+    for run in (
+        lambda: run_supervised(_task, tasks(), "ctx", jobs=2),
+        lambda: run_threaded(_task, tasks(), "ctx", threads=2),
+    ):
+        pulled.clear()
+        results = run()
+        first = next(results)
+        assert len(pulled) <= 5  # Tasks in flight plus the one waiting for a free worker
+        rest = list(results)
+        assert sorted(r.index for r in [first, *rest]) == list(range(50))
+        assert all(r.value == f"ctx:{r.index}" for r in [first, *rest])
+
+
+def test_run_supervised_with_no_tasks_starts_no_workers(mocker) -> None:
+    worker = mocker.patch("gherkbot.workers._Worker")
+
+    assert list(run_supervised(_task, iter([]), "ctx")) == []
+    worker.assert_not_called()